@@ -1,6 +1,28 @@
 from __future__ import annotations
 
-class Drawable:
+from pool import ObjectPool
+
+import numpy as np
+
+class Entity:
+    """
+    The common root of every game object
+
+    Every object in the game is a mix of Drawable, Moveable, and Killable. Their
+    attributes are stored in __slots__ instead of a per-instance __dict__, 
+    which keeps each object small and its attribute access fast. Python only 
+    allows one base of a class to add slots when classes are mixed, so the 
+    attributes shared by the abstract classes are all declared here, and 
+    Drawable, Moveable, and Killable (and every subclass) only declare the 
+    attributes they add, if any
+
+    Subclasses must declare __slots__ (even an empty one), otherwise their 
+    objects get a __dict__ again
+    """
+
+    __slots__ = ('x', 'y', 'color', 'size', 'v_x', 'v_y', 'health', 'shape')
+
+class Drawable(Entity):
     """
     A class representing an objects ability to be drawed onto the screen
 
@@ -23,6 +45,8 @@ class Drawable:
         For a triangle, it will be the length of a side
     """
 
+    __slots__ = ()
+
     def __init__(
             self, 
             x: int, 
@@ -67,11 +91,117 @@ class Drawable:
         # minimum accepted distance
         return dist <= min_dist
 
-class Moveable:
+    @staticmethod
+    def collide_many(
+            a_positions: np.ndarray,
+            a_sizes: np.ndarray,
+            b_positions: np.ndarray,
+            b_sizes: np.ndarray,
+            a_shapes: np.ndarray = None,
+            b_shapes: np.ndarray = None,
+            pairs: tuple = None,
+            chunk_size: int = 1 << 20) -> tuple:
+        """
+        Checks collisions between two groups of objects at once
+
+        Uses the same rule as check_collision, but compares squared distances
+        against (size_a + size_b + 10)**2 for whole arrays instead of taking a
+        square root per pair. If shapes are provided, only pairs of the same
+        shape count as collisions.
+
+        Parameters
+        ----------
+        a_positions : np.ndarray
+            An (N, 2) array of the first group's (x, y) positions
+        a_sizes : np.ndarray
+            An (N,) array of the first group's sizes
+        b_positions : np.ndarray
+            An (M, 2) array of the second group's (x, y) positions
+        b_sizes : np.ndarray
+            An (M,) array of the second group's sizes
+        a_shapes : np.ndarray
+            An (N,) array of the first group's shapes (default None)
+        b_shapes : np.ndarray
+            An (M,) array of the second group's shapes (default None)
+        pairs : tuple
+            A tuple of (a_indices, b_indices) limiting the check to those
+            candidate pairs, e.g. from a UniformGrid. If not provided, every
+            pair is checked (default None)
+        chunk_size : int
+            The maximum number of pairs checked in one array operation when
+            checking every pair (default 2**20)
+
+        Returns
+        -------
+        a_indices : np.ndarray
+            The index in the first group of each colliding pair
+        b_indices : np.ndarray
+            The index in the second group of each colliding pair
+        """
+        # Check every pair, a block of rows of the first group at a time
+        if pairs is None:
+            if not len(a_positions) or not len(b_positions):
+                empty = np.empty(0, dtype=np.int64)
+                return empty, empty
+
+            rows = max(1, chunk_size // len(b_positions))
+            a_indices, b_indices = [], []
+
+            for start in range(0, len(a_positions), rows):
+                block = slice(start, start + rows)
+                collided = Drawable._collided(
+                    a_positions[block, None], a_sizes[block, None],
+                    b_positions[None], b_sizes[None],
+                    None if a_shapes is None else a_shapes[block, None],
+                    None if b_shapes is None else b_shapes[None]
+                )
+                block_a, block_b = np.nonzero(collided)
+                a_indices.append(block_a + start)
+                b_indices.append(block_b)
+
+            return np.concatenate(a_indices), np.concatenate(b_indices)
+
+        # Only check the candidate pairs
+        a_indices, b_indices = pairs
+        collided = Drawable._collided(
+            a_positions[a_indices], a_sizes[a_indices],
+            b_positions[b_indices], b_sizes[b_indices],
+            None if a_shapes is None else a_shapes[a_indices],
+            None if b_shapes is None else b_shapes[b_indices]
+        )
+
+        return a_indices[collided], b_indices[collided]
+
+    @staticmethod
+    def _collided(
+            a_positions: np.ndarray,
+            a_sizes: np.ndarray,
+            b_positions: np.ndarray,
+            b_sizes: np.ndarray,
+            a_shapes: np.ndarray,
+            b_shapes: np.ndarray) -> np.ndarray:
+        """Returns the broadcast collision mask used by collide_many"""
+        difference = a_positions - b_positions
+        dist_squared = (difference**2).sum(axis=-1)
+        # The minimum acceptable non-collision distance, with a small buffer
+        min_dist = a_sizes + b_sizes + 10
+
+        collided = dist_squared <= min_dist**2
+        if a_shapes is not None and b_shapes is not None:
+            collided &= a_shapes == b_shapes
+
+        return collided
+
+class Moveable(Entity):
     """A class representing an objects ability to be moved
 
     Simply includes an empty definition for the move function, and the necessary
     attributes for a moveable object
+
+    Velocities are measured per standard tick (1/15 of a second). Every move
+    takes a time multiplier, the number of standard ticks to move for, so a game
+    simulated at a different tick rate (passing a fraction of a tick) moves at
+    the same speed
     
     Parameters
     ----------
@@ -82,6 +212,8 @@ class Moveable:
         The object's velocity in the y direction
     """
 
+    __slots__ = ()
+
     def __init__(
             self, 
             v_x: int, 
@@ -89,12 +221,12 @@ class Moveable:
         """Initializes the necessary attributes for a moveable object"""
         self.v_x, self.v_y = v_x, v_y
     
-    def move() -> None: 
+    def move(time: float = 1) -> None: 
         """An empty definition for a sample move function"""
         pass
 
 
-class Killable:
+class Killable(Entity):
     """A class representing an objects ability to be killed
 
     A bit more involved than the other abstract classes, this class is more 
@@ -111,6 +243,8 @@ class Killable:
         is killed after a single hit.
     """
 
+    __slots__ = ()
+
     def __init__(self, health: int) -> None:
         """Initializes the health to the provided health"""
         self.health = health
@@ -144,4 +278,39 @@ class Killable:
     @property
     def is_alive(self) -> bool:
         """A property denoting whether or not the object is alive (above 0 health)"""
-        return self.health > 0
\ No newline at end of file
+        return self.health > 0
+
+    @staticmethod
+    def remove_dead(entities: list, pool: ObjectPool = None) -> int:
+        """
+        Removes every dead object from a list in a single pass
+
+        The list is compacted in place (so anything holding it sees the 
+        change), the living objects keep their order, and every dead object is
+        removed on the same call no matter where it sits. Removing them one by
+        one with list.remove while iterating would cost O(n) per removal and
+        skip the object after each removed one
+
+        Parameters
+        ----------
+        entities : list[Killable]
+            The objects to filter
+        pool : ObjectPool
+            The pool to release the dead objects into, if provided 
+            (default None)
+
+        Returns
+        -------
+        removed : int
+            The number of objects removed
+        """
+        count = len(entities)
+
+        if pool is not None:
+            for entity in entities:
+                if entity.health <= 0:
+                    pool.release(entity)
+
+        entities[:] = [entity for entity in entities if entity.health > 0]
+
+        return count - len(entities)
\ No newline at end of file
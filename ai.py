@@ -0,0 +1,272 @@
+from abc import ABC, abstractmethod
+from typing import NamedTuple
+
+import numpy as np
+
+class EnemyState(NamedTuple):
+    """
+    What every artificial cannon knows when deciding what to do, one array
+    entry per cannon
+
+    Attributes
+    ----------
+    x, y : np.ndarray
+        The positions of the cannons
+    v_x, v_y : np.ndarray
+        The speeds the cannons move at, per standard tick
+    size : np.ndarray
+        The sizes of the cannons
+    striking : np.ndarray
+        Whether each cannon is firing at the user
+    user_x, user_y : float
+        The position of the user cannon
+    user_size : float
+        The size of the user cannon
+    screen_size : tuple
+        The size of the screen
+    drop_chance : float
+        The game's chance of a cannon dropping a target this tick
+    """
+    x: np.ndarray
+    y: np.ndarray
+    v_x: np.ndarray
+    v_y: np.ndarray
+    size: np.ndarray
+    striking: np.ndarray
+    user_x: float
+    user_y: float
+    user_size: float
+    screen_size: tuple
+    drop_chance: float
+
+class Actions(NamedTuple):
+    """
+    What every artificial cannon does this tick, one array entry per cannon
+
+    Attributes
+    ----------
+    move_x, move_y : np.ndarray
+        The movement multipliers of each cannon's speed, refer to
+        `MovingCannon.move` (-1, 0, or 1 to move backwards, not at all, or
+        forwards). The x movement is made first
+    strike : np.ndarray
+        Whether each cannon should be firing at the user
+    drop_chance : np.ndarray
+        Each cannon's chance of dropping a target, if it isn't striking
+    """
+    move_x: np.ndarray
+    move_y: np.ndarray
+    strike: np.ndarray
+    drop_chance: np.ndarray
+
+class Policy(ABC):
+    """
+    Decides what every artificial cannon does, all at once
+
+    A policy is given the state of every cannon as arrays, and returns their
+    actions as arrays, so a policy can control hundreds of cannons with a
+    handful of array operations. Subclasses implement decide, and one that
+    doesn't can't be created
+    """
+
+    @abstractmethod
+    def decide(self, state: EnemyState) -> Actions:
+        """
+        Decides what every cannon does this tick
+
+        Parameters
+        ----------
+        state : EnemyState
+            The state of every cannon
+
+        Returns
+        -------
+        actions : Actions
+            The actions of every cannon
+        """
+        pass
+
+class ChasePolicy(Policy):
+    """
+    The cannons' original behaviour: chase the user until close to them, then
+    stop and fire, dropping targets along the way
+
+    Attributes
+    ----------
+    min_distance : float
+        How close (beyond both cannons' sizes) a cannon gets before it stops
+        to fire (default 100)
+    """
+
+    def __init__(self, min_distance: float = 100) -> None:
+        """Initializes the policy"""
+        self.min_distance = min_distance
+
+    def decide(self, state: EnemyState) -> Actions:
+        """Chases the user, refer to `Policy.decide`"""
+        d_x = state.user_x - state.x
+        d_y = state.user_y - state.y
+
+        # Compared squared, like Drawable.collide_many
+        min_dist = state.size + state.user_size + self.min_distance
+        chasing = d_x**2 + d_y**2 >= min_dist**2
+
+        return Actions(
+            move_x = np.where(chasing, np.sign(d_x), 0),
+            move_y = np.where(chasing, np.sign(d_y), 0),
+            strike = ~chasing,
+            drop_chance = np.full(len(d_x), state.drop_chance),
+        )
+
+class AIController:
+    """
+    Runs the artificial cannons with a Policy
+
+    Every tick the state of every cannon is gathered into arrays, the policy
+    decides every cannon's actions at once, and the movement is applied with
+    array operations as well. Only the cannons that start or stop firing, or
+    that may drop a target, are then handled one at a time
+
+    Attributes
+    ----------
+    policy : Policy
+        The policy deciding what the cannons do (default ChasePolicy())
+    margin : int
+        How close the cannons may get to the edges of the screen (30, like
+        MovingCannon.move)
+    """
+
+    margin = 30
+
+    def __init__(self, policy: Policy = None) -> None:
+        """Initializes the controller with its policy"""
+        self.policy = policy if policy is not None else ChasePolicy()
+
+    @staticmethod
+    def observe(cannons: list, user, screen_size: tuple, drop_chance: float) -> EnemyState:
+        """
+        Gathers the state of every cannon into arrays
+
+        Parameters
+        ----------
+        cannons : list[ArtificialCannon]
+            The cannons
+        user : MovingCannon
+            The user cannon
+        screen_size : tuple
+            The size of the screen
+        drop_chance : float
+            The game's chance of a cannon dropping a target this tick
+
+        Returns
+        -------
+        state : EnemyState
+            The state of every cannon
+        """
+        values = np.array(
+            [
+                (cannon.x, cannon.y, cannon.v_x, cannon.v_y, cannon.size, cannon.striking)
+                for cannon in cannons
+            ],
+            dtype=np.float64
+        ).reshape(-1, 6)
+
+        return EnemyState(
+            x = values[:, 0],
+            y = values[:, 1],
+            v_x = values[:, 2],
+            v_y = values[:, 3],
+            size = values[:, 4],
+            striking = values[:, 5].astype(bool),
+            user_x = user.x,
+            user_y = user.y,
+            user_size = user.size,
+            screen_size = screen_size,
+            drop_chance = drop_chance,
+        )
+
+    def move(self, state: EnemyState, actions: Actions, time: float = 1) -> tuple:
+        """
+        Works out where every cannon moves to
+
+        Matches moving each cannon with MovingCannon.move, first along x and
+        then along y, where every move keeps both coordinates on the screen
+
+        Parameters
+        ----------
+        state : EnemyState
+            The state of every cannon
+        actions : Actions
+            The actions of every cannon
+        time : float
+            The number of standard ticks to move for (default 1)
+
+        Returns
+        -------
+        x, y : np.ndarray
+            The new positions of the cannons
+        """
+        width, height = state.screen_size
+        x_limits = (self.margin, width - self.margin)
+        y_limits = (self.margin, height - self.margin)
+
+        moves_x = actions.move_x != 0
+        x = np.where(moves_x, np.clip(state.x + time * actions.move_x * state.v_x, *x_limits), state.x)
+        y = np.where(moves_x, np.clip(state.y, *y_limits), state.y)
+
+        moves_y = actions.move_y != 0
+        x = np.where(moves_y, np.clip(x, *x_limits), x)
+        y = np.where(moves_y, np.clip(y + time * actions.move_y * state.v_y, *y_limits), y)
+
+        return x, y
+
+    def update(self, manager) -> Actions:
+        """
+        Runs a tick of every artificial cannon of a game
+
+        Parameters
+        ----------
+        manager : Manager
+            The game
+
+        Returns
+        -------
+        actions : Actions
+            The actions the cannons took
+        """
+        cannons = manager.artificial_cannons
+        state = self.observe(
+            cannons,
+            manager.user_cannon,
+            manager.screen_size,
+            manager.target_drop_chance * manager.time_step
+        )
+        actions = self.policy.decide(state)
+
+        # Move the cannons that moved
+        x, y = self.move(state, actions, manager.time_step)
+        x, y = x.tolist(), y.tolist()
+        moved = (actions.move_x != 0) | (actions.move_y != 0)
+        for i in np.flatnonzero(moved).tolist():
+            cannons[i].x, cannons[i].y = x[i], y[i]
+
+        # Start and stop firing
+        for i in np.flatnonzero(actions.strike != state.striking).tolist():
+            if actions.strike[i]:
+                cannons[i].start_striking(
+                    manager.scheduler,
+                    manager.seconds_to_ticks(manager.strike_delay),
+                    manager.strike_velocity
+                )
+            else:
+                cannons[i].end_striking()
+
+        # The cannons not firing may drop a target, in order
+        score = manager.score_t.score
+        drop_chance = actions.drop_chance.tolist()
+        for i in np.flatnonzero(~actions.strike).tolist():
+            cannons[i].determine_target_spawning(
+                manager.target_master, score, drop_chance[i]
+            )
+
+        return actions
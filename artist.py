@@ -2,14 +2,258 @@ import pygame
 
 from color import Color
 import numpy as np
+from collections import OrderedDict
+
+class SurfaceCache:
+    """
+    A least-recently-used cache of surfaces
+
+    Keeps track of how often a surface was found in the cache, so callers can
+    confirm the cache is doing its job. Once the cache is full, the least
+    recently used surface is evicted.
+
+    Attributes
+    ----------
+    max_size : int
+        The maximum number of surfaces to keep
+    surfaces : OrderedDict
+        The cached surfaces, least recently used first
+    hits : int
+        The number of lookups served from the cache
+    misses : int
+        The number of lookups that had to create a surface
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initializes the empty cache"""
+        self.max_size = max_size
+        self.surfaces: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Returns the number of cached surfaces"""
+        return len(self.surfaces)
+
+    @property
+    def hit_rate(self) -> float:
+        """A property denoting the fraction of lookups served from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key: tuple, create):
+        """
+        Returns the cached value for a key, creating it if needed
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the value
+        create : Callable
+            A function creating the value if it isn't cached
+
+        Returns
+        -------
+        value
+            The cached (or newly created) value
+        """
+        value = self.surfaces.get(key)
+
+        if value is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = create()
+        self.surfaces[key] = value
+
+        # Evict the least recently used value
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+
+        return value
+
+    def reset_stats(self) -> None:
+        """Resets the hit and miss counters"""
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        """Drops every cached surface and resets the counters"""
+        self.surfaces.clear()
+        self.reset_stats()
+
+class TextCache(SurfaceCache):
+    """
+    A least-recently-used cache of rendered text surfaces
+
+    Rendering text is one of the most expensive things drawn each frame, and the
+    HUD text rarely changes between frames. Surfaces are keyed on the font,
+    text, and color, so only text whose value changed gets re-rendered.
+
+    Attributes
+    ----------
+    Refer to `SurfaceCache`
+        max_size defaults to 128
+    """
+
+    def __init__(self, max_size: int = 128) -> None:
+        """Initializes the empty cache"""
+        super().__init__(max_size)
+
+    def render(
+            self, 
+            font: pygame.font.Font, 
+            text: str, 
+            color: tuple) -> pygame.Surface:
+        """
+        Returns the rendered (antialiased) text, rendering it only if needed
+
+        Parameters
+        ----------
+        font : pygame.font.Font
+            The font to render the text with
+        text : str
+            The text to render
+        color : tuple
+            A tuple representing the (R, G, B) values of the text's color
+
+        Returns
+        -------
+        surface : pygame.Surface
+            The rendered text
+        """
+        return self.get(
+            (font, text, color), 
+            lambda: font.render(text, True, color)
+        )
+
+class SpriteCache(SurfaceCache):
+    """
+    A least-recently-used cache of pre-rendered shape sprites
+
+    Every (shape, size, color) combination is rasterized once into a surface,
+    so drawing a shape becomes a single blit. Random colors can produce far
+    more combinations than are ever on screen at once, so old sprites are
+    evicted.
+
+    Each sprite is stored with the offset from the object's (x, y) to the
+    sprite's top left corner, since squares are drawn from their corner while
+    triangles hang from their tip and circles sit around their center.
+
+    Attributes
+    ----------
+    Refer to `SurfaceCache`
+        max_size defaults to 1024
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        """Initializes the empty cache"""
+        super().__init__(max_size)
+
+    def sprite(self, shape: str, size: int, color: tuple) -> tuple:
+        """
+        Returns the sprite for a shape, rasterizing it only if needed
+
+        Parameters
+        ----------
+        shape : str
+            One of 's', 't', or 'c' for a square, triangle, or circle
+        size : int
+            The size of the shape
+        color : tuple
+            A tuple representing the (R, G, B) values of the shape's color
+
+        Returns
+        -------
+        sprite : tuple
+            A tuple of the (surface, (offset_x, offset_y)) of the sprite
+        """
+        return self.get(
+            (shape, size, color), 
+            lambda: self.rasterize(shape, size, color)
+        )
+
+    @staticmethod
+    def bounds(shape: str, size: int) -> tuple:
+        """
+        Returns where a shape's sprite sits and how big it is, without
+        rasterizing it
+
+        Returns
+        -------
+        bounds : tuple
+            A tuple of the (offset_x, offset_y, width, height) of the sprite
+        """
+        if shape == 's':
+            return 0, 0, max(size, 0), max(size, 0)
+
+        if shape == 't':
+            half = size//2
+            return -half, 0, 2*half + 1, half + 1
+
+        center = int(np.ceil(size/2)) + 1
+        return -center, -center, 2*center + 1, 2*center + 1
+
+    @staticmethod
+    def rasterize(shape: str, size: int, color: tuple) -> tuple:
+        """
+        Draws a shape onto a new surface, in the same place Artist.draw would
+        have drawn it relative to the object's (x, y)
+
+        Returns
+        -------
+        sprite : tuple
+            A tuple of the (surface, (offset_x, offset_y)) of the sprite
+        """
+        # The background is made transparent with a color key
+        background = Color.BLACK if color != Color.BLACK else Color.WHITE
+
+        # Rectangle from the top left corner
+        if shape == 's':
+            sprite = pygame.Surface((max(size, 0), max(size, 0)))
+            sprite.fill(color)
+            return sprite, (0, 0)
+
+        # Triangle hanging down from its tip
+        if shape == 't':
+            half = size//2
+            sprite = pygame.Surface((2*half + 1, half + 1))
+            sprite.fill(background)
+            pygame.draw.polygon(
+                sprite, color, ((half, 0), (0, half), (2*half, half))
+            )
+            offset = (-half, 0)
+
+        # Circle around its center
+        else:
+            center = int(np.ceil(size/2)) + 1
+            sprite = pygame.Surface((2*center + 1, 2*center + 1))
+            sprite.fill(background)
+            pygame.draw.circle(sprite, color, (center, center), size/2)
+            offset = (-center, -center)
+
+        sprite.set_colorkey(background, pygame.RLEACCEL)
+        return sprite, offset
 
 class Artist:
     """A class containing static definitions for draw functions
 
     Allows for a factory of artistry, dedicated to drawing objects based on
     their provided coordinates, color, shape, and size
+
+    Attributes
+    ----------
+    text_cache : TextCache
+        The text cache shared by every text drawing function
+    sprite_cache : SpriteCache
+        The sprite cache shared by every shape drawing function
     """
 
+    text_cache = TextCache()
+    sprite_cache = SpriteCache()
+
     @staticmethod
     def draw(
             surface: pygame.Surface, 
@@ -21,10 +265,9 @@ class Artist:
         """
         Draws the object based on its parameters
 
-        This function uses a dictionary to store shape: parameter, functions.
         The shape is one of 's', 't', or 'c' signifying square, triangle, or circle.
-        The parameters is a tuple of the parameters that are to be passed to the
-        respective pygame.draw function.
+        It is rasterized once per (shape, size, color) by the sprite cache, so
+        drawing it is a single blit.
 
         Parameters
         ----------
@@ -44,54 +287,98 @@ class Artist:
         shape : str
             A string of characters 's', 't', or 'c' denoting whether the object is a
             square, triangle, or circle.
+
+        Returns
+        -------
+        rect : pygame.Rect
+            The area of the surface that was drawn over
         """
-        *shape_to_draw, function_to_use = {
-            # Rectangle draw takes coords and side lengths
-            's': ((x, y, size, size), pygame.draw.rect),
-            # Polygon draw takes 2 coords of the points of the triangle
-            't':  ((
-                    (x, y), 
-                    (x - size//2, y + size//2),
-                    (x + size//2, y + size//2)
-                ), pygame.draw.polygon),
-            # Circle draw takes a tuple of coords and a radius
-            'c': ((x, y), size/2, pygame.draw.circle),
-        }[shape[0]] # Choose which shape to draw and function to use depending on the
-        # first character of the passed string
-
-        # Run the given function with the given parameters
-        function_to_use(surface, color, *shape_to_draw)
-    
+        # Choose which shape to draw depending on the first character of the 
+        # passed string
+        sprite, (offset_x, offset_y) = Artist.sprite_cache.sprite(
+            shape[0], size, color
+        )
+
+        return surface.blit(sprite, (x + offset_x, y + offset_y))
+
     @staticmethod
-    def draw_cannon(
+    def draw_many(
             surface: pygame.Surface, 
+            drawables: list, 
+            doreturn: bool = False) -> list:
+        """
+        Draws a whole list of shaped objects in one batched blit
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface to draw the objects onto
+        drawables : list
+            The objects to draw, each with an x, y, color, size, and shape
+        doreturn : bool
+            Whether or not to return the areas drawn over (default False)
+
+        Returns
+        -------
+        rects : list[pygame.Rect]
+            The area drawn over by each object, if doreturn is True
+        """
+        sprite_cache = Artist.sprite_cache
+        blit_sequence = []
+
+        for drawable in drawables:
+            sprite, (offset_x, offset_y) = sprite_cache.sprite(
+                drawable.shape[0], drawable.size, drawable.color
+            )
+            blit_sequence.append(
+                (sprite, (drawable.x + offset_x, drawable.y + offset_y))
+            )
+
+        return surface.blits(blit_sequence, doreturn)
+
+    @staticmethod
+    def sprite_rect(
             x: int, 
             y: int, 
-            angle: int, 
-            pow: int, 
-            color: tuple) -> None:
+            color: tuple, 
+            size: int,
+            shape: str) -> pygame.Rect:
         """
-        Draws the cannon based on its parameters
-
-        This function uses the angle and power to determine the size and angle
-        of the cannon
+        Returns the area Artist.draw would draw over, without drawing
 
         Parameters
         ----------
-        surface : pygame.Surface
-            The surface to draw the cannon onto
-        x : int
-            The x coordinate of the object
-        y : int 
-            The y coordinate of the object
-        angle : int
-            The cannon's angle
-        pow : int
-            The power of the cannon (depending on how long the user held for)
-        color : tuple
-            A tuple representing the (R, G, B) values of the object's color
+        Refer to `Artist.draw`
+
+        Returns
+        -------
+        rect : pygame.Rect
+            The area the object covers
         """
+        offset_x, offset_y, width, height = SpriteCache.bounds(shape[0], size)
 
+        rect = pygame.Rect(0, 0, width, height)
+        rect.topleft = (x + offset_x, y + offset_y)
+        return rect
+    
+    @staticmethod
+    def cannon_polygon(
+            x: int, 
+            y: int, 
+            angle: int, 
+            pow: int) -> list:
+        """
+        Determines the points of the cannon's gun
+
+        Parameters
+        ----------
+        Refer to `Artist.draw_cannon`
+
+        Returns
+        -------
+        gun_shape : list
+            The [x, y] points of the gun polygon
+        """
         vec_1 = np.array(
                 [
                 int(5*np.cos(angle - np.pi/2)), 
@@ -123,12 +410,101 @@ class Artist:
         gun_shape.append(
             (gun_pos - vec_1).tolist()
         )
+
+        return gun_shape
+
+    @staticmethod
+    def cannon_rect(
+            x: int, 
+            y: int, 
+            angle: int, 
+            pow: int) -> pygame.Rect:
+        """
+        Returns the area Artist.draw_cannon would draw over, without drawing
+
+        Parameters
+        ----------
+        Refer to `Artist.draw_cannon`
+
+        Returns
+        -------
+        rect : pygame.Rect
+            The bounding box of the gun polygon
+        """
+        x_points, y_points = zip(*Artist.cannon_polygon(x, y, angle, pow))
+
+        return pygame.Rect(
+            min(x_points), 
+            min(y_points), 
+            max(x_points) - min(x_points) + 1, 
+            max(y_points) - min(y_points) + 1
+        )
+    
+    @staticmethod
+    def draw_cannon(
+            surface: pygame.Surface, 
+            x: int, 
+            y: int, 
+            angle: int, 
+            pow: int, 
+            color: tuple) -> pygame.Rect:
+        """
+        Draws the cannon based on its parameters
+
+        This function uses the angle and power to determine the size and angle
+        of the cannon
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface to draw the cannon onto
+        x : int
+            The x coordinate of the object
+        y : int 
+            The y coordinate of the object
+        angle : int
+            The cannon's angle
+        pow : int
+            The power of the cannon (depending on how long the user held for)
+        color : tuple
+            A tuple representing the (R, G, B) values of the object's color
+
+        Returns
+        -------
+        rect : pygame.Rect
+            The area of the surface that was drawn over
+        """
+        gun_shape = Artist.cannon_polygon(x, y, angle, pow)
         
-        pygame.draw.polygon(surface, color, gun_shape)
+        return pygame.draw.polygon(surface, color, gun_shape)
 
     @staticmethod
-    def draw_score(
+    def draw_trajectory(
             surface: pygame.Surface, 
+            points: tuple, 
+            color: tuple, 
+            radius: int = 2) -> None:
+        """
+        Draws a dotted path
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface to draw the path onto
+        points : tuple
+            The (x, y) position of every dot
+        color : tuple
+            A tuple representing the (R, G, B) values of the dots' color
+        radius : int
+            The radius of the dots (default 2)
+        """
+        circle = pygame.draw.circle
+        for point in points:
+            circle(surface, color, point, radius)
+
+    @staticmethod
+    def score_layout(
+            surface_size: tuple, 
             font: pygame.font.Font, 
             targets_destroyed: int, 
             projectiles_used: int, 
@@ -136,16 +512,18 @@ class Artist:
             chosen_type: str,
             health: int,
             primary_color: tuple, 
-            secondary_color: tuple) -> None:
+            secondary_color: tuple,
+            text_cache: TextCache = None) -> list:
         """
-        Draws the score table based on its parameters
+        Renders the score table's text and determines where each piece goes
 
-        This function uses the font, scores, and colors to draw the score table
+        The text is rendered through a TextCache, so only the values that 
+        changed since the last frame are rendered again
 
         Parameters
         ----------
-        surface : pygame.Surface
-            The surface to draw the cannon onto
+        surface_size : tuple
+            The size of the surface the table is drawn onto
         font : pygame.font
             The font to use for the text
         targets_destroyed : int
@@ -163,32 +541,41 @@ class Artist:
             The color to use for the statistics
         secondary_color : tuple
             The color to use for the statistics
+        text_cache : TextCache
+            The cache to render the text through (default Artist.text_cache)
+
+        Returns
+        -------
+        layout : list
+            A list of (text surface, position) pairs
         """
+        if text_cache is None:
+            text_cache = Artist.text_cache
         score_surf = []
         
         # The text for targets_destroyed
         score_surf.append(
-            font.render(
+            text_cache.render(
+                font,
                 "Destroyed: {}".format(targets_destroyed), 
-                True, 
                 secondary_color
             )
         )
 
         # The text for projectiles_used
         score_surf.append(
-            font.render(
+            text_cache.render(
+                font,
                 "Balls used: {}".format(projectiles_used), 
-                True, 
                 secondary_color
             )
         )
 
         # The text for the total score
         score_surf.append(
-            font.render(
+            text_cache.render(
+                font,
                 "Total: {}".format(score), 
-                True, 
                 primary_color
             )
         )
@@ -202,46 +589,92 @@ class Artist:
             chosen_type = "Triangle"
         
         score_surf.append(
-            font.render(
+            text_cache.render(
+                font,
                 f"Chosen: {chosen_type}",
-                True,
                 secondary_color
             )
         )
 
         # The text for the user health
         score_surf.append(
-            font.render(
+            text_cache.render(
+                font,
                 f"Health: {health}",
-                True,
                 primary_color
             )
         )
 
-        # Place each text piece to the screen
-        for i in range(3):
-            surface.blit(
-                score_surf[i], 
-                [10, 10 + 30*i]\
-            )
-        
-        surface.blit(score_surf[-2], [surface.get_size()[1] - 50, 10])
-        surface.blit(score_surf[-1], [surface.get_size()[1] - 50, 40])
-    
+        # Place each text piece on the screen
+        layout = [(score_surf[i], (10, 10 + 30*i)) for i in range(3)]
+
+        layout.append((score_surf[-2], (surface_size[1] - 50, 10)))
+        layout.append((score_surf[-1], (surface_size[1] - 50, 40)))
+
+        return layout
+
     @staticmethod
-    def draw_death_screen(
+    def draw_score(
             surface: pygame.Surface, 
+            *args, **kwargs) -> list:
+        """
+        Draws the score table based on its parameters
+
+        This function uses the font, scores, and colors to draw the score table
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface to draw the score table onto
+        *args, **kwargs
+            Refer to `Artist.score_layout`
+
+        Returns
+        -------
+        rects : list[pygame.Rect]
+            The area of the surface drawn over by each piece of text
+        """
+        return surface.blits(
+            Artist.score_layout(surface.get_size(), *args, **kwargs)
+        )
+
+    @staticmethod
+    def score_rect(surface_size: tuple, *args, **kwargs) -> pygame.Rect:
+        """
+        Returns the area Artist.draw_score would draw over, without drawing
+
+        Parameters
+        ----------
+        surface_size : tuple
+            The size of the surface the table is drawn onto
+        *args, **kwargs
+            Refer to `Artist.score_layout`
+
+        Returns
+        -------
+        rect : pygame.Rect
+            The bounding box of all the score table's text
+        """
+        layout = Artist.score_layout(surface_size, *args, **kwargs)
+        rects = [text.get_rect(topleft=position) for text, position in layout]
+
+        return rects[0].unionall(rects[1:])
+    
+    @staticmethod
+    def compose_death_screen(
+            size: tuple, 
             font: pygame.font.Font, 
             game_over_text: str, 
             score: int, 
-            color: tuple) -> None:
+            color: tuple) -> pygame.Surface:
         """
-        Draws the death screen when the user dies
+        Composes the death screen once, so it can be blitted as many times as
+        needed without rendering the text again
         
         Parameters
         ----------
-        surface : pygame.Surface
-            The surface to draw the death screen over
+        size : tuple
+            The (width, height) of the death screen
         font : pygame.font.Font
             The font to use for the text
         game_over_text : str
@@ -250,9 +683,14 @@ class Artist:
             The player's score before they died
         color : tuple
             The color to set the text and score
+
+        Returns
+        -------
+        death_screen : pygame.Surface
+            The finished death screen
         """
         # Initialize a new screen
-        death_screen = pygame.Surface(surface.get_size())
+        death_screen = pygame.Surface(size)
         death_screen.fill(Color.BLACK)
         
         # Game over text
@@ -302,5 +740,41 @@ class Artist:
             )
         )
 
+        return death_screen
+
+    @staticmethod
+    def draw_death_screen(
+            surface: pygame.Surface, 
+            font: pygame.font.Font, 
+            game_over_text: str, 
+            score: int, 
+            color: tuple) -> pygame.Surface:
+        """
+        Draws the death screen when the user dies
+        
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface to draw the death screen over
+        font : pygame.font.Font
+            The font to use for the text
+        game_over_text : str
+            The text to display
+        score : int
+            The player's score before they died
+        color : tuple
+            The color to set the text and score
+
+        Returns
+        -------
+        death_screen : pygame.Surface
+            The composed death screen, which can be blitted again as is
+        """
+        death_screen = Artist.compose_death_screen(
+            surface.get_size(), font, game_over_text, score, color
+        )
+
         # Put death screen on main screen
-        surface.blit(death_screen, (0, 0))
\ No newline at end of file
+        surface.blit(death_screen, (0, 0))
+
+        return death_screen
@@ -0,0 +1,268 @@
+from projectiles import ProjectileMaster
+
+from typing import NamedTuple
+
+import numpy as np
+
+class Solution(NamedTuple):
+    """
+    The shots that hit each target, refer to `BallisticSolver.solve`
+
+    Attributes
+    ----------
+    angle : np.ndarray
+        The angle to fire at
+    power : np.ndarray
+        The power to fire with
+    ticks : np.ndarray
+        The number of ticks the shot takes to reach the target
+    reachable : np.ndarray
+        Whether the target can be hit at all. Targets that can't be hit are 
+        aimed at directly, with the given (or maximum) power
+    """
+    angle: np.ndarray
+    power: np.ndarray
+    ticks: np.ndarray
+    reachable: np.ndarray
+
+class BallisticSolver:
+    """
+    Works out where to aim a projectile so it lands on a (moving) target
+
+    Projectiles move in whole ticks: every tick, gravity is added to the 
+    vertical velocity, and then the velocity is added to the position. After n
+    ticks of length t, a shot fired with velocity (v_x, v_y) has moved
+
+        (n t v_x,  n t v_y + g t**2 n (n + 1) / 2)
+
+    so for every flight time n there is exactly one velocity that meets a 
+    target moving at a constant velocity. The solver works out that velocity 
+    for every flight time up to max_ticks, for every shooter at once, and picks
+    the flight time that fits the power available. Shots that bounce off the 
+    edges of the screen aren't considered
+
+    Attributes
+    ----------
+    gravity : float
+        The gravity the projectiles fall with, per standard tick (default 
+        ProjectileMaster.GRAVITY)
+    max_ticks : int
+        The longest flight time considered (default 120)
+    """
+
+    def __init__(
+            self, 
+            gravity: float = ProjectileMaster.GRAVITY, 
+            max_ticks: int = 120) -> None:
+        """Initializes the solver and the flight times it considers"""
+        self.gravity = gravity
+        self.max_ticks = max_ticks
+        self.flight_ticks = np.arange(1, max_ticks + 1, dtype=np.float64)
+
+    def velocities(
+            self,
+            x: np.ndarray,
+            y: np.ndarray,
+            target_x: np.ndarray,
+            target_y: np.ndarray,
+            target_v_x: np.ndarray = 0,
+            target_v_y: np.ndarray = 0,
+            time: float = 1) -> tuple:
+        """
+        Works out the launch velocity that hits the target for every flight 
+        time
+
+        Parameters
+        ----------
+        x, y : np.ndarray
+            The positions the shots are fired from
+        target_x, target_y : np.ndarray
+            The positions of the targets
+        target_v_x, target_v_y : np.ndarray
+            The velocities of the targets, per standard tick (default 0)
+        time : float
+            The number of standard ticks each tick simulates (default 1)
+
+        Returns
+        -------
+        v_x, v_y : np.ndarray
+            (N, max_ticks) arrays of the launch velocities, for a flight of 
+            1 to max_ticks ticks
+        """
+        n = self.flight_ticks[None, :]
+        d_x = np.asarray(target_x - np.asarray(x), dtype=np.float64).reshape(-1, 1)
+        d_y = np.asarray(target_y - np.asarray(y), dtype=np.float64).reshape(-1, 1)
+
+        v_x = d_x / (n * time) + np.reshape(target_v_x, (-1, 1))
+        v_y = (
+            d_y / (n * time) + np.reshape(target_v_y, (-1, 1))
+            - self.gravity * time * (n + 1) / 2
+        )
+        return v_x, v_y
+
+    def highest_points(self, y: np.ndarray, v_y: np.ndarray, time: float = 1) -> np.ndarray:
+        """
+        Works out the highest (smallest) y every shot reaches before it lands
+
+        Parameters
+        ----------
+        y : np.ndarray
+            The positions the shots are fired from
+        v_y : np.ndarray
+            The (N, max_ticks) launch velocities, refer to `velocities`
+        time : float
+            The number of standard ticks each tick simulates (default 1)
+
+        Returns
+        -------
+        top : np.ndarray
+            The (N, max_ticks) highest y of every shot
+        """
+        y = np.asarray(y, dtype=np.float64).reshape(-1, 1)
+        n = self.flight_ticks[None, :]
+        g = self.gravity * time * time
+
+        # The height is a parabola in the tick, lowest at k = -v_y/(g t) - 1/2
+        # (the ticks on either side of it are checked, as it moves in steps)
+        k = np.clip(-v_y / (self.gravity * time) - 0.5, 0, n)
+        top = None
+        for tick in [np.floor(k), np.ceil(k)]:
+            height = y + tick * time * v_y + g * tick * (tick + 1) / 2
+            top = height if top is None else np.minimum(top, height)
+        return top
+
+    def solve(
+            self,
+            x: np.ndarray,
+            y: np.ndarray,
+            target_x: np.ndarray,
+            target_y: np.ndarray,
+            target_v_x: np.ndarray = 0,
+            target_v_y: np.ndarray = 0,
+            power: np.ndarray = None,
+            max_power: float = None,
+            ceiling: float = None,
+            time: float = 1) -> Solution:
+        """
+        Works out how to fire every shot so it hits its target
+
+        With a power, the angle is solved for the quickest shot that power 
+        can make. Without one, the power is solved as well, for the weakest 
+        shot that reaches the target
+
+        Parameters
+        ----------
+        x, y : np.ndarray
+            The positions the shots are fired from
+        target_x, target_y : np.ndarray
+            The positions of the targets
+        target_v_x, target_v_y : np.ndarray
+            The velocities of the targets, per standard tick (default 0)
+        power : np.ndarray
+            The power every shot is fired with, if it is fixed (default None,
+            the power is solved for)
+        max_power : float
+            The most power a solved shot may use (default None, no limit)
+        ceiling : float
+            The smallest y a shot may reach, so it doesn't bounce off the top 
+            of the screen (default None, no limit)
+        time : float
+            The number of standard ticks each tick simulates (default 1)
+
+        Returns
+        -------
+        solution : Solution
+            The angle, power, and flight time of every shot
+        """
+        v_x, v_y = self.velocities(
+            x, y, target_x, target_y, target_v_x, target_v_y, time
+        )
+        speed = np.hypot(v_x, v_y)
+        rows = np.arange(len(speed))
+
+        allowed = np.ones(speed.shape, dtype=bool)
+        if ceiling is not None:
+            allowed &= self.highest_points(y, v_y, time) >= ceiling
+
+        if power is not None:
+            power = np.broadcast_to(np.asarray(power, dtype=np.float64), rows.shape)
+
+            # The first flight time the power is enough for, or the one just 
+            # before it if that is closer to the power
+            fits = allowed & (speed <= power[:, None])
+            reachable = fits.any(axis=1)
+            chosen = np.argmax(fits, axis=1)
+
+            before = np.maximum(chosen - 1, 0)
+            closer = (
+                (chosen > 0) & allowed[rows, before]
+                & (np.abs(speed[rows, before] - power) < np.abs(speed[rows, chosen] - power))
+            )
+            chosen = np.where(closer, before, chosen)
+        else:
+            if max_power is not None:
+                allowed &= speed <= max_power
+
+            cost = np.where(allowed, speed, np.inf)
+            chosen = np.argmin(cost, axis=1)
+            reachable = np.isfinite(cost[rows, chosen])
+            fallback = max_power if max_power is not None else 0
+            power = np.where(reachable, speed[rows, chosen], fallback)
+
+        direct = np.arctan2(
+            np.asarray(target_y - np.asarray(y), dtype=np.float64),
+            np.asarray(target_x - np.asarray(x), dtype=np.float64)
+        ).reshape(-1)
+
+        return Solution(
+            angle = np.where(
+                reachable, np.arctan2(v_y[rows, chosen], v_x[rows, chosen]), direct
+            ),
+            power = power,
+            ticks = np.where(reachable, chosen + 1, 0),
+            reachable = reachable,
+        )
+
+    def aim(
+            self, 
+            cannons: list, 
+            target_x: float, 
+            target_y: float,
+            target_v_x: float = 0,
+            target_v_y: float = 0,
+            power: float = None, 
+            ceiling: float = None,
+            time: float = 1) -> Solution:
+        """
+        Aims every cannon at a target, solving all of them in one call
+
+        Parameters
+        ----------
+        cannons : list[Cannon]
+            The cannons to aim (their angle is set)
+        target_x, target_y : float
+            The position of the target
+        target_v_x, target_v_y : float
+            The velocity of the target, per standard tick (default 0)
+        power : float
+            The power the cannons fire with, refer to `solve` (default None)
+        ceiling : float
+            The smallest y a shot may reach, refer to `solve` (default None)
+        time : float
+            The number of standard ticks each tick simulates (default 1)
+
+        Returns
+        -------
+        solution : Solution
+            The solution of every cannon, in order
+        """
+        solution = self.solve(
+            np.array([cannon.x for cannon in cannons], dtype=np.float64),
+            np.array([cannon.y for cannon in cannons], dtype=np.float64),
+            target_x, target_y, target_v_x, target_v_y,
+            power = power, ceiling = ceiling, time = time
+        )
+
+        for cannon, angle in zip(cannons, solution.angle.tolist()):
+            cannon.angle = angle
+        return solution
@@ -0,0 +1,417 @@
+"""
+Plays batches of headless games in parallel, for balancing the game
+
+Run from the project root with, e.g.
+
+    python -m batch results --games 100 --grid num_targets=5,10,20 --grid bomb_chance=0.5,0.8
+
+Every combination of the grid's values is played --games times, each game with
+its own seed, by an autopilot that aims at the nearest target. The games are
+spread over a pool of processes, and each game's results are streamed into a
+columnar directory as it finishes, readable with `ColumnWriter.read(path)`.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from manager import Manager
+from ai import Policy
+
+import argparse
+import ast
+import itertools
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pygame
+
+class ColumnWriter:
+    """
+    Streams rows into a columnar directory
+
+    Every column is a file of raw little-endian values, appended to a chunk of
+    rows at a time, next to a schema.json giving each column's dtype and the
+    number of rows written. The schema is rewritten with every chunk, so the
+    rows written so far can be read even if the writer never finishes.
+
+    Attributes
+    ----------
+    SCHEMA : str
+        The name of the schema file
+    path : str
+        The directory the columns are written to
+    columns : dict
+        A dictionary of column name: np.dtype
+    chunk_size : int
+        The number of rows buffered before they are written (default 1024)
+    rows : int
+        The number of rows written to the files
+    """
+
+    SCHEMA = "schema.json"
+
+    def __init__(self, path: str, columns: dict, chunk_size: int = 1024) -> None:
+        """Creates the directory and empty column files"""
+        self.path = path
+        self.columns = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self.buffer: list = []
+
+        os.makedirs(path, exist_ok=True)
+        for name in self.columns:
+            open(self.column_path(path, name), "wb").close()
+        self.write_schema()
+
+    def __enter__(self) -> "ColumnWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def column_path(path: str, name: str) -> str:
+        """Returns the path of a column's file"""
+        return os.path.join(path, f"{name}.bin")
+
+    def write(self, row: dict) -> None:
+        """
+        Adds a row, writing the buffered rows once there is a chunk of them
+
+        Parameters
+        ----------
+        row : dict
+            A dictionary of column name: value, for every column
+        """
+        self.buffer.append(row)
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Appends the buffered rows to the column files"""
+        if not self.buffer:
+            return
+
+        for name, dtype in self.columns.items():
+            values = np.array([row[name] for row in self.buffer], dtype=dtype)
+            with open(self.column_path(self.path, name), "ab") as file:
+                file.write(values.tobytes())
+
+        self.rows += len(self.buffer)
+        self.buffer.clear()
+        self.write_schema()
+
+    def write_schema(self) -> None:
+        """Writes the dtype of every column and the number of rows written"""
+        schema = {
+            "rows": self.rows,
+            "columns": {name: dtype.str for name, dtype in self.columns.items()},
+        }
+        with open(os.path.join(self.path, self.SCHEMA), "w") as file:
+            json.dump(schema, file, indent=2)
+
+    def close(self) -> None:
+        """Writes the rows still buffered"""
+        self.flush()
+
+    @staticmethod
+    def read(path: str) -> dict:
+        """
+        Reads a columnar directory
+
+        Parameters
+        ----------
+        path : str
+            The directory written by a ColumnWriter
+
+        Returns
+        -------
+        columns : dict
+            A dictionary of column name: np.ndarray
+        """
+        with open(os.path.join(path, ColumnWriter.SCHEMA)) as file:
+            schema = json.load(file)
+
+        return {
+            name: np.fromfile(
+                ColumnWriter.column_path(path, name), dtype=dtype, count=schema["rows"]
+            )
+            for name, dtype in schema["columns"].items()
+        }
+
+class BatchRunner:
+    """
+    Plays every combination of a grid of game parameters many times, over a
+    pool of processes
+
+    Every game is headless and independent, so the games scale with the number
+    of processes. They are handed out a chunk at a time to keep the processes
+    busy without sending every game separately, and their results are written
+    as the chunks finish.
+
+    Attributes
+    ----------
+    PARAMETERS : dict
+        A dictionary of every tunable parameter: its default value
+    RESULTS : dict
+        A dictionary of every result of a game: its dtype
+    grid : dict
+        A dictionary of parameter name: the list of values to try. Parameters
+        left out keep their default
+    games : int
+        The number of games played with each combination of values (default 10)
+    seed : int
+        The seed every game's seed is drawn from (default 0)
+    max_ticks : int
+        The number of ticks a game is stopped after, if it hasn't ended
+        (default 3000)
+    workers : int
+        The number of processes (default None, one per CPU)
+    chunk_size : int
+        The number of games handed to a process at once (default 8)
+    policy : Policy
+        The policy of the artificial cannons, refer to `ai.Policy`. It is
+        pickled to every process (default None, a ChasePolicy)
+    """
+
+    PARAMETERS = {
+        "num_targets": 10,
+        "num_cannons": 3,
+        "bomb_chance": Manager.bomb_chance,
+        "strike_delay": Manager.strike_delay,
+        "strike_velocity": Manager.strike_velocity,
+        "target_drop_chance": Manager.target_drop_chance,
+        "ballistic_aim": Manager.ballistic_aim,
+        "min_target_size": 10,
+        "max_target_size": 30,
+        # How often the autopilot fires, in ticks
+        "fire_every": 10,
+    }
+
+    RESULTS = {
+        "score": "<i8",
+        "ticks": "<i8",
+        "projectiles_used": "<i8",
+        "targets_destroyed": "<i8",
+        "health": "<i8",
+        "won": "?",
+        "died": "?",
+    }
+
+    def __init__(
+            self,
+            grid: dict,
+            games: int = 10,
+            seed: int = 0,
+            max_ticks: int = 3000,
+            workers: int = None,
+            chunk_size: int = 8,
+            policy: Policy = None) -> None:
+        """Initializes the runner, checking the grid's parameters"""
+        unknown = set(grid) - set(self.PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+
+        self.grid = grid
+        self.games = games
+        self.seed = seed
+        self.max_ticks = max_ticks
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.policy = policy
+
+    def jobs(self) -> list:
+        """
+        Lists every game to play
+
+        Returns
+        -------
+        jobs : list
+            A (game number, seed, parameters) tuple for every game
+        """
+        names = list(self.grid)
+        settings = [
+            {**self.PARAMETERS, **dict(zip(names, values))}
+            for values in itertools.product(*self.grid.values())
+        ]
+
+        count = len(settings) * self.games
+        seeds = np.random.SeedSequence(self.seed).generate_state(count).tolist()
+
+        return [
+            (game, seeds[game], settings[game // self.games])
+            for game in range(count)
+        ]
+
+    def columns(self) -> dict:
+        """Returns the dtype of every column of the results"""
+        columns = {"game": "<i8", "seed": "<u4"}
+        for name, default in self.PARAMETERS.items():
+            columns[name] = "<f8" if isinstance(default, float) else "<i8"
+        columns.update(self.RESULTS)
+        return columns
+
+    def run(self, path: str) -> int:
+        """
+        Plays every game, writing their results to a columnar directory
+
+        Parameters
+        ----------
+        path : str
+            The directory to write the results to
+
+        Returns
+        -------
+        games : int
+            The number of games played
+        """
+        jobs = self.jobs()
+        chunks = [
+            jobs[start:start + self.chunk_size]
+            for start in range(0, len(jobs), self.chunk_size)
+        ]
+
+        with ColumnWriter(path, self.columns()) as writer, \
+                ProcessPoolExecutor(self.workers) as executor:
+            futures = [
+                executor.submit(self.run_games, chunk, self.max_ticks, self.policy)
+                for chunk in chunks
+            ]
+            for future in as_completed(futures):
+                for row in future.result():
+                    writer.write(row)
+
+        return len(jobs)
+
+    @staticmethod
+    def run_games(jobs: list, max_ticks: int, policy: Policy = None) -> list:
+        """
+        Plays a chunk of games, in a worker process
+
+        Returns
+        -------
+        rows : list[dict]
+            The row of results of every game
+        """
+        return [
+            {
+                "game": game,
+                "seed": seed,
+                **params,
+                **BatchRunner.run_game(seed, params, max_ticks, policy)
+            }
+            for game, seed, params in jobs
+        ]
+
+    @staticmethod
+    def run_game(seed: int, params: dict, max_ticks: int, policy: Policy = None) -> dict:
+        """
+        Plays a single game with the autopilot
+
+        Parameters
+        ----------
+        seed : int
+            The seed of the game
+        params : dict
+            A value for every one of the PARAMETERS
+        max_ticks : int
+            The number of ticks to stop after, if the game hasn't ended
+        policy : Policy
+            The policy of the artificial cannons (default None, a ChasePolicy)
+
+        Returns
+        -------
+        stats : dict
+            The final stats of the game, refer to `Manager.final_stats`
+        """
+        manager = BatchRunner.create_manager(seed, params, policy)
+
+        while not manager.done and manager.ticks < max_ticks:
+            BatchRunner.autopilot(manager, params["fire_every"])
+            manager.process_states()
+            manager.check_game_over()
+
+        stats = manager.final_stats()
+        return {name: stats[name] for name in BatchRunner.RESULTS}
+
+    @staticmethod
+    def create_manager(seed: int, params: dict, policy: Policy = None) -> Manager:
+        """
+        Creates a headless Manager with the given parameters, passed in when
+        it is created so they apply from the first tick (and would be recorded
+        by an InputRecorder)
+        """
+        return Manager(
+            num_targets = params["num_targets"],
+            num_cannons = params["num_cannons"],
+            headless = True,
+            seed = seed,
+            policy = policy,
+            min_target_size = params["min_target_size"],
+            max_target_size = params["max_target_size"],
+            balance = {name: params[name] for name in Manager.BALANCE}
+        )
+
+    @staticmethod
+    def autopilot(manager: Manager, fire_every: int) -> None:
+        """
+        Sets the simulated inputs of a headless game for the next tick
+
+        Aims at the target nearest to the user cannon, starts charging every
+        fire_every ticks, and fires halfway through
+
+        Parameters
+        ----------
+        manager : Manager
+            The headless manager to play
+        fire_every : int
+            The number of ticks between shots
+        """
+        user = manager.user_cannon
+        targets = manager.target_master.target_list
+
+        if targets:
+            nearest = min(
+                targets,
+                key=lambda target: (target.x - user.x)**2 + (target.y - user.y)**2
+            )
+            manager.mouse_pos = (nearest.x, nearest.y)
+
+        tick = manager.ticks % fire_every
+        if tick == 0:
+            manager.pending_events = [
+                pygame.event.Event(pygame.MOUSEBUTTONDOWN, button = 1)
+            ]
+        elif tick == fire_every // 2:
+            manager.pending_events = [
+                pygame.event.Event(pygame.MOUSEBUTTONUP, button = 1)
+            ]
+
+def parse_grid(options: list) -> dict:
+    """Parses --grid name=value,value,... options into a grid"""
+    grid = {}
+    for option in options:
+        name, _, values = option.partition("=")
+        grid[name] = [ast.literal_eval(value) for value in values.split(",")]
+    return grid
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("path", help="The directory to write the results to")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=VALUES")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=3000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    runner = BatchRunner(
+        parse_grid(args.grid), args.games, args.seed, args.max_ticks, args.workers
+    )
+    games = runner.run(args.path)
+    print(f"Played {games} games into {args.path}")
+
+if __name__ == "__main__":
+    main()
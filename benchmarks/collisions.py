@@ -0,0 +1,109 @@
+"""
+Benchmarks Manager.handle_collisions against the old all-pairs loops, next to
+the time of a whole tick
+
+Run from the project root with `python -m benchmarks.collisions`
+
+Half of the entities are targets, a quarter are user projectiles, and a quarter
+are enemy projectiles. The world grows with the entity count so the density (and
+so the number of real collisions) stays the same as in a normal game.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import random
+import time
+
+from manager import Manager
+
+def populate(manager: Manager, num_entities: int) -> None:
+    """Fills the manager with targets and projectiles in a world sized for them"""
+    scale = (num_entities / 100) ** 0.5
+    world_size = (int(800 * scale), int(600 * scale))
+
+    manager.target_master.target_list = []
+    for _ in range(num_entities // 2):
+        manager.target_master.create_random_target(
+            world_size, manager.target_master.calculate_target_size(0)
+        )
+
+    cannons = [manager.user_cannon] * (num_entities // 4)
+    for i in range(num_entities // 4):
+        cannons.append(manager.artificial_cannons[i % len(manager.artificial_cannons)])
+
+    for cannon in [manager.user_cannon, *manager.artificial_cannons]:
+        cannon.projectile_master.projectile_list = []
+
+    for cannon in cannons:
+        cannon.projectile_master.create_projectile(
+            random.randint(0, world_size[0]),
+            random.randint(0, world_size[1]),
+            0, 0
+        )
+
+def brute_force(manager: Manager) -> int:
+    """Runs the all-pairs collision checks the handlers used to do"""
+    hits = 0
+    user_projectiles = manager.user_cannon.projectile_master.projectile_list
+
+    for projectile in user_projectiles:
+        for target in manager.target_master.target_list:
+            hits += target.check_collision(projectile)
+
+    for artificial_cannon in manager.artificial_cannons:
+        for projectile in artificial_cannon.projectile_master.projectile_list:
+            hits += manager.user_cannon.check_collision(projectile)
+
+        for projectile in user_projectiles:
+            hits += artificial_cannon.check_collision(projectile)
+
+    return hits
+
+def time_call(manager: Manager, num_entities: int, func, repeat: int) -> float:
+    """Returns the best time of func over repeat freshly populated runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        populate(manager, num_entities)
+
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--brute-limit", type=int, default=2000,
+        help="skip the all-pairs baseline above this many entities"
+    )
+    args = parser.parse_args()
+
+    random.seed(0)
+    manager = Manager()
+
+    print(f"{'entities':>10} {'tick (ms)':>12} {'grid (ms)':>12} {'all pairs (ms)':>16}")
+    for num_entities in args.counts:
+        tick = time_call(
+            manager, num_entities, 
+            lambda: manager.process_states(draw=False), args.repeat
+        )
+        grid = time_call(
+            manager, num_entities, manager.handle_collisions, args.repeat
+        )
+
+        if num_entities <= args.brute_limit:
+            brute = time_call(
+                manager, num_entities, lambda: brute_force(manager), args.repeat
+            )
+            brute = f"{brute * 1000:16.2f}"
+        else:
+            brute = f"{'skipped':>16}"
+
+        print(f"{num_entities:>10} {tick * 1000:12.2f} {grid * 1000:12.2f} {brute}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmarks the memory and attribute access speed of the slotted entities
+
+Run from the project root with `python -m benchmarks.entities`
+
+Creates 100k moving targets and reports the bytes each one takes (measured with
+tracemalloc) and how long it takes to read and write their attributes. The same
+numbers are reported for an equivalent class that keeps its attributes in a
+__dict__, the way every entity did before the hierarchy was slotted.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from color import Color
+from targets import MovingSquare
+
+class DictTarget:
+    """A moving target that stores its attributes in a __dict__"""
+
+    def __init__(self, x: int, y: int, size: int = 30) -> None:
+        self.x, self.y = x, y
+        self.color = Color.rand_color()
+        self.size = size
+        self.health = 1
+        self.shape = 's'
+        self.target_id = None
+        self.v_x = random.randint(-2, 2)
+        self.v_y = random.randint(-2, 2)
+
+def create(cls: type, count: int) -> tuple:
+    """
+    Creates count entities of a class
+
+    Returns
+    -------
+    entities : list
+        The created entities
+    bytes_per_entity : float
+        The memory allocated per entity (not counting the list holding them)
+    """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    entities = [
+        cls(x=random.randint(0, 800), y=random.randint(0, 600), size=20)
+        for _ in range(count)
+    ]
+
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    # The list itself holds a pointer per entity
+    return entities, (used - 8 * count) / count
+
+def access(entities: list) -> None:
+    """Reads and writes the attributes a tick touches, like a move and a draw"""
+    for entity in entities:
+        entity.x += entity.v_x
+        entity.y += entity.v_y
+        entity.size, entity.color, entity.shape
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+
+    print(f"{'class':>12} {'bytes/entity':>14} {'access (ms)':>13}")
+    for name, cls in [("slotted", MovingSquare), ("__dict__", DictTarget)]:
+        entities, size = create(cls, args.count)
+
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            access(entities)
+            best = min(best, time.perf_counter() - start)
+
+        print(f"{name:>12} {size:14.1f} {best * 1000:13.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmarks removing dead entities from each Master
+
+Run from the project root with `python -m benchmarks.removal`
+
+Every run fills a master with entities, kills a random half of them, and times
+a single removal pass. The old removal (list.remove while iterating over the
+same list) is timed on the same entities for comparison, along with how many
+dead entities it left behind for the next tick.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import random
+import time
+
+from abstract import Drawable
+from bombs import BombMaster
+from color import Color
+from projectiles import ProjectileMaster
+from targets import TargetMaster
+
+def remove_while_iterating(entities: list) -> None:
+    """The removal the projectile master used to do"""
+    for entity in entities:
+        if not entity.is_alive:
+            entities.remove(entity)
+
+def explode_while_iterating(bombs: list, screen_y: int, user: Drawable) -> None:
+    """The removal the bomb master used to do"""
+    for bomb in bombs:
+        bomb.check_explode(screen_y, user)
+        if not bomb.is_alive:
+            bombs.remove(bomb)
+
+def make_projectiles(count: int, array_backed: bool = False) -> tuple:
+    """
+    Fills a ProjectileMaster
+
+    Returns
+    -------
+    remove : Callable
+        The master's removal pass
+    old_remove : Callable
+        The removal pass the master used to do, or None
+    entities : list
+        The master's entities
+    """
+    master = ProjectileMaster(array_backed=array_backed)
+    for _ in range(count):
+        master.create_projectile(
+            random.randint(0, 800), random.randint(0, 600), 10, 0
+        )
+
+    # The old removal never removed the views along with their rows
+    old_remove = None if array_backed else (
+        lambda: remove_while_iterating(master.projectile_list)
+    )
+    return master.remove_dead, old_remove, master.projectile_list
+
+def make_bombs(count: int) -> tuple:
+    """Fills a BombMaster with bombs that won't explode, see make_projectiles"""
+    master = BombMaster()
+    for _ in range(count):
+        master.create_bomb(random.randint(0, 800), random.randint(0, 300), 0)
+
+    user = Drawable(-1000, -1000, Color.WHITE, 1)
+    return (
+        lambda: master.remove_exploded(600, user),
+        lambda: explode_while_iterating(master.bomb_list, 600, user),
+        master.bomb_list
+    )
+
+def make_targets(count: int) -> tuple:
+    """
+    Fills a TargetMaster, see make_projectiles. Targets used to be filtered 
+    into a new list by the Manager, which is already linear
+    """
+    master = TargetMaster()
+    for _ in range(count):
+        master.create_random_target((800, 600), 20)
+    return master.remove_dead, None, master.target_list
+
+MASTERS = {
+    "projectiles": make_projectiles,
+    "array projectiles": lambda count: make_projectiles(count, True),
+    "bombs": make_bombs,
+    "targets": make_targets,
+}
+
+def time_removal(make, count: int, dying: float, old: bool) -> tuple:
+    """
+    Times one removal pass over freshly made entities
+
+    Returns
+    -------
+    seconds : float
+        How long the pass took, or None if there is no old pass to time
+    survivors : int
+        The number of dead entities still in the list afterwards
+    """
+    remove, old_remove, entities = make(count)
+    if old:
+        remove = old_remove
+    if remove is None:
+        return None, None
+
+    for entity in random.sample(entities, int(count * dying)):
+        entity.kill()
+
+    start = time.perf_counter()
+    remove()
+    seconds = time.perf_counter() - start
+
+    return seconds, sum(not entity.is_alive for entity in entities)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--dying", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(0)
+
+    print(
+        f"{'master':>18} {'compact (ms)':>14} {'survivors':>10} "
+        f"{'old (ms)':>10} {'old survivors':>14}"
+    )
+    for name, make in MASTERS.items():
+        new, survivors = min(
+            time_removal(make, args.count, args.dying, False)
+            for _ in range(args.repeat)
+        )
+        old, old_survivors = time_removal(make, args.count, args.dying, True)
+
+        if old is None:
+            old = f"{'-':>10} {'-':>14}"
+        else:
+            old = f"{old * 1000:10.2f} {old_survivors:>14}"
+
+        print(f"{name:>18} {new * 1000:14.2f} {survivors:>10} {old}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmarks drawing frames with the DirtyRectRenderer against redrawing the
+whole screen
+
+Run from the project root with `python -m benchmarks.rendering`
+
+Every frame moves part of the scene and draws it, in one of three scenes:
+"static", where only the user cannon turns, "few", where ten targets move, and
+"game", where every moving target moves as it does in a game.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import random
+import statistics
+import time
+
+from manager import Manager
+
+SCENES = ["static", "few", "game"]
+
+def create_manager(num_targets: int, dirty_rects: bool) -> Manager:
+    """Returns a Manager with num_targets random targets, its first frame drawn"""
+    random.seed(0)
+    manager = Manager(dirty_rects=dirty_rects)
+
+    for _ in range(num_targets):
+        manager.target_master.create_random_target(
+            manager.screen_size, manager.target_master.calculate_target_size(0)
+        )
+    manager.handle_drawing()
+
+    return manager
+
+def step(manager: Manager, scene: str) -> None:
+    """Moves the scene's part of the game, then draws a frame"""
+    if scene == "static":
+        manager.user_cannon.angle += 0.01
+    elif scene == "few":
+        for target in manager.target_master.target_list[:10]:
+            target.x = (target.x + 3) % manager.screen_size[0]
+    else:
+        manager.handle_target_movement()
+
+    manager.handle_drawing()
+
+def time_frames(num_targets: int, scene: str, dirty_rects: bool, frames: int) -> float:
+    """Returns the median time of a frame, in milliseconds"""
+    manager = create_manager(num_targets, dirty_rects)
+
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        step(manager, scene)
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times) * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 400, 1000])
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args()
+
+    print(f"{'targets':>8} {'scene':>8} {'full (ms)':>10} {'dirty (ms)':>11}")
+    for num_targets in args.counts:
+        for scene in SCENES:
+            full = time_frames(num_targets, scene, False, args.frames)
+            dirty = time_frames(num_targets, scene, True, args.frames)
+            print(f"{num_targets:>8} {scene:>8} {full:10.2f} {dirty:11.2f}")
+
+if __name__ == "__main__":
+    main()
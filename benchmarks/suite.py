@@ -0,0 +1,555 @@
+"""
+Benchmarks every Master's hot paths, the Artist, and the Manager's collision
+handlers and artificial cannons, and compares the results against a stored
+baseline
+
+Run from the project root with `python -m benchmarks.suite`
+
+Every case is timed at each entity count, on fresh entities for every repeat
+(with the garbage collector paused), in a few rounds each run in a fresh
+process, and its best and median times over every round are written to a JSON
+file, with a 95% confidence interval of the median. Given a baseline
+(benchmarks/baseline.json by default), a case is reported as a regression only
+if its median grew by more than the tolerance and its confidence interval lies
+wholly above the baseline's, so the noise of a single run isn't mistaken for
+one. Fast cases are noisier relative to their size, so the tolerance grows for
+cases faster than --reference-ms. Regressions are timed again in as many 
+rounds before they are reported, and the suite then exits with a non-zero 
+status. Pass --update-baseline to store the new results as the baseline 
+instead, on the machine that runs the comparison.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import fnmatch
+import gc
+import glob
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pygame
+
+from abstract import Drawable
+from artist import Artist
+from ballistics import BallisticSolver
+from benchmarks.collisions import populate
+from bombs import BombMaster
+from color import Color
+from manager import Manager, ScoreTable
+from projectiles import ProjectileMaster
+from targets import TargetMaster
+from trajectory import TrajectoryPreview
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+# The version of the results' format, a baseline in another one is re-recorded
+FORMAT = 2
+SCREEN_SIZE = (800, 600)
+
+def projectile_master(count: int, array_backed: bool = False) -> ProjectileMaster:
+    """Returns a ProjectileMaster with count projectiles flying in every direction"""
+    master = ProjectileMaster(array_backed=array_backed)
+    for _ in range(count):
+        master.create_projectile(
+            random.randint(30, 770), random.randint(30, 570),
+            random.randint(10, 60), random.uniform(-3, 3)
+        )
+    return master
+
+def kill_half(entities: list) -> None:
+    """Kills a random half of the entities"""
+    for entity in random.sample(entities, len(entities) // 2):
+        entity.kill()
+
+def target_master(count: int, array_backed: bool = False) -> TargetMaster:
+    """Returns a TargetMaster with count random targets"""
+    master = TargetMaster(array_backed=array_backed)
+    for _ in range(count):
+        master.create_random_target(SCREEN_SIZE, master.calculate_target_size(0))
+    return master
+
+def bomb_master(count: int, array_backed: bool = False) -> BombMaster:
+    """Returns a BombMaster with count falling bombs"""
+    master = BombMaster(array_backed=array_backed)
+    for _ in range(count):
+        master.create_bomb(random.randint(0, 800), random.randint(0, 600), 1)
+    return master
+
+# Each setup takes an entity count, builds fresh entities, and returns the call
+# to time
+
+def setup_projectile_move(count: int, array_backed: bool = False):
+    master = projectile_master(count, array_backed)
+    return lambda: master.move_all(SCREEN_SIZE)
+
+def setup_projectile_remove(count: int, array_backed: bool = False):
+    master = projectile_master(count, array_backed)
+    kill_half(master.projectile_list)
+    return master.remove_dead
+
+def setup_target_move(count: int, array_backed: bool = False):
+    master = target_master(count, array_backed)
+    return lambda: master.move_all(SCREEN_SIZE)
+
+def setup_target_create(count: int, array_backed: bool = False):
+    master = TargetMaster(array_backed=array_backed)
+
+    def create() -> None:
+        for _ in range(count):
+            master.create_random_target(SCREEN_SIZE, master.calculate_target_size(0))
+    return create
+
+def setup_bomb_move(count: int, array_backed: bool = False):
+    return bomb_master(count, array_backed).move_all
+
+def setup_bomb_remove(count: int, array_backed: bool = False):
+    master = bomb_master(count, array_backed)
+    kill_half(master.bomb_list)
+    user = Drawable(-1000, -1000, Color.WHITE, 1)
+    return lambda: master.remove_exploded(SCREEN_SIZE[1], user)
+
+def setup_ballistics(count: int, power: float = 60):
+    solver = BallisticSolver()
+    x = np.random.default_rng(0).uniform(400, 770, count)
+    y = np.random.default_rng(1).uniform(30, 570, count)
+    return lambda: solver.solve(x, y, 30, 300, power=power, ceiling=20)
+
+def setup_draw(count: int):
+    surface = pygame.Surface(SCREEN_SIZE)
+    args = [
+        (
+            random.randint(0, 800), random.randint(0, 600), Color.rand_color(),
+            random.randint(10, 30), random.choice('sct')
+        )
+        for _ in range(count)
+    ]
+
+    def draw() -> None:
+        for arg in args:
+            Artist.draw(surface, *arg)
+    return draw
+
+def setup_draw_cannon(count: int):
+    surface = pygame.Surface(SCREEN_SIZE)
+    args = [
+        (
+            random.randint(30, 770), random.randint(30, 570),
+            random.uniform(-3, 3), random.randint(10, 60), Color.RED
+        )
+        for _ in range(count)
+    ]
+
+    def draw() -> None:
+        for arg in args:
+            Artist.draw_cannon(surface, *arg)
+    return draw
+
+def setup_draw_score(count: int):
+    surface = pygame.Surface(SCREEN_SIZE)
+    score_table = ScoreTable()
+    score_table.targets_destroyed = random.randint(0, 100)
+    args = score_table.score_args('s', 5)
+    return lambda: Artist.draw_score(surface, *args)
+
+def setup_preview(cached: bool):
+    def setup(count: int):
+        surface = pygame.Surface(SCREEN_SIZE)
+        preview = TrajectoryPreview(SCREEN_SIZE)
+        if cached:
+            preview.path(30, 300, -0.6, 50)
+
+        def draw() -> None:
+            points, _ = preview.path(30, 300, -0.6, 50)
+            Artist.draw_trajectory(surface, points, Color.LIGHT_BLUE)
+        return draw
+    return setup
+
+def setup_cannon_movement(count: int):
+    manager = Manager(num_cannons=count, headless=True, seed=0)
+    return manager.handle_cannon_movement
+
+def setup_collisions(handler: str):
+    def setup(count: int):
+        manager = Manager(headless=True, seed=0)
+        populate(manager, count)
+        # The individual handlers need this tick's collision grids
+        if handler != "handle_collisions":
+            manager.update_spatial_index()
+        return getattr(manager, handler)
+    return setup
+
+# A case is its setup and its entity counts (None for the counts passed in)
+CASES = {
+    "ProjectileMaster.move_all": (setup_projectile_move, None),
+    "ProjectileMaster.move_all[array]": (
+        lambda count: setup_projectile_move(count, True), None
+    ),
+    "ProjectileMaster.remove_dead": (setup_projectile_remove, None),
+    "ProjectileMaster.remove_dead[array]": (
+        lambda count: setup_projectile_remove(count, True), None
+    ),
+    "TargetMaster.move_all": (setup_target_move, None),
+    "TargetMaster.move_all[array]": (
+        lambda count: setup_target_move(count, True), None
+    ),
+    "TargetMaster.create_random_target": (setup_target_create, None),
+    "TargetMaster.create_random_target[array]": (
+        lambda count: setup_target_create(count, True), None
+    ),
+    "BombMaster.move_all": (setup_bomb_move, None),
+    "BombMaster.move_all[array]": (
+        lambda count: setup_bomb_move(count, True), None
+    ),
+    "BombMaster.remove_exploded": (setup_bomb_remove, None),
+    "BombMaster.remove_exploded[array]": (
+        lambda count: setup_bomb_remove(count, True), None
+    ),
+    "BallisticSolver.solve": (setup_ballistics, None),
+    "BallisticSolver.solve[power]": (
+        lambda count: setup_ballistics(count, None), None
+    ),
+    "Artist.draw": (setup_draw, None),
+    "Artist.draw_cannon": (setup_draw_cannon, None),
+    # The score table doesn't depend on the number of entities
+    "Artist.draw_score": (setup_draw_score, [1]),
+    # A frame of the preview at max power, cached and simulated
+    "TrajectoryPreview.draw": (setup_preview(True), [1]),
+    "TrajectoryPreview.draw[miss]": (setup_preview(False), [1]),
+    # The artificial cannons, run by the default policy
+    "Manager.handle_cannon_movement": (setup_cannon_movement, [10, 100, 1000]),
+    "Manager.handle_collisions": (setup_collisions("handle_collisions"), None),
+    "Manager.handle_target_collisions": (
+        setup_collisions("handle_target_collisions"), None
+    ),
+    "Manager.handle_user_collision": (
+        setup_collisions("handle_user_collision"), None
+    ),
+    "Manager.handle_artificial_collision": (
+        setup_collisions("handle_artificial_collision"), None
+    ),
+}
+
+def median_interval(times: list, z: float = 1.96) -> tuple:
+    """
+    Returns a confidence interval of the median of some times
+
+    The interval runs between the order statistics around the middle, so it
+    holds whatever the times' distribution is (timings are skewed by the odd
+    slow repeat)
+
+    Parameters
+    ----------
+    times : list[float]
+        The times
+    z : float
+        The normal quantile of the confidence level (default 1.96, for 95%)
+
+    Returns
+    -------
+    interval : tuple
+        The (low, high) ends of the interval
+    """
+    times = sorted(times)
+    n = len(times)
+    half_width = z * math.sqrt(n) / 2
+    low = max(0, math.floor(n / 2 - half_width))
+    high = min(n - 1, math.ceil(n / 2 + half_width) - 1)
+    return times[low], times[high]
+
+def time_case(setup, count: int, repeat: int) -> list:
+    """
+    Times a case at an entity count
+
+    Returns
+    -------
+    times : list[float]
+        The time of the call on every repeat, in milliseconds
+    """
+    times = []
+    for _ in range(repeat):
+        func = setup(count)
+
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            times.append((time.perf_counter() - start) * 1000)
+        finally:
+            gc.enable()
+
+    return times
+
+def summarize(times: list) -> dict:
+    """
+    Summarizes a case's times
+
+    Returns
+    -------
+    timing : dict
+        The "best" and "median" time, and the "low" and "high" ends of the
+        median's confidence interval, in milliseconds
+    """
+    low, high = median_interval(times)
+    return {
+        "best": min(times), 
+        "median": statistics.median(times), 
+        "low": low, 
+        "high": high,
+    }
+
+def run(names: list, counts: list, repeat: int) -> dict:
+    """
+    Runs the named cases in this process
+
+    Returns
+    -------
+    times : dict
+        A dictionary of case name: {entity count: times}, with the counts as
+        strings (as they are stored in JSON)
+    """
+    times = {}
+    for name in names:
+        setup, case_counts = CASES[name]
+        times[name] = {}
+        for count in case_counts or counts:
+            random.seed(0)
+            times[name][str(count)] = time_case(setup, count, repeat)
+    return times
+
+def run_rounds(names: list, counts: list, repeat: int, rounds: int) -> dict:
+    """
+    Runs the named cases in rounds, each in a fresh process, and pools their
+    times
+
+    A process's memory layout, hash seeds, and the state of the machine while
+    it runs can make every one of its timings of a case faster or slower 
+    together, so repeats within a single process understate how much a case 
+    varies between runs. Pooling several processes' repeats includes that
+    variation in the confidence intervals
+
+    Returns
+    -------
+    times : dict
+        The pooled times, refer to `run`
+    """
+    if rounds == 1:
+        return run(names, counts, repeat)
+
+    pooled: dict = {}
+    for round_ in range(rounds):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "times.json")
+            subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.suite",
+                    # The names are passed as patterns matching only them
+                    "--only", *map(glob.escape, names), 
+                    "--counts", *map(str, counts),
+                    "--repeat", str(repeat), "--times", path,
+                ],
+                check=True,
+                env={**os.environ, "PYGAME_HIDE_SUPPORT_PROMPT": "1"}
+            )
+            with open(path) as file:
+                times = json.load(file)
+
+        for name, timings in times.items():
+            for count, case_times in timings.items():
+                pooled.setdefault(name, {}).setdefault(count, []).extend(case_times)
+        print(f"Finished round {round_ + 1} of {rounds}")
+
+    return pooled
+
+def report_results(times: dict) -> dict:
+    """Summarizes and prints every case's pooled times"""
+    results = {}
+    for name, timings in times.items():
+        results[name] = {}
+        for count, case_times in timings.items():
+            timing = results[name][count] = summarize(case_times)
+            print(
+                f"{name:>42} {count:>8} {timing['median']:11.3f} "
+                f"{timing['low']:8.3f} - {timing['high']:.3f}"
+            )
+    return results
+
+def threshold(old: float, tolerance: float, reference_ms: float) -> float:
+    """
+    Returns the fraction a case's median may grow by before it is a regression
+
+    Cases faster than reference_ms get a tolerance growing with the square 
+    root of how much faster they are, as timer resolution, cache misses, and
+    the odd interruption weigh more on them
+
+    Parameters
+    ----------
+    old : float
+        The baseline's median, in milliseconds
+    tolerance : float
+        The fraction a case of reference_ms or slower may grow by
+    reference_ms : float
+        The time from which cases get the plain tolerance
+
+    Returns
+    -------
+    fraction : float
+        The fraction the median may grow by
+    """
+    return tolerance * max(1, math.sqrt(reference_ms / max(old, 1e-6)))
+
+def compare(
+        results: dict, 
+        baseline: dict, 
+        tolerance: float, 
+        reference_ms: float) -> list:
+    """
+    Compares results against a baseline's
+
+    A case regressed if its median grew by more than its threshold, and the
+    confidence interval of its median lies wholly above the baseline's
+
+    Parameters
+    ----------
+    results : dict
+        The new results, refer to `run`
+    baseline : dict
+        The baseline's results
+    tolerance : float
+        The fraction a median may grow by before it is a regression, refer to
+        `threshold`
+    reference_ms : float
+        The time below which cases get a larger tolerance, refer to 
+        `threshold`
+
+    Returns
+    -------
+    regressions : list
+        A (name, count, baseline ms, new ms) tuple for every regression, 
+        comparing medians
+    """
+    regressions = []
+    for name, timings in results.items():
+        for count, timing in timings.items():
+            old = baseline.get(name, {}).get(count)
+            if old is None:
+                continue
+
+            grown = timing["median"] > old["median"] * (
+                1 + threshold(old["median"], tolerance, reference_ms)
+            )
+            if grown and timing["low"] > old["high"]:
+                regressions.append((name, count, old["median"], timing["median"]))
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5, help="repeats per round")
+    parser.add_argument(
+        "--rounds", type=int, default=3, 
+        help="the number of processes the cases are timed in, one after another"
+    )
+    parser.add_argument(
+        "--only", nargs="+", default=["*"],
+        help="only run the cases matching these patterns, e.g. 'Artist.*'"
+    )
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--reference-ms", type=float, default=1.0)
+    # Used by the rounds, to hand their times back
+    parser.add_argument("--times", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    pygame.font.init()
+
+    names = [
+        name for name in CASES
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in args.only)
+    ]
+
+    if args.times:
+        with open(args.times, "w") as file:
+            json.dump(run(names, args.counts, args.repeat), file)
+        return
+
+    times = run_rounds(names, args.counts, args.repeat, args.rounds)
+
+    print(f"{'case':>42} {'entities':>8} {'median (ms)':>11} {'95% interval':>14}")
+    report = {
+        "machine": {
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pygame": pygame.version.ver,
+        },
+        "format": FORMAT,
+        "repeat": args.repeat,
+        "rounds": args.rounds,
+        "results": report_results(times),
+    }
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Updated the baseline {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --update-baseline")
+        return
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+
+    if baseline.get("format") != FORMAT:
+        print(
+            f"The baseline {args.baseline} is in an old format, "
+            "run with --update-baseline"
+        )
+        return
+
+    baseline = baseline["results"]
+    regressions = compare(
+        report["results"], baseline, args.tolerance, args.reference_ms
+    )
+
+    # Time the regressed cases again in as many rounds, pooling the new times
+    # with the old ones. A regression has to hold up over both
+    for name, count, _, _ in regressions:
+        retimed = run_rounds(
+            [name], [int(count)], args.repeat, args.rounds
+        )
+        times[name][count].extend(retimed[name][count])
+        report["results"][name][count] = summarize(times[name][count])
+
+    if regressions:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        regressions = compare(
+            report["results"], baseline, args.tolerance, args.reference_ms
+        )
+
+    for name, count, old, new in regressions:
+        print(f"REGRESSION {name} at {count}: {old:.3f} ms -> {new:.3f} ms (median)")
+
+    if regressions:
+        sys.exit(1)
+    print("No regressions against the baseline")
+
+if __name__ == "__main__":
+    main()
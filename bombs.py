@@ -2,32 +2,66 @@ from abstract import Drawable, Killable, Moveable
 from artist import Artist
 from pygame import Surface
 from color import Color
+from pool import ObjectPool
+from storage import ArrayStore, StoreView, SHAPE_CODES
 
 import random
+import numpy as np
+
+# The fields an array-backed BombMaster keeps for each bomb
+BOMB_FIELDS: dict = {
+    'x': (np.float64, 1),
+    'y': (np.float64, 1),
+    'v_x': (np.float64, 1),
+    'v_y': (np.float64, 1),
+    'size': (np.int64, 1),
+    'health': (np.int64, 1),
+    'shape': (np.int8, 1),
+    'color': (np.uint8, 3),
+    # The owner's target_id, or -1 for no owner
+    'owner_id': (np.int64, 1),
+}
 
 class BombMaster:
     """
-    Implements methods for target-wide bomb checking
+    Implements methods for game-wide bomb checking
 
     Introduces methods for creating bombs and maintaining existing 
-    bombs (drawing them and moving them)
+    bombs (drawing them and moving them). The Manager keeps a single BombMaster
+    for every bomb in the game, so the work done each tick grows with the 
+    number of live bombs rather than the number of targets, and a bomb keeps 
+    falling after the target that dropped it is destroyed
     
     Attributes
     ----------
     bomb_list : list[Bomb]
         A list of all the bombs created by this BombMaster
+    pool : ObjectPool
+        The pool exploded bombs are released into and new ones are taken from
+        (its own pool, unless one is passed in to share)
+    array_backed : bool
+        Whether the bombs' attributes are stored in arrays (default False). 
+        Every bomb is then moved, and checked for exploding, at once, and 
+        bomb_list holds views into the store
+    store : ArrayStore
+        The attributes of every bomb, if array_backed
     """
 
-    def __init__(self) -> None:
+    def __init__(self, pool: ObjectPool = None, array_backed: bool = False) -> None:
         """Initializes the empty bombs list"""
         self.bomb_list: list[Bomb] = []
+        self.pool = pool if pool is not None else ObjectPool()
+
+        self.array_backed = array_backed
+        self.store = ArrayStore(BOMB_FIELDS) if array_backed else None
 
     def create_bomb(
             self, 
             x: int, 
             y: int, 
             v_y: int, 
-            chance: float = 1) -> None:
+            chance: float = 1,
+            owner_id: int = None) -> None:
         """
         Creates a bomb at the target's position given a few parameters
     
@@ -43,6 +77,8 @@ class BombMaster:
             The initial y velocity of the bomb (it will be affected by gravity)
         chance : float
             The decimal chance of the target creating a bomb (default 1) 
+        owner_id : int
+            The target_id of the target dropping the bomb (default None)
         """
 
         # If the chance to drop a bomb is too high
@@ -54,32 +90,101 @@ class BombMaster:
             'x': x,
             'y': y,
             'v_y': v_y,
+            'owner_id': owner_id,
         }
 
-        # Create and store the bomb
-        created_bomb = Bomb(**params)
+        if self.array_backed:
+            self.add_view(**params)
+            return
+
+        # Create (or reuse) and store the bomb
+        created_bomb = self.pool.acquire(Bomb, **params)
         self.bomb_list.append(created_bomb)
 
+    def add_view(
+            self, 
+            x: float, 
+            y: float, 
+            v_y: float, 
+            size: int = 30, 
+            health: int = 1, 
+            color: tuple = None, 
+            shape: str = 'c',
+            owner_id: int = None) -> "BombView":
+        """
+        Stores a bomb's attributes, and adds a view of it to the bomb list 
+        (array_backed only). Refer to `Bomb` for the parameters
+
+        Returns
+        -------
+        view : BombView
+            The view of the new bomb
+        """
+        index = self.store.append(
+            x = x, y = y, v_y = v_y, size = size, health = health,
+            color = color or Color.RED, shape = SHAPE_CODES.index(shape),
+            owner_id = -1 if owner_id is None else owner_id
+        )
+
+        view = BombView(self.store, index)
+        self.bomb_list.append(view)
+        return view
+
     def draw_all(self, surface: Surface) -> None:
         """
         Simply loops through all the bombs and draws them to the surface
         
-        Simply calls the bomb.draw function on each bomb
+        Blits every bomb at once with Artist.draw_many
 
         Parameters
         ----------
         surface : pygame.Surface
             The surface to draw the bomb to
         """
-        [bomb.draw(surface) for bomb in self.bomb_list]
+        Artist.draw_many(surface, self.bomb_list)
 
-    def move_all(self) -> None:
+    def move_all(self, time: float = 1) -> None:
         """
         Simply loops through all the bombs and moves them
           
-        Moves them by calling bomb.move function on each bomb
+        Moves them by calling bomb.move function on each bomb, or moves every
+        bomb at once if the master is array_backed
+
+        Parameters
+        ----------
+        time : float
+            The number of standard ticks to move for (default 1)
         """
-        [bomb.move(gravity=2) for bomb in self.bomb_list]
+        if self.array_backed:
+            self.move_arrays(
+                self.store.column('y'), self.store.column('v_y'), time, gravity=2
+            )
+            return
+
+        [bomb.move(time, gravity=2) for bomb in self.bomb_list]
+
+    @staticmethod
+    def move_arrays(
+            y: np.ndarray, 
+            v_y: np.ndarray, 
+            time: float = 1, 
+            gravity: int = 0) -> None:
+        """
+        Moves a batch of bombs in place, the same way Bomb.move moves one
+
+        Parameters
+        ----------
+        y : np.ndarray
+            The y coordinates of the bombs
+        v_y : np.ndarray
+            The downwards velocities of the bombs
+        time : float
+            The number of standard ticks to move for (default 1)
+        gravity : int
+            The rate of gravity (default 0)
+        """
+        v_y += time * gravity
+        y += time * v_y
 
     def remove_exploded(self, screen_y: int, user: Drawable) -> None:
         """
@@ -92,10 +197,65 @@ class BombMaster:
         user : Drawable
             A Drawable object that is the user
         """
+        if self.array_backed:
+            self.remove_exploded_arrays(screen_y, user)
+            return
+
         for bomb in self.bomb_list:
             bomb.check_explode(screen_y, user)
-            if not bomb.is_alive:
-                self.bomb_list.remove(bomb)
+
+        Killable.remove_dead(self.bomb_list, self.pool)
+
+    def remove_exploded_arrays(self, screen_y: int, user: Drawable) -> None:
+        """
+        Explodes and removes the bombs at the bottom of the screen or at the
+        user, checking every bomb at once (array_backed only)
+
+        Uses the same rules as Bomb.check_explode, comparing squared distances
+        for the collision with the user. The user takes the damage of every 
+        bomb that hit them in a single deal
+
+        Parameters
+        ----------
+        screen_y : int
+            The y position of the screen
+        user : Drawable
+            A Drawable object that is the user
+        """
+        store = self.store
+        x, y = store.column('x'), store.column('y')
+        size = store.column('size')
+
+        at_bottom = y >= screen_y - size
+        at_user = (
+            (x - user.x)**2 + (y - user.y)**2 <= (size + user.size + 10)**2
+        )
+
+        hits = int(np.count_nonzero(at_user))
+        if hits and isinstance(user, Killable):
+            user.deal(hits)
+
+        # Bombs killed some other way are removed as well
+        keep = ~(at_bottom | at_user) & (store.column('health') > 0)
+        if keep.all():
+            return
+
+        store.compact(keep)
+
+        # The bombs before the first removed one keep their rows
+        first = int(np.argmin(keep))
+        kept = self.bomb_list[first:]
+        self.bomb_list[first:] = [
+            bomb for bomb, alive in zip(kept, keep[first:].tolist()) if alive
+        ]
+        for index in range(first, len(self.bomb_list)):
+            self.bomb_list[index]._index = index
+
+    def clear(self) -> None:
+        """Removes every bomb"""
+        self.bomb_list = []
+        if self.array_backed:
+            self.store.clear()
     
 class Bomb(Drawable, Killable, Moveable):
     """
@@ -130,8 +290,12 @@ class Bomb(Drawable, Killable, Moveable):
     shape : str
         A string of characters 's', 't', or 'c' denoting whether the object is a
         square, triangle, or circle (default 'c')
+    owner_id : int
+        The target_id of the target that dropped the bomb, or None
     """
 
+    __slots__ = ('owner_id',)
+
     def __init__(
             self, 
             x: int, 
@@ -140,7 +304,8 @@ class Bomb(Drawable, Killable, Moveable):
             size: int = 30, 
             health: int = 1,
             color: int = None, 
-            shape: int = 'c') -> None:
+            shape: int = 'c',
+            owner_id: int = None) -> None:
         
         color = color or Color.RED
 
@@ -150,20 +315,41 @@ class Bomb(Drawable, Killable, Moveable):
         Moveable.__init__(self, v_x = 0, v_y = v_y)
         # Shape initialization
         self.shape = shape
+        self.owner_id = owner_id
+
+    def reset(
+            self, 
+            x: int, 
+            y: int, 
+            v_y: int = None,  
+            size: int = 30, 
+            health: int = 1,
+            color: int = None, 
+            owner_id: int = None) -> None:
+        """
+        Resets an exploded bomb taken from an ObjectPool, as if it had just 
+        been created
+        """
+        self.x, self.y = x, y
+        self.v_x, self.v_y = 0, v_y
+        self.color = color or Color.RED
+        self.size = size
+        self.health = health
+        self.owner_id = owner_id
     
-    def move(self, time: int = 1, gravity: int = 0) -> None:
+    def move(self, time: float = 1, gravity: int = 0) -> None:
         """
         Moves the bomb based on its velocity and gravity
 
         Parameters
         ----------
-        time : int
-            The rate of time (default 1)
+        time : float
+            The number of standard ticks to move for (default 1)
         gravity : int
             The rate of gravity (default 0)
         """
         # Add gravity
-        self.v_y += gravity
+        self.v_y += time * gravity
 
         # Change y-position based on time
         self.y += time * self.v_y
@@ -235,4 +421,23 @@ class Bomb(Drawable, Killable, Moveable):
             self.kill()
 
         if at_user and isinstance(user, Killable):
-            user.deal()
\ No newline at end of file
+            user.deal()
+
+class BombView(StoreView, Bomb):
+    """
+    A Bomb whose attributes live in a row of an ArrayStore. The row a view 
+    points at is kept up to date by BombMaster.remove_exploded. Refer to 
+    `StoreView` and `Bomb`
+    """
+
+    __slots__ = ('_store', '_index')
+
+    @property
+    def owner_id(self) -> int:
+        """The target_id of the target that dropped the bomb, or None"""
+        owner_id = int(self._store.owner_id[self._index])
+        return None if owner_id == -1 else owner_id
+
+    @owner_id.setter
+    def owner_id(self, owner_id: int) -> None:
+        self._store.owner_id[self._index] = -1 if owner_id is None else owner_id
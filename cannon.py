@@ -4,12 +4,13 @@ from abstract import Moveable, Drawable, Killable
 from artist import Artist
 
 from projectiles import ProjectileMaster
+from pool import ObjectPool
 from targets import TargetMaster
 
+from scheduler import Scheduler
+
 from pygame import Surface
 import random
-import time
-import threading
 
 class Cannon(Drawable, Killable):
     """
@@ -46,8 +47,24 @@ class Cannon(Drawable, Killable):
     projectile_master : ProjectileMaster
         The cannon's projectile master, in charge of controlling the projectiles 
         fired by this cannon
+    array_backed : bool
+        Whether the projectile master stores its projectiles in NumPy arrays
+        (default False)
+    pool : ObjectPool
+        The pool the projectile master reuses projectiles from, if it should 
+        share one (default None, it gets its own)
     """
 
+    __slots__ = (
+        'angle', 
+        'max_pow', 
+        'min_pow', 
+        'pow', 
+        'active', 
+        'chosen_type', 
+        'projectile_master'
+    )
+
     def __init__(
             self, 
             x: int, 
@@ -56,7 +73,9 @@ class Cannon(Drawable, Killable):
             color: tuple =None, 
             angle: int= 0, 
             max_pow: int = 50, 
-            min_pow: int = 10) -> None:
+            min_pow: int = 10,
+            array_backed: bool = False,
+            pool: ObjectPool = None) -> None:
         """Initializes the cannon's attributes"""
         # Set a random color if one is not provided
         color = color or Color.rand_color()
@@ -79,7 +98,9 @@ class Cannon(Drawable, Killable):
 
         # The cannon's projectile master, in charge of controlling the projectiles
         # fired by this cannon
-        self.projectile_master = ProjectileMaster()
+        self.projectile_master = ProjectileMaster(
+            array_backed=array_backed, pool=pool
+        )
 
     def change_chosen(self, chosen_type: str) -> None:
         """
@@ -99,9 +120,9 @@ class Cannon(Drawable, Killable):
         """Activates the gun's charge. Sets active to True"""
         self.active = True
 
-    def gain(self, increment: int = 2) -> None:
+    def gain(self, increment: int = 2, time: float = 1) -> None:
         """
-        Increases the gun's power by an increment amount
+        Increases the gun's power by an increment amount per standard tick
         
         Maxes out at the cannon's max_pow
 
@@ -109,9 +130,11 @@ class Cannon(Drawable, Killable):
         ----------
         increment : int
             The amount to increment the power by (default 2)
+        time : float
+            The number of standard ticks to gain power for (default 1)
         """
         if self.active and self.pow < self.max_pow:
-            self.pow += increment
+            self.pow += time * increment
 
     def strike(self, vel: int = None) -> None:
         """
@@ -212,6 +235,8 @@ class MovingCannon(Moveable, Cannon):
         fired by this cannon
     """
 
+    __slots__ = ()
+
     def __init__(
             self, 
             v_x: int = 7, 
@@ -225,7 +250,8 @@ class MovingCannon(Moveable, Cannon):
             self, 
             screen_size: tuple, 
             move_x: int = 0, 
-            move_y: int = 0) -> None:
+            move_y: int = 0,
+            time: float = 1) -> None:
         """
         Changes the position of the cannon based on its velocity and a multiplier
 
@@ -242,16 +268,18 @@ class MovingCannon(Moveable, Cannon):
             The x movement multiplier (default 0)
         move_y : int
             The y movement multiplier (default 0)
+        time : float
+            The number of standard ticks to move for (default 1)
         """
         # Move x based on its velocity and constrict it to the screen size
-        self.x += move_x * self.v_x
+        self.x += time * move_x * self.v_x
         self.x = max(30, min(self.x, screen_size[0] - 30))
 
         # Move y based on its velocity and constrict it to the screen size
-        self.y += move_y * self.v_y
+        self.y += time * move_y * self.v_y
         self.y = max(30, min(self.y, screen_size[1] - 30))
     
-    def move_right(self, screen_size: tuple) -> None:
+    def move_right(self, screen_size: tuple, time: float = 1) -> None:
         """
         Delagates to the move function the parameters necessary to move right
 
@@ -261,10 +289,12 @@ class MovingCannon(Moveable, Cannon):
         ----------
         screen_size : tuple
             The size of the screen
+        time : float
+            The number of standard ticks to move for (default 1)
         """
-        self.move(screen_size, 1, 0)
+        self.move(screen_size, 1, 0, time)
 
-    def move_left(self, screen_size: tuple) -> None:
+    def move_left(self, screen_size: tuple, time: float = 1) -> None:
         """
         Delagates to the move function the parameters necessary to move left
 
@@ -274,10 +304,12 @@ class MovingCannon(Moveable, Cannon):
         ----------
         screen_size : tuple
             The size of the screen
+        time : float
+            The number of standard ticks to move for (default 1)
         """
-        self.move(screen_size, -1, 0)
+        self.move(screen_size, -1, 0, time)
     
-    def move_up(self, screen_size: tuple) -> None:
+    def move_up(self, screen_size: tuple, time: float = 1) -> None:
         """
         Delagates to the move function the parameters necessary to move up
 
@@ -287,10 +319,12 @@ class MovingCannon(Moveable, Cannon):
         ----------
         screen_size : tuple
             The size of the screen
+        time : float
+            The number of standard ticks to move for (default 1)
         """
-        self.move(screen_size, 0, -1)
+        self.move(screen_size, 0, -1, time)
     
-    def move_down(self, screen_size: tuple) -> None:
+    def move_down(self, screen_size: tuple, time: float = 1) -> None:
         """
         Delagates to the move function the parameters necessary to move down
 
@@ -300,8 +334,10 @@ class MovingCannon(Moveable, Cannon):
         ----------
         screen_size : tuple
             The size of the screen
+        time : float
+            The number of standard ticks to move for (default 1)
         """
-        self.move(screen_size, 0, 1)
+        self.move(screen_size, 0, 1, time)
 
 class ArtificialCannon(MovingCannon):
     """
@@ -313,107 +349,56 @@ class ArtificialCannon(MovingCannon):
     ----------
     Refer to `MovingCannon`
         Changes to default values for v_x and v_y (3) and min_pow (30)
-    strike_thread : threading.Thread
-        A thread that handles periodic striking   
+    strike_event : ScheduledEvent
+        The scheduled event that handles periodic striking
+    striking : bool
+        Whether or not the cannon is currently firing at the user
     """
+    __slots__ = ('strike_event',)
+
     def __init__(
             self, 
             v_x: int = 3, 
             v_y: int = 3, 
             min_pow: int = 30, 
             *args, **kwargs) -> None:
-        """Initializes the MovingCannon and sets the strike_thread to None"""
+        """Initializes the MovingCannon and sets the strike_event to None"""
         super().__init__(v_x, v_y, min_pow = min_pow, *args, **kwargs)
 
-        self.strike_thread = None
-
-    def determine_move(
-            self, 
-            user_cannon: Drawable, 
-            screen_size: tuple) -> bool:
-        """
-        Determines which way the cannon should move
-
-        Always tries to follow the user unless it's too close (100 units away)
-
-        Parameters
-        ----------
-        user_cannon : Drawable
-            A Drawable object that is the user cannon
-        screen_size : tuple
-            The size of the screen. Used to constrict movement
-
-        Returns
-        -------
-        moved : bool
-            Whether or not a movement was made
-        """
-        # The x and y distances from the user cannon
-        d_x = self.x - user_cannon.x
-        d_y = self.y - user_cannon.y
-
-        # The linear distance from the cannon
-        dist = sum(
-                    [
-                        (self.x - user_cannon.x)**2, 
-                        (self.y - user_cannon.y)**2
-                    ]
-                )**0.5
-        min_dist = self.size + user_cannon.size + 100
-
-        # If we're too close, don't move
-        if dist < min_dist:
-            return False
-
-        # If we're to the left of the user cannon, move right
-        if d_x < 0:
-            self.move_right(screen_size)
-        # Otherwise, move left
-        elif d_x > 0:
-            self.move_left(screen_size)
-        
-        # Similarly, if we're above the cannon, move down
-        if d_y < 0:
-            self.move_down(screen_size)
-        # If we're below it, move up
-        elif d_y > 0:
-            self.move_up(screen_size)
+        self.strike_event = None
 
-        return True
+    @property
+    def striking(self) -> bool:
+        """A property denoting whether or not the cannon is firing at the user"""
+        return self.strike_event is not None
 
-    def keep_striking(
+    def start_striking(
             self, 
-            delay: float = 0.5, 
+            scheduler: Scheduler,
+            delay: int, 
             vel_to_shoot: int = 60) -> None:
         """
-        Keeps the artificial cannon firing while the strike_thread exists
+        Keeps the artificial cannon firing on a timer until end_striking
         
-        delay : float
-            The delay to wait between shots (default 0.5)
+        scheduler : Scheduler
+            The game's scheduler, which runs the strikes
+        delay : int
+            The number of ticks to wait between shots
         vel_to_shoot : int
             The power to shoot the shot with (default 60)
         """
-        # While the strike_thread exists
-        while self.strike_thread:
-            # Sleep for delay amount of time, check if the thread exists again
-            # (It may have died since the start of checking)
-            time.sleep(delay)
-            if self.strike_thread:
-                # Shoot the shot
-                self.strike(vel_to_shoot)
-
-    def start_thread(self) -> None:
-        """Starts the strike_thread"""
-        if not self.strike_thread:
-            self.strike_thread = threading.Thread(
-                                                    target=self.keep_striking, 
-                                                    daemon=True
+        if not self.strike_event:
+            self.strike_event = scheduler.schedule_every(
+                                                    delay, 
+                                                    self.strike, 
+                                                    vel_to_shoot
                                                 )
-            self.strike_thread.start()
         
-    def end_thread(self) -> None:
-        """Ends the thread by resetting strike_thread to None"""
-        self.strike_thread = None
+    def end_striking(self) -> None:
+        """Stops firing by cancelling the strike_event"""
+        if self.strike_event:
+            self.strike_event.cancel()
+            self.strike_event = None
     
     def determine_target_spawning(
             self, 
@@ -428,7 +413,7 @@ class ArtificialCannon(MovingCannon):
         the player and placing targets, or stationary and firing projectiles at
         the user
 
-        We check which state it's in by checking the strike_thread's existance
+        We check which state it's in by checking whether it is striking
 
         Parameters
         ----------
@@ -442,7 +427,7 @@ class ArtificialCannon(MovingCannon):
 
         # If the artificial tank is not moving, or we don't get the chance of 
         # dropping a target
-        if self.strike_thread or random.random() > chance:
+        if self.striking or random.random() > chance:
             return
     
         # Uses the target master to create a target
@@ -1,5 +1,5 @@
 from manager import Manager
 
-m = Manager()
+m = Manager(frame_rate=60)
 
 m.game_loop()
\ No newline at end of file
@@ -1,12 +1,26 @@
 from cannon import MovingCannon, ArtificialCannon
 from targets import TargetMaster
+from bombs import BombMaster
+from pool import ObjectPool
 from color import Color
-from artist import Artist
+from artist import Artist, TextCache
+from spatial import UniformGrid
+from abstract import Drawable
+from ballistics import BallisticSolver
+from ai import AIController, Policy
 
-import threading
+from scheduler import Scheduler
+from renderer import DirtyRectRenderer
+from profiler import TickProfiler
+from replay import InputRecorder
+from timestep import FixedTimestep, Interpolator
+from pipeline import RenderThread, WorldSnapshot
+from trajectory import TrajectoryPreview
+
+import numpy as np
 import pygame
-import time
 import random
+from collections import defaultdict
 
 class ScoreTable:
     """
@@ -31,6 +45,9 @@ class ScoreTable:
         The font we're using
     score: int
         The number of targets destroyed
+    text_cache : TextCache
+        The cache the table's text is rendered through, shared with the Artist 
+        by default. Its hits and misses show how much text is re-rendered
     
     """
     def __init__(
@@ -38,11 +55,27 @@ class ScoreTable:
             targets_destroyed: int = 0, 
             projectiles_used: int = 0, 
             font_name: str = "dejavusansmono", 
-            font_size: int = 25):
+            font_size: int = 25,
+            text_cache: TextCache = None):
         """Initializes the score table"""
         self.targets_destroyed = targets_destroyed
         self.projectiles_used = projectiles_used
-        self.font = pygame.font.SysFont(font_name, font_size)
+        self.font_name = font_name
+        self.font_size = font_size
+        self._font = None
+        self.text_cache = text_cache if text_cache is not None else Artist.text_cache
+
+    @property
+    def font(self) -> pygame.font.Font:
+        """
+        The font we're using, loaded the first time it is needed
+
+        Loading it lazily lets a headless Manager keep score without 
+        initializing pygame.font
+        """
+        if self._font is None:
+            self._font = pygame.font.SysFont(self.font_name, self.font_size)
+        return self._font
     
     @property
     def score(self) -> int:
@@ -66,8 +99,20 @@ class ScoreTable:
         health : int
             The user's health
         """
-        Artist.draw_score(
-            surface, 
+        Artist.draw_score(surface, *self.score_args(chosen_type, health))
+
+    def score_args(self, chosen_type: str = None, health: int = None) -> tuple:
+        """
+        Returns the arguments to pass to the Artist draw_score method
+
+        Parameters
+        ----------
+        chosen_type : str
+            The currently chosen projectile type
+        health : int
+            The user's health
+        """
+        return (
             self.font, 
             self.targets_destroyed, 
             self.projectiles_used, 
@@ -75,13 +120,14 @@ class ScoreTable:
             chosen_type,
             health,
             Color.RED, 
-            Color.WHITE
-            )
+            Color.WHITE,
+            self.text_cache
+        )
     
     def draw_game_over_screen(
                         self,
                         surface: pygame.Surface,
-                        game_over_text: str) -> None:
+                        game_over_text: str) -> pygame.Surface:
         """
         Draws the game over screen
         
@@ -91,8 +137,13 @@ class ScoreTable:
             The surface to draw the game over screen onto
         game_over_text : str
             The text to display (Either "You Lose" or "You Win", for example)
+
+        Returns
+        -------
+        game_over_screen : pygame.Surface
+            The composed game over screen
         """
-        Artist.draw_death_screen(
+        return Artist.draw_death_screen(
             surface, 
             self.font, 
             game_over_text,
@@ -113,40 +164,200 @@ class Manager:
         The initial number of targets to spawn (default 10)
     num_cannons : int
         The initial number of artifical cannons to spawn (default 3)
+    min_target_size, max_target_size : int
+        The range of the sizes of the targets spawned (default 10 to 30), 
+        refer to `TargetMaster.calculate_target_size`
+    balance : dict
+        The balance attributes (refer to BALANCE) this game overrides, if 
+        provided (default None, the class defaults)
     screen : pygame.Surface
         The screen surface we draw everything onto 
     clock : pygame.Clock
         The clock (keeps track of in-game ticks)
     refresh_rate : int
-        The refresh rate of the game (default 15)
+        The standard tick rate every speed in the game is measured in (15)
+    tick_rate : int
+        The number of ticks simulated per second of game time (default None,
+        the refresh_rate). Every tick moves the game forward by time_step
+        standard ticks, so gameplay runs at the same speed at any tick rate
+    time_step : float
+        The number of standard ticks each tick simulates
+    frame_rate : int
+        The number of frames drawn per second, if provided. The ticks are then
+        run on a fixed timestep, and every frame is drawn interpolated between
+        the last two ticks (default None, a frame is drawn with every tick)
+    timestep : FixedTimestep
+        The accumulator deciding how many ticks to run each frame, if there is
+        a frame_rate
+    interpolator : Interpolator
+        The positions of every entity before the last tick, if there is a
+        frame_rate
     user_cannon : MovingCannon
         The player object
     artficial_cannons : list[ArtificialCannon]
         A list of the artificial enemy cannons
+    controller : AIController
+        Runs the artificial cannons with the policy given (default a 
+        ChasePolicy: chase the user, then stop and fire)
     target_master : TargetMaster
         The controller of all the targets on the screen
-    bomb_spawning_thread : threading.Thread
-        A thread that handles periodic bomb spawning for all targets
+    bomb_master : BombMaster
+        The controller of every bomb on the screen, whichever target dropped it
+    projectile_pool : ObjectPool
+        The pool of dead projectiles shared by every cannon
+    target_grid : UniformGrid
+        The collision grid of the targets
+    user_projectile_grid : UniformGrid
+        The collision grid of the user's projectiles
+    enemy_projectile_grid : UniformGrid
+        The collision grid of the artificial cannons' projectiles
+    ballistics : BallisticSolver
+        The solver the artificial cannons aim with, if ballistic_aim is set
+    scheduler : Scheduler
+        The timer heap that runs enemy firing and bomb spawning, keyed on ticks
+    bomb_spawning_event : ScheduledEvent
+        The next scheduled round of bomb spawning for all targets
+    headless : bool
+        Whether the game runs without a display, as fast as possible, with a 
+        fixed logical timestep of one tick per process_states (default False)
+    seed : int
+        The seed for every random call in the game, if provided (default None)
+    renderer : DirtyRectRenderer
+        The renderer that only redraws what changed, if dirty_rects was passed
+        (default None, the whole screen is redrawn every frame). It only pays
+        off when most of the scene is static: in a normal game most targets
+        move every frame, so frames fall back to a full redraw and cost about
+        the same as without it
+    dirty : list[pygame.Rect]
+        The areas of the screen the renderer changed on the last frame
+    pipeline : RenderThread
+        The thread drawing the frames, if pipelined was passed. Every tick then
+        only takes a WorldSnapshot for the thread to draw, and copies the last
+        frame it drew to the screen (default None, frames are drawn in the 
+        tick). Can't be combined with dirty_rects
+    preview : TrajectoryPreview
+        Predicts the path of the user's shot, drawn while it is charged, if 
+        trajectory_preview was passed (default True)
+    world_snapshot : WorldSnapshot
+        The snapshot taken for the render thread this tick, until it is handed
+        over by show_frame
+    profiler : TickProfiler
+        Times every phase of every tick, if provided (default None, the phases
+        run without any timing)
+    recorder : InputRecorder
+        Records the inputs and random seed of every tick, if provided, so the
+        game can be replayed by a ReplayPlayer. The game is seeded with the 
+        recorder's seed (default None)
+    array_backed : bool
+        Whether the targets and bombs are stored in arrays and moved all at 
+        once, refer to `TargetMaster` and `BombMaster` (default False). The 
+        game plays out exactly as it does with objects
+    ticks : int
+        The number of ticks processed so far
+    held_keys : set
+        The keys held down by the (simulated) headless player
+    mouse_pos : tuple
+        The mouse position of the (simulated) headless player, or None
+    pending_events : list[pygame.event.Event]
+        The events the (simulated) headless player will send on the next tick
+    bomb_chance : float
+        The chance of each target dropping a bomb in a round of bomb spawning
+        (0.8)
+    strike_delay : float
+        The delay between an artificial cannon's shots, in seconds (0.5)
+    strike_velocity : int
+        The power of an artificial cannon's shots (60)
+    target_drop_chance : float
+        The chance of a moving artificial cannon dropping a target on a 
+        standard tick (0.01)
+    ballistic_aim : bool
+        Whether the artificial cannons aim for where their shots will fall on
+        the user, instead of straight at them (False)
+    BALANCE : tuple
+        The names of the balance attributes above, which a game can override
+        with balance
     """
+
+    # The balance of the game. Class defaults, which a game can override
+    BALANCE = (
+        "bomb_chance", "strike_delay", "strike_velocity", 
+        "target_drop_chance", "ballistic_aim"
+    )
+    bomb_chance = 0.8
+    strike_delay = 0.5
+    strike_velocity = 60
+    target_drop_chance = 0.01
+    ballistic_aim = False
+
     def __init__(
             self, 
             num_targets: int = 10, 
-            num_cannons: int = 3) -> None:
+            num_cannons: int = 3,
+            headless: bool = False,
+            seed: int = None,
+            dirty_rects: bool = False,
+            profiler: TickProfiler = None,
+            recorder: InputRecorder = None,
+            tick_rate: int = None,
+            frame_rate: int = None,
+            pipelined: bool = False,
+            array_backed: bool = False,
+            trajectory_preview: bool = True,
+            policy: Policy = None,
+            min_target_size: int = 10,
+            max_target_size: int = 30,
+            balance: dict = None) -> None:
         """Initializes the Manager"""
         self.screen_size = (800, 600)
-        self.init_pygame()
-        self.init_clock()
+        self.headless = headless
+        self.seed = seed
+        unknown = set(balance or {}) - set(self.BALANCE)
+        if unknown:
+            raise ValueError(f"Unknown balance attributes: {', '.join(sorted(unknown))}")
+        for name, value in (balance or {}).items():
+            setattr(self, name, value)
+        if dirty_rects and pipelined:
+            raise ValueError("A pipelined game can't use dirty_rects")
+        self.renderer = DirtyRectRenderer() if dirty_rects else None
+        self.pipeline = None
+        self.world_snapshot = None
+        self.preview = None
+        if trajectory_preview:
+            self.preview = TrajectoryPreview(self.screen_size)
+        self.dirty = None
+        self.profiler = profiler
+        self.recorder = recorder
+        if recorder is not None:
+            seed = self.seed = recorder.seed
+        if seed is not None:
+            random.seed(seed)
+
+        if not headless:
+            self.init_pygame()
+        self.init_clock(tick_rate, frame_rate)
+        self.init_inputs()
         self.done = False
 
         self.num_cannons = num_cannons
+        self.min_target_size = min_target_size
+        self.max_target_size = max_target_size
+        self.array_backed = array_backed
+        self.controller = AIController(policy)
         self.init_cannons()
 
         self.score_t = ScoreTable()
         self.num_targets = num_targets
-        self.bomb_spawning_thread = None
-        self.start_bomb_thread()
-        
-        self.update_display()
+        self.bomb_spawning_event = None
+        self.start_bomb_spawning()
+
+        if recorder is not None:
+            recorder.start(self)
+
+        if not headless:
+            if pipelined:
+                self.pipeline = RenderThread(self.screen_size)
+                self.pipeline.start()
+            self.update_display()
 
     def init_pygame(self) -> None:
         """Initalizes the Pygame module and the screen"""
@@ -156,23 +367,139 @@ class Manager:
         self.screen = pygame.display.set_mode(self.screen_size)
         pygame.display.set_caption("The Gun of Khiryanov II")
 
-    def update_display(self) -> None:
-        """Updates the Pygame screen by calling display.flip()"""
-        pygame.display.flip()
+    def update_display(self, rects: list = None) -> None:
+        """
+        Updates the Pygame screen by calling display.flip(), or only the given
+        areas of the screen by calling display.update()
+
+        Parameters
+        ----------
+        rects : list[pygame.Rect]
+            The areas of the screen to update (default None, the whole screen)
+        """
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    def show_frame(self) -> None:
+        """
+        Updates the display with the frame that was drawn, then hands the next
+        snapshot to the render thread, if the game is pipelined
+
+        The snapshot is handed over last, so the thread draws it while this one
+        waits for the next tick, instead of competing for the GIL mid-tick
+        """
+        self.update_display(self.dirty)
+
+        if self.pipeline and self.world_snapshot is not None:
+            self.pipeline.submit(self.world_snapshot)
+            self.world_snapshot = None
+
+    def init_clock(self, tick_rate: int = None, frame_rate: int = None) -> None:
+        """
+        Initializes the Pygame clock, refresh rate, tick rate, frame rate, and 
+        tick counter
 
-    def init_clock(self) -> None:
-        """Initializes the Pygame clock and refresh rate"""
+        Parameters
+        ----------
+        tick_rate : int
+            The number of ticks simulated per second (default None, the 
+            refresh rate)
+        frame_rate : int
+            The number of frames drawn per second (default None, one per tick)
+        """
         self.clock = pygame.time.Clock()
         self.refresh_rate = 15
+        self.tick_rate = tick_rate or self.refresh_rate
+        self.time_step = self.refresh_rate / self.tick_rate
+        self.ticks = 0
+        self.scheduler = Scheduler()
+
+        self.frame_rate = frame_rate
+        self.timestep = None
+        self.interpolator = None
+        if frame_rate is not None:
+            self.timestep = FixedTimestep(1 / self.tick_rate)
+            self.interpolator = Interpolator()
+
+    def seconds_to_ticks(self, seconds: float) -> int:
+        """Converts a delay in seconds to a (non-zero) number of ticks"""
+        return max(1, round(seconds * self.tick_rate))
+
+    def init_inputs(self) -> None:
+        """Initializes the simulated inputs used in headless mode"""
+        self.held_keys = set()
+        self.mouse_pos = None
+        self.pending_events = []
+
+    def read_events(self) -> list:
+        """
+        Returns the events to handle this tick
+
+        Returns
+        -------
+        events : list[pygame.event.Event]
+            The Pygame events, or the pending simulated events if headless
+        """
+        if self.headless:
+            events, self.pending_events = self.pending_events, []
+        else:
+            events = pygame.event.get()
+
+        if self.recorder is not None:
+            self.recorder.record_events(events)
+        return events
+
+    def read_pressed_keys(self):
+        """
+        Returns which keys are held down
+
+        Returns
+        -------
+        keys_pressed : Sequence[bool]
+            A mapping of key to whether it is held down
+        """
+        if self.headless:
+            keys_pressed = defaultdict(bool, dict.fromkeys(self.held_keys, True))
+        else:
+            keys_pressed = pygame.key.get_pressed()
+
+        if self.recorder is not None:
+            return self.recorder.record_keys(keys_pressed)
+        return keys_pressed
+
+    def read_mouse_pos(self) -> tuple:
+        """
+        Returns the mouse position, or None if the window isn't focused
+
+        Returns
+        -------
+        mouse_pos : tuple
+            The (x, y) position of the mouse
+        """
+        if self.headless:
+            mouse_pos = self.mouse_pos
+        elif pygame.mouse.get_focused():
+            mouse_pos = pygame.mouse.get_pos()
+        else:
+            mouse_pos = None
+
+        if self.recorder is not None:
+            self.recorder.record_mouse(mouse_pos)
+        return mouse_pos
 
     def init_cannons(self) -> None:
         """Intializes the user cannon, artificial cannons, and target_master"""
+        # Every cannon reuses dead projectiles from the same pool
+        self.projectile_pool = ObjectPool()
         
         # Create the user cannon
         self.user_cannon = MovingCannon(
             x = 30, 
             y = self.screen_size[1]//2,
-            color = Color.LIGHT_BLUE
+            color = Color.LIGHT_BLUE,
+            pool = self.projectile_pool
         )
 
         # Initializes an artifical cannon for each cannon we should have
@@ -183,38 +510,118 @@ class Manager:
             y = random.randint(0, self.screen_size[1]),
             v_x = random.randint(2, 5),
             v_y = random.randint(2, 5),
-            color = Color.RED
+            color = Color.RED,
+            pool = self.projectile_pool
         ))
 
-        self.target_master = TargetMaster()
+        self.target_master = TargetMaster(
+            min_size = self.min_target_size, 
+            max_size = self.max_target_size, 
+            array_backed = self.array_backed
+        )
+        self.bomb_master = BombMaster(array_backed = self.array_backed)
 
-    def process_states(self) -> None:
-        """Processes the entire game - an aspect of the main game loop"""
-        # Handle any inputs by the player
-        self.handle_events()
-        
-        # Set the user and artificial cannon angles
-        self.handle_angles()
-
-        # Handle movement
-        self.handle_cannon_movement() # cannon 
-        self.handle_target_movement() # targets
-        self.handle_projectile_movement() # projectiles
-        self.handle_bomb_movement() # bombs
-        
-        # Handle collisions
-        self.handle_collisions()
+        # The broad phase collision grids, rebuilt every tick
+        self.target_grid = UniformGrid()
+        self.user_projectile_grid = UniformGrid()
+        self.enemy_projectile_grid = UniformGrid()
+
+        self.ballistics = BallisticSolver()
+
+    def process_states(self, draw: bool = True) -> None:
+        """
+        Processes the entire game - an aspect of the main game loop
+
+        Parameters
+        ----------
+        draw : bool
+            Whether or not to draw the tick, if the game has a display (default
+            True)
+        """
+        self.ticks += 1
+
+        # Every recorded tick starts from a recorded seed, so a replay draws
+        # the same random numbers
+        if self.recorder is not None:
+            random.seed(self.recorder.begin_tick(self.ticks))
+
+        if self.profiler is None:
+            for _, phase in self.tick_phases(draw):
+                phase()
+        else:
+            self.profiler.run_tick(
+                self.ticks, self.tick_phases(draw), self.entity_counts
+            )
+
+        if self.recorder is not None:
+            self.recorder.end_tick()
+
+    def tick_phases(self, draw: bool = True) -> list:
+        """
+        Lists every phase of a tick, in the order they run
+
+        Parameters
+        ----------
+        draw : bool
+            Whether or not to include the drawing phases, if the game has a
+            display (default True)
+
+        Returns
+        -------
+        phases : list
+            A (name, handler) pair for every phase
+        """
+        phases = [
+            # Run the enemy strikes and bomb drops due this tick
+            ("scheduler", lambda: self.scheduler.run_due(self.ticks)),
+
+            # Handle any inputs by the player
+            ("events", self.handle_events),
+
+            # Set the user and artificial cannon angles
+            ("angles", self.handle_angles),
+
+            # Handle movement
+            ("cannons", self.handle_cannon_movement),
+            ("targets", self.handle_target_movement),
+            ("projectiles", self.handle_projectile_movement),
+            ("bombs", self.handle_bomb_movement),
+
+            # Handle collisions
+            ("collisions", self.handle_collisions),
 
-        # Handle dead objects
-        self.handle_exploded_bombs() # bombs
-        self.handle_dead_projectiles() # projectiles
+            # Handle dead objects
+            ("exploded", self.handle_exploded_bombs),
+            ("dead", self.handle_dead_projectiles),
 
-        # Handles new sets of target spawns
-        self.handle_new_missions()
+            # Handles new sets of target spawns
+            ("missions", self.handle_new_missions),
+        ]
 
-        # Draw everything to the screen
-        self.handle_drawing()
-        self.update_display()
+        if draw and not self.headless:
+            # Draw everything to the screen
+            phases.append(("drawing", self.handle_drawing))
+            phases.append(("display", self.show_frame))
+
+        return phases
+
+    def entity_counts(self) -> tuple:
+        """
+        Counts the entities in the game, for the profiler
+
+        Returns
+        -------
+        counts : tuple
+            The number of targets, projectiles, bombs, and cannons alive
+        """
+        cannons = [self.user_cannon, *self.artificial_cannons]
+
+        return (
+            len(self.target_master.target_list),
+            sum(len(cannon.projectile_master.projectile_list) for cannon in cannons),
+            len(self.bomb_master.bomb_list),
+            len(cannons),
+        )
     
     def handle_angles(self) -> None:
         """
@@ -225,10 +632,22 @@ class Manager:
         """
 
         # Get mouse position and set angle
-        if pygame.mouse.get_focused():
-            mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.read_mouse_pos()
+        if mouse_pos:
             self.user_cannon.set_angle(*mouse_pos)
         
+        # Aim every artificial cannon's shot to fall on the user at once, 
+        # keeping it below the top of the screen (a projectile's size)
+        if self.ballistic_aim and self.artificial_cannons:
+            self.ballistics.aim(
+                self.artificial_cannons, 
+                self.user_cannon.x, self.user_cannon.y,
+                power = self.strike_velocity, 
+                ceiling = 20,
+                time = self.time_step
+            )
+            return
+
         # Set each artificial cannon's angle to the user
         for artificial_cannon in self.artificial_cannons:
             artificial_cannon.set_angle(self.user_cannon.x, self.user_cannon.y)
@@ -257,10 +676,10 @@ class Manager:
         }
 
         # Move depending on the move key
-        keys_pressed = pygame.key.get_pressed()
+        keys_pressed = self.read_pressed_keys()
         for key, move_func in key_to_move.items():
             if keys_pressed[key]:
-                move_func(self.screen_size)
+                move_func(self.screen_size, self.time_step)
         
         # Switch depending on the switch key
         for key, chosen_type in type_switcher.items():
@@ -268,35 +687,27 @@ class Manager:
                 self.user_cannon.change_chosen(chosen_type)
         
         # Check if the user cannon should be gaining power
-        self.user_cannon.gain()
+        self.user_cannon.gain(time = self.time_step)
 
-        # Starts or ends the thread depending on if the artificial cannon
-        # is within range (or spawn targets if it isn't)
-        for artificial_cannon in self.artificial_cannons:
-            
-            if artificial_cannon.determine_move(
-                                                self.user_cannon, 
-                                                self.screen_size
-                                                ):
-                artificial_cannon.end_thread()
-            
-            else:
-                artificial_cannon.start_thread()
-        
-            artificial_cannon.determine_target_spawning(
-                self.target_master, self.score_t.score, 0.01
-                )
+        # Moves every artificial cannon, and starts or ends striking depending
+        # on if it is within range (or spawns targets if it isn't), as the 
+        # controller's policy decides
+        self.controller.update(self)
 
     def handle_target_movement(self) -> None:
         """Handles the movement of all the targets"""
-        self.target_master.move_all(self.screen_size)
+        self.target_master.move_all(self.screen_size, self.time_step)
 
     def handle_projectile_movement(self) -> None:
         """Handles the movement of all the projectiles"""
-        self.user_cannon.projectile_master.move_all(self.screen_size)
+        self.user_cannon.projectile_master.move_all(
+            self.screen_size, self.time_step
+        )
         
         for artificial_cannon in self.artificial_cannons:
-            artificial_cannon.projectile_master.move_all(self.screen_size)
+            artificial_cannon.projectile_master.move_all(
+                self.screen_size, self.time_step
+            )
 
     def handle_dead_projectiles(self) -> None:
         """Removes dead projectiles from the screen"""
@@ -306,78 +717,230 @@ class Manager:
 
     def handle_bomb_movement(self) -> None:
         """Handles the movement of all the bombs"""
-        for target in self.target_master.target_list:
-            target.bomb_master.move_all()
+        self.bomb_master.move_all(self.time_step)
 
     def handle_exploded_bombs(self) -> None:
         """Removes dead bombs from the screen"""
-        for target in self.target_master.target_list:
-            target.bomb_master.remove_exploded(
-                                                self.screen_size[1], 
-                                                self.user_cannon
-                                            )
+        self.bomb_master.remove_exploded(self.screen_size[1], self.user_cannon)
 
     def handle_collisions(self) -> None:
         """Handles target and user collisions by delagating to the respective function"""
+        self.update_spatial_index()
         self.handle_target_collisions()
         self.handle_user_collision()
         self.handle_artificial_collision()
+
+    def update_spatial_index(self) -> None:
+        """
+        Rebuilds the collision grids for this tick
+
+        The targets, user projectiles, and enemy projectiles each get a grid so
+        the collision handlers only check pairs that are close to each other.
+        Their positions and sizes are kept for the batched collision checks
+        """
+        self.user_projectiles = [
+            projectile 
+            for projectile in self.user_cannon.projectile_master.projectile_list
+            if projectile.is_alive
+        ]
+        self.enemy_projectiles = [
+            projectile
+            for artificial_cannon in self.artificial_cannons
+            for projectile in artificial_cannon.projectile_master.projectile_list
+            if projectile.is_alive
+        ]
+
+        self.target_arrays = UniformGrid.entity_arrays(
+            self.target_master.target_list
+        )
+        self.user_projectile_arrays = UniformGrid.entity_arrays(
+            self.user_projectiles
+        )
+        self.enemy_projectile_arrays = UniformGrid.entity_arrays(
+            self.enemy_projectiles
+        )
+
+        self.target_grid.rebuild(*self.target_arrays)
+        self.user_projectile_grid.rebuild(*self.user_projectile_arrays)
+        self.enemy_projectile_grid.rebuild(*self.enemy_projectile_arrays)
     
     def handle_target_collisions(self) -> None:
         """
         Handles target collisions by checking if any projectile collided
         with any target. The objects must agree on shape type
         """
-        for projectile in self.user_cannon.projectile_master.projectile_list:
-            for target in self.target_master.target_list:
-                
-                if target.check_collision(projectile):
-                    
-                    if target.shape == projectile.shape:
-                        self.target_master.target_list.remove(target)
-                        self.score_t.targets_destroyed += 1
+        targets = self.target_master.target_list
+
+        _, hit = Drawable.collide_many(
+            *self.user_projectile_arrays,
+            *self.target_arrays,
+            np.array([projectile.shape for projectile in self.user_projectiles]),
+            np.array([target.shape for target in targets]),
+            pairs = self.target_grid.query_pairs(*self.user_projectile_arrays)
+        )
+        
+        # A target hit by several projectiles is only destroyed once
+        hit_targets = set(hit.tolist())
+        if hit_targets:
+            self.score_t.targets_destroyed += len(hit_targets)
+            for j in hit_targets:
+                targets[j].kill()
+            self.target_master.remove_dead()
                 
     def handle_user_collision(self) -> None:
         """
         Handles user collisions by checking if any artificial projectile
         collided with the user
         """
-        for artificial_cannon in self.artificial_cannons:
-            for projectile in artificial_cannon.projectile_master.projectile_list:
-                if self.user_cannon.check_collision(projectile):
-                    self.user_cannon.deal()
-                    artificial_cannon.projectile_master.projectile_list.remove(projectile)
+        user_arrays = UniformGrid.entity_arrays([self.user_cannon])
+
+        _, hit = Drawable.collide_many(
+            *user_arrays,
+            *self.enemy_projectile_arrays,
+            pairs = self.enemy_projectile_grid.query_pairs(*user_arrays)
+        )
+
+        for j in hit:
+            self.user_cannon.deal()
+            # Dead projectiles are removed by handle_dead_projectiles
+            self.enemy_projectiles[j].kill()
     
     def handle_artificial_collision(self) -> None:
         """
         Handles artificial cannon collisions by checking if any user
         projectiles collided with the artificial cannon
         """
-        for artificial_cannon in self.artificial_cannons:
-            for projectile in self.user_cannon.projectile_master.projectile_list:
+        cannon_arrays = UniformGrid.entity_arrays(self.artificial_cannons)
+
+        hits = Drawable.collide_many(
+            *cannon_arrays,
+            *self.user_projectile_arrays,
+            pairs = self.user_projectile_grid.query_pairs(*cannon_arrays)
+        )
+
+        # Resolve the hits in order, since a projectile is used up by the first
+        # cannon it hits and a cannon can't be hit once it is dead
+        for i, j in zip(*hits):
+            artificial_cannon = self.artificial_cannons[i]
+            projectile = self.user_projectiles[j]
+
+            if not artificial_cannon.is_alive or not projectile.is_alive:
+                continue
                 
-                if artificial_cannon.check_collision(projectile):
-                    # If a projectile hits an enemy cannon, don't count it
-                    self.score_t.projectiles_used -= 1
-                    artificial_cannon.deal()
-                    
-                    if not artificial_cannon.is_alive:
-                        # ac counts as 5 targets
-                        self.score_t.targets_destroyed += 5
-                        self.artificial_cannons.remove(artificial_cannon)    
-                    
-                    self.user_cannon.projectile_master.projectile_list.remove(projectile)
+            # If a projectile hits an enemy cannon, don't count it
+            self.score_t.projectiles_used -= 1
+            artificial_cannon.deal()
+            
+            if not artificial_cannon.is_alive:
+                # ac counts as 5 targets
+                self.score_t.targets_destroyed += 5
+                artificial_cannon.end_striking()
+            
+            projectile.kill()
 
+        self.artificial_cannons = [
+            artificial_cannon 
+            for artificial_cannon in self.artificial_cannons 
+            if artificial_cannon.is_alive
+        ]
 
     def handle_drawing(self) -> None:
         """Handles drawing all the objects"""
+        # Show the last frame the render thread drew, and take the snapshot it
+        # draws next
+        if self.pipeline:
+            self.pipeline.present(self.screen)
+            self.world_snapshot = WorldSnapshot.capture(self)
+            return
+
+        # Only redraw what changed since the last frame, unless too much is
+        # changing
+        if self.renderer:
+            if not self.renderer.skip():
+                self.dirty = self.renderer.render(self.screen, self.drawing_items())
+                return
+            self.dirty = None
+
         # Fills the background color
         self.screen.fill(Color.BLACK)
         self.draw_projectiles()
         self.draw_targets()
+        self.draw_preview()
         self.draw_cannons()
         self.draw_bombs()
         self.draw_score()
+        self.draw_profiler()
+
+    def drawing_items(self) -> list:
+        """
+        Describes everything drawn in a frame, for the DirtyRectRenderer
+
+        Returns
+        -------
+        items : list
+            A (key, rect, draw, args) tuple for every object, in the same order
+            handle_drawing draws them
+        """
+        items = []
+
+        def add_shapes(drawables: list) -> None:
+            for drawable in drawables:
+                args = (
+                    drawable.x, drawable.y, 
+                    drawable.color, drawable.size, drawable.shape
+                )
+                items.append(
+                    (id(drawable), Artist.sprite_rect(*args), Artist.draw, args)
+                )
+
+        add_shapes(self.user_cannon.projectile_master.projectile_list)
+        for artificial_cannon in self.artificial_cannons:
+            add_shapes(artificial_cannon.projectile_master.projectile_list)
+
+        add_shapes(self.target_master.target_list)
+
+        preview = self.preview_path()
+        if preview is not None:
+            points, rect = preview
+            items.append((
+                self.preview, 
+                rect, 
+                Artist.draw_trajectory, 
+                (points, self.user_cannon.color)
+            ))
+
+        for cannon in [self.user_cannon, *self.artificial_cannons]:
+            args = (cannon.x, cannon.y, cannon.angle, cannon.pow, cannon.color)
+            items.append((
+                id(cannon), 
+                Artist.cannon_rect(*args[:4]), 
+                Artist.draw_cannon, 
+                args
+            ))
+
+        add_shapes(self.bomb_master.bomb_list)
+
+        args = self.score_t.score_args(
+            self.user_cannon.chosen_type, 
+            self.user_cannon.health
+        )
+        items.append((
+            self.score_t, 
+            Artist.score_rect(self.screen_size, *args), 
+            Artist.draw_score, 
+            args
+        ))
+
+        if self.profiler is not None and self.profiler.overlay:
+            overlay, position = self.profiler_overlay()
+            items.append((
+                self.profiler, 
+                overlay.get_rect(topleft=position), 
+                pygame.Surface.blit, 
+                (overlay, position)
+            ))
+
+        return items
 
     def draw_projectiles(self) -> None:
         """Draws every projectile"""
@@ -389,6 +952,31 @@ class Manager:
         """Draws every target""" 
         self.target_master.draw_all(self.screen)
 
+    def preview_path(self) -> tuple:
+        """
+        Returns the predicted path of the user's shot, while it is charged
+
+        Returns
+        -------
+        path : tuple
+            The (points, rect) of the path, refer to `TrajectoryPreview.path`,
+            or None if there is nothing to draw
+        """
+        user = self.user_cannon
+        if self.preview is None or not user.active:
+            return None
+
+        points, rect = self.preview.path(
+            user.x, user.y, user.angle, user.pow, self.time_step
+        )
+        return (points, rect) if points else None
+
+    def draw_preview(self) -> None:
+        """Draws the predicted path of the user's shot, while it is charged"""
+        preview = self.preview_path()
+        if preview is not None:
+            Artist.draw_trajectory(self.screen, preview[0], self.user_cannon.color)
+
     def draw_cannons(self) -> None:
         """Draws every cannon"""
         self.user_cannon.draw(self.screen)
@@ -397,8 +985,7 @@ class Manager:
 
     def draw_bombs(self) -> None:
         """Draws every bomb"""
-        for target in self.target_master.target_list:
-            target.bomb_master.draw_all(self.screen)
+        self.bomb_master.draw_all(self.screen)
 
     def draw_score(self) -> None:
         """Draws the score table"""
@@ -408,9 +995,22 @@ class Manager:
                         self.user_cannon.health
                     )
 
+    def profiler_overlay(self) -> tuple:
+        """
+        Returns the profiler's overlay and the position of its top left
+        corner, along the bottom left of the screen
+        """
+        overlay = self.profiler.overlay_surface(self.ticks)
+        return overlay, (10, self.screen_size[1] - overlay.get_height() - 10)
+
+    def draw_profiler(self) -> None:
+        """Draws the profiler overlay, if the profiler has one"""
+        if self.profiler is not None and self.profiler.overlay:
+            self.screen.blit(*self.profiler_overlay())
+
     def handle_events(self) -> None:
         """Handles Pygame events"""
-        for event in pygame.event.get():
+        for event in self.read_events():
 
             # If the user quits
             if event.type == pygame.QUIT:
@@ -440,18 +1040,33 @@ class Manager:
                 self.screen_size,
                 self.target_master.calculate_target_size(self.score_t.score),
             )
+
+        # The new targets may be destroyed ones reused this tick, which 
+        # shouldn't be drawn sliding over from where the old ones were
+        if self.interpolator is not None:
+            self.interpolator.forget(self.target_master.target_list)
     
-    def start_bomb_thread(self) -> None:
-        """Starts the bomb_spawning_thread"""
-        if not self.bomb_spawning_thread:
-            self.bomb_spawning_thread = threading.Thread(
-                target=self.spawn_bombs, daemon=True
-                )
-            self.bomb_spawning_thread.start()
+    def start_bomb_spawning(self, delay: float = 0.5) -> None:
+        """
+        Schedules the first round of bomb spawning
+
+        Parameters
+        ----------
+        delay : float
+            The delay to wait before the first round (default 0.5)
+        """
+        if not self.bomb_spawning_event:
+            self.bomb_spawning_event = self.scheduler.schedule(
+                self.seconds_to_ticks(delay), self.spawn_bombs
+            )
     
-    def spawn_bombs(self, delay = 0.5, stagger = 0.1, chance = 0.8):
+    def spawn_bombs(self, delay = 0.5, stagger = 0.1, chance = None):
         """
         Spawn bombs depending on the delay, stagger, and chance
+
+        Schedules a bomb drop for every target (in a random order, staggered 
+        so they don't all come out at the same time), then the next round 
+        once they are all done
         
         Parameters
         ----------
@@ -463,41 +1078,138 @@ class Manager:
             same time (default 0.1)
         chance : float
             The decimal chance of a target dropping a bomb on a given tick
+            (default None, the bomb_chance)
         """
-        # While the bomb_spawning_thread is active
-        while self.bomb_spawning_thread:
-
-            # Wait for the delay
-            time.sleep(delay)
-
-            # If it is still active
-            if self.bomb_spawning_thread:
-                # Randomize which target we're dropping bombs from
-                random.shuffle(self.target_master.target_list)
-                                
-                for target in self.target_master.target_list:
-                    # Stagger bomb drops so they don't all come out at the 
-                    # same time
-                    time.sleep(stagger)
-                    
-                    # Create a bomb with the given chance
-                    target.bomb_master.create_bomb(
-                        target.x, target.y + target.size, 1, chance
-                    )
+        if chance is None:
+            chance = self.bomb_chance
+
+        # Randomize which target we're dropping bombs from, without touching 
+        # the target list itself
+        targets = random.sample(
+            self.target_master.target_list, 
+            len(self.target_master.target_list)
+        )
+        stagger_ticks = self.seconds_to_ticks(stagger)
+
+        for i, target in enumerate(targets):
+            self.scheduler.schedule(
+                (i + 1) * stagger_ticks, 
+                self.drop_bomb, target, chance, target.target_id
+            )
 
-    def end_bomb_thread(self):
-        """Ends the bomb_spawning_thread by resetting it to None"""
-        self.bomb_spawning_thread = None
+        self.bomb_spawning_event = self.scheduler.schedule(
+            len(targets) * stagger_ticks + self.seconds_to_ticks(delay), 
+            self.spawn_bombs
+        )
 
-    def game_loop(self):
-        """Keep playing until the user ends the game"""
+    def drop_bomb(self, target, chance: float, target_id: int = None) -> None:
+        """
+        Creates a bomb under a target with the given chance, if the target
+        hasn't been destroyed since the drop was scheduled
+
+        Parameters
+        ----------
+        target : Target
+            The target dropping the bomb
+        chance : float
+            The decimal chance of the target dropping a bomb
+        target_id : int
+            The target_id the target had when the drop was scheduled, if 
+            provided. A destroyed target may have been reused from the pool as
+            a new target since, which shouldn't drop the old one's bomb
+            (default None)
+        """
+        if target_id is not None and target.target_id != target_id:
+            return
+
+        if target.is_alive:
+            self.bomb_master.create_bomb(
+                target.x, target.y + target.size, 1, chance, target.target_id
+            )
+
+    def end_bomb_spawning(self):
+        """Ends bomb spawning by cancelling the next round"""
+        if self.bomb_spawning_event:
+            self.bomb_spawning_event.cancel()
+            self.bomb_spawning_event = None
+
+    def game_loop(self, max_ticks: int = None, quit: bool = True) -> dict:
+        """
+        Keep playing until the user ends the game
+
+        A headless game isn't paced by the clock and has no game over screen
+
+        Parameters
+        ----------
+        max_ticks : int
+            The number of ticks to stop after, if provided (default None)
+        quit : bool
+            Whether or not to call pygame.quit() once the game over screen is
+            closed (default True)
+
+        Returns
+        -------
+        stats : dict
+            The final stats of the game, refer to `Manager.final_stats`
+        """
         while not self.done:
-            self.clock.tick(self.refresh_rate)
+            if self.headless:
+                self.process_states()
+            elif self.frame_rate is None:
+                self.clock.tick(self.tick_rate)
+                self.process_states()
+            else:
+                self.process_frame(self.clock.tick(self.frame_rate) / 1000)
 
-            self.process_states()
             self.check_game_over()
+
+            if max_ticks is not None and self.ticks >= max_ticks:
+                break
+
+        if self.pipeline:
+            self.pipeline.stop()
         
-        self.game_over_loop()
+        if not self.headless:
+            self.game_over_loop(quit)
+
+        return self.final_stats()
+
+    def process_frame(self, seconds: float) -> None:
+        """
+        Runs the ticks due after a frame's time on the fixed timestep, then
+        draws the frame interpolated between the last two ticks
+
+        Parameters
+        ----------
+        seconds : float
+            The time the last frame took
+        """
+        for _ in range(self.timestep.advance(seconds)):
+            self.interpolator.capture(self.drawables())
+            self.process_states(draw = False)
+
+            self.check_game_over()
+            if self.done:
+                break
+
+        with self.interpolator.blend(self.drawables(), self.timestep.alpha):
+            self.handle_drawing()
+        self.show_frame()
+
+    def drawables(self) -> list:
+        """Returns every entity drawn to the screen"""
+        cannons = [self.user_cannon, *self.artificial_cannons]
+
+        return [
+            *cannons,
+            *self.target_master.target_list,
+            *self.bomb_master.bomb_list,
+            *(
+                projectile
+                for cannon in cannons
+                for projectile in cannon.projectile_master.projectile_list
+            ),
+        ]
 
     def check_game_over(self) -> None:
         """Check if the game should be over and set self.done respectively"""
@@ -515,29 +1227,89 @@ class Manager:
         """
         return all([not ac.is_alive for ac in self.artificial_cannons])
 
-    def game_over_loop(self) -> None:
-        """Continuously the game over screen"""
+    def pool_stats(self) -> dict:
+        """
+        Collects the statistics of every object pool
 
-        show_game_over = True
-        while show_game_over:
-            
-            # If the user died, display You Died
-            if not self.user_cannon.is_alive:
-                self.score_t.draw_game_over_screen(self.screen, "You Died!")
-            # If the user won, display You Won
-            elif self.check_ac_death():
-                self.score_t.draw_game_over_screen(self.screen, "You Won!")
-            else:
-                show_game_over = False
+        Returns
+        -------
+        stats : dict
+            A dictionary of "projectiles", "targets", and "bombs": the pool's
+            stats, refer to `ObjectPool.stats`
+        """
+        return {
+            "projectiles": self.projectile_pool.stats(),
+            "targets": self.target_master.pool.stats(),
+            "bombs": self.bomb_master.pool.stats(),
+        }
+
+    def final_stats(self) -> dict:
+        """
+        Collects the stats of the game so far
 
-            # Check for key press to exit
-            for event in pygame.event.get():
-                if event.type == pygame.KEYDOWN:
-                    show_game_over = False
+        Returns
+        -------
+        stats : dict
+            The score, targets destroyed, projectiles used, ticks played, user 
+            health, and whether the user won or died (both False if the game
+            was left unfinished)
+        """
+        return {
+            "score": self.score_t.score,
+            "targets_destroyed": self.score_t.targets_destroyed,
+            "projectiles_used": self.score_t.projectiles_used,
+            "ticks": self.ticks,
+            "health": self.user_cannon.health,
+            "won": self.user_cannon.is_alive and self.check_ac_death(),
+            "died": not self.user_cannon.is_alive,
+        }
 
+    def game_over_loop(self, quit: bool = True) -> dict:
+        """
+        Shows the game over screen until a key is pressed
+
+        The screen is drawn and flipped once, then the loop sleeps in
+        pygame.event.wait() until something happens, only redrawing if the
+        window asks for it
+
+        Parameters
+        ----------
+        quit : bool
+            Whether or not to call pygame.quit() once the screen is closed 
+            (default True)
+
+        Returns
+        -------
+        stats : dict
+            The final stats of the game, refer to `Manager.final_stats`
+        """
+        stats = self.final_stats()
+
+        # If the user died, display You Died, if the user won, display You Won
+        if stats["died"]:
+            game_over_text = "You Died!"
+        elif stats["won"]:
+            game_over_text = "You Won!"
+        else:
+            game_over_text = None
+
+        if game_over_text is not None:
+            game_over_screen = self.score_t.draw_game_over_screen(
+                self.screen, game_over_text
+            )
             self.update_display()
-        
-        
-        pygame.quit()
 
+            # Wait for a key press to exit
+            while True:
+                event = pygame.event.wait()
+
+                if event.type in (pygame.KEYDOWN, pygame.QUIT):
+                    break
+                if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    self.screen.blit(game_over_screen, (0, 0))
+                    self.update_display()
+
+        if quit:
+            pygame.quit()
 
+        return stats
@@ -0,0 +1,305 @@
+from artist import Artist
+from color import Color
+
+import threading
+from contextlib import contextmanager
+from typing import NamedTuple
+
+import pygame
+
+class Sprite(NamedTuple):
+    """A shaped object (projectile, target, or bomb) as it is drawn in a frame"""
+    x: float
+    y: float
+    color: tuple
+    size: int
+    shape: str
+
+class CannonSprite(NamedTuple):
+    """A cannon as it is drawn in a frame"""
+    x: float
+    y: float
+    angle: float
+    pow: float
+    color: tuple
+
+class WorldSnapshot(NamedTuple):
+    """
+    Everything drawn in a frame, copied out of the game so it can be drawn on
+    another thread while the game carries on
+
+    Attributes
+    ----------
+    tick : int
+        The tick the snapshot was taken on
+    sprites : tuple[Sprite]
+        The projectiles and targets, drawn first
+    preview : tuple
+        The points and color of the user's predicted shot, or None
+    cannons : tuple[CannonSprite]
+        The user cannon and every artificial cannon
+    bombs : tuple[Sprite]
+        The bombs, drawn over the cannons
+    score : tuple
+        The arguments to draw the score table with, refer to
+        `ScoreTable.score_args`
+    overlay : tuple
+        The profiler overlay and its position, or None
+    """
+    tick: int
+    sprites: tuple
+    preview: tuple
+    cannons: tuple
+    bombs: tuple
+    score: tuple
+    overlay: tuple
+
+    @staticmethod
+    def capture(manager) -> "WorldSnapshot":
+        """
+        Takes a snapshot of everything a Manager draws
+
+        Parameters
+        ----------
+        manager : Manager
+            The manager to take the snapshot of
+
+        Returns
+        -------
+        snapshot : WorldSnapshot
+            The snapshot
+        """
+        cannons = [manager.user_cannon, *manager.artificial_cannons]
+
+        def sprites(drawables) -> tuple:
+            return tuple(
+                Sprite(drawable.x, drawable.y, drawable.color, drawable.size, drawable.shape)
+                for drawable in drawables
+            )
+
+        preview = manager.preview_path()
+        if preview is not None:
+            preview = (preview[0], manager.user_cannon.color)
+
+        overlay = None
+        if manager.profiler is not None and manager.profiler.overlay:
+            overlay = manager.profiler_overlay()
+
+        return WorldSnapshot(
+            tick = manager.ticks,
+            sprites = sprites([
+                *(
+                    projectile
+                    for cannon in cannons
+                    for projectile in cannon.projectile_master.projectile_list
+                ),
+                *manager.target_master.target_list,
+            ]),
+            preview = preview,
+            cannons = tuple(
+                CannonSprite(cannon.x, cannon.y, cannon.angle, cannon.pow, cannon.color)
+                for cannon in cannons
+            ),
+            bombs = sprites(manager.bomb_master.bomb_list),
+            score = manager.score_t.score_args(
+                manager.user_cannon.chosen_type,
+                manager.user_cannon.health
+            ),
+            overlay = overlay,
+        )
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """
+        Draws the snapshot, the same way Manager.handle_drawing draws the game
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface to draw onto (it is cleared first)
+        """
+        surface.fill(Color.BLACK)
+        Artist.draw_many(surface, self.sprites)
+        if self.preview is not None:
+            Artist.draw_trajectory(surface, *self.preview)
+        for cannon in self.cannons:
+            Artist.draw_cannon(surface, *cannon)
+        Artist.draw_many(surface, self.bombs)
+        Artist.draw_score(surface, *self.score)
+
+        if self.overlay is not None:
+            surface.blit(*self.overlay)
+
+class DoubleBuffer:
+    """
+    A pair of buffers passed between a producer and a consumer thread
+
+    The producer fills the back buffer on its own, then swaps it to the front.
+    The consumer reads the latest front buffer, holding it so the producer
+    can't swap it back while it is being read. Frames the consumer is too slow
+    to read are skipped, so neither side ever waits on the other for longer
+    than a swap.
+
+    Attributes
+    ----------
+    front : object
+        The latest complete buffer
+    back : object
+        The buffer the producer is filling
+    fresh : bool
+        Whether the front buffer was swapped in since it was last read
+    closed : bool
+        Whether the producer has stopped
+    """
+
+    def __init__(self, front = None, back = None) -> None:
+        """Initializes the buffers, neither of them holding a frame yet"""
+        self.front = front
+        self.back = back
+        self.fresh = False
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def swap(self):
+        """
+        Makes the back buffer the front buffer, once it isn't being read
+
+        Returns
+        -------
+        back
+            The new back buffer, to fill next
+        """
+        with self.condition:
+            self.front, self.back = self.back, self.front
+            self.fresh = True
+            self.condition.notify_all()
+        return self.back
+
+    def put(self, value) -> None:
+        """Swaps a new (immutable) value to the front"""
+        self.back = value
+        self.swap()
+
+    @contextmanager
+    def read(self, timeout: float = None):
+        """
+        Holds the front buffer while it is read, if it is fresh
+
+        Parameters
+        ----------
+        timeout : float
+            The most time to wait for a fresh buffer, if provided (default
+            None, don't wait)
+
+        Yields
+        ------
+        front
+            The front buffer, or None if no fresh buffer came in time
+        """
+        with self.condition:
+            if timeout is not None:
+                self.condition.wait_for(
+                    lambda: self.fresh or self.closed, timeout
+                )
+
+            if not self.fresh:
+                yield None
+                return
+
+            self.fresh = False
+            yield self.front
+
+    def close(self) -> None:
+        """Wakes up a consumer waiting for a buffer that won't come"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+class RenderThread(threading.Thread):
+    """
+    Draws the game's frames on a thread of its own
+
+    The game thread puts a WorldSnapshot into the snapshots buffer every tick
+    and goes on with the next one. This thread draws the latest snapshot onto
+    the back of a pair of surfaces and swaps it to the front, where the game
+    thread picks it up and copies it to the screen. Pygame releases the GIL
+    while blitting, so drawing a frame overlaps with simulating the next tick
+
+    Attributes
+    ----------
+    snapshots : DoubleBuffer
+        The latest WorldSnapshot from the game thread
+    frames : DoubleBuffer
+        The pair of surfaces the frames are drawn onto
+    frames_drawn : int
+        The number of frames drawn so far
+    error : BaseException
+        The exception that stopped the thread, if any
+    """
+
+    def __init__(self, size: tuple) -> None:
+        """
+        Initializes the buffers, without starting the thread
+
+        Parameters
+        ----------
+        size : tuple
+            The size of the screen
+        """
+        super().__init__(name = "RenderThread", daemon = True)
+        self.snapshots = DoubleBuffer()
+        self.frames = DoubleBuffer(pygame.Surface(size), pygame.Surface(size))
+        self.frames_drawn = 0
+        self.error = None
+
+    def run(self) -> None:
+        """Draws every snapshot that comes in, until stopped"""
+        try:
+            while not self.snapshots.closed:
+                with self.snapshots.read(timeout = 0.1) as snapshot:
+                    pass
+                if snapshot is None:
+                    continue
+
+                snapshot.draw(self.frames.back)
+                self.frames.swap()
+                self.frames_drawn += 1
+
+        except BaseException as error:
+            self.error = error
+
+    def submit(self, snapshot: WorldSnapshot) -> None:
+        """Hands the latest snapshot to the thread, replacing an undrawn one"""
+        self.check()
+        self.snapshots.put(snapshot)
+
+    def present(self, screen: pygame.Surface) -> bool:
+        """
+        Copies the latest drawn frame to the screen, if there is a new one
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            The screen
+
+        Returns
+        -------
+        presented : bool
+            Whether or not a new frame was copied
+        """
+        self.check()
+        with self.frames.read() as frame:
+            if frame is None:
+                return False
+            screen.blit(frame, (0, 0))
+        return True
+
+    def check(self) -> None:
+        """Raises the exception that stopped the thread, if any"""
+        if self.error is not None:
+            raise RuntimeError("The render thread stopped") from self.error
+
+    def stop(self) -> None:
+        """Stops the thread, once it has finished the frame it is drawing"""
+        self.snapshots.close()
+        if self.is_alive():
+            self.join()
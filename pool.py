@@ -0,0 +1,111 @@
+from collections import defaultdict
+
+class ObjectPool:
+    """
+    Free lists of dead objects waiting to be reused
+
+    Masters release the objects they remove into a pool, and take new objects
+    from it. A released object of the requested class is brought back to life
+    with its reset method instead of building a new one, so a busy game doesn't
+    keep allocating (and garbage collecting) projectiles, bombs, and targets.
+
+    Every pooled class implements reset, taking the same parameters as its
+    __init__ and leaving the object exactly as __init__ would.
+
+    Attributes
+    ----------
+    max_size : int
+        The most free objects kept for each class, the rest are left to the
+        garbage collector (default 1024)
+    free : dict
+        A dictionary of class: list of released objects of that class
+    created : int
+        The number of objects built from scratch
+    reused : int
+        The number of objects taken from a free list
+    released : int
+        The number of objects released into the pool
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        """Initializes the empty free lists"""
+        self.max_size = max_size
+        self.free: dict = defaultdict(list)
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+
+    def __len__(self) -> int:
+        """Returns the number of free objects waiting in the pool"""
+        return sum(len(free) for free in self.free.values())
+
+    def acquire(self, cls: type, **params):
+        """
+        Returns an object of a class, reused from the pool if one is free
+
+        Parameters
+        ----------
+        cls : type
+            The class of the object
+        **params
+            The parameters to create (or reset) the object with
+
+        Returns
+        -------
+        obj
+            The new (or reset) object
+        """
+        free = self.free.get(cls)
+        if free:
+            obj = free.pop()
+            obj.reset(**params)
+            self.reused += 1
+            return obj
+
+        self.created += 1
+        return cls(**params)
+
+    def release(self, obj) -> None:
+        """
+        Releases an object into the pool, so it can be reused
+
+        The object must no longer be used by anything else
+
+        Parameters
+        ----------
+        obj
+            The object to release
+        """
+        free = self.free[type(obj)]
+        if len(free) < self.max_size:
+            free.append(obj)
+            self.released += 1
+
+    @property
+    def reuse_rate(self) -> float:
+        """The fraction of acquired objects that were reused"""
+        acquired = self.created + self.reused
+        return self.reused / acquired if acquired else 0.0
+
+    def stats(self) -> dict:
+        """
+        Returns the pool's statistics
+
+        Returns
+        -------
+        stats : dict
+            The number of free objects ("size"), "created", "reused",
+            "released", and the "reuse_rate"
+        """
+        return {
+            "size": len(self),
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "reuse_rate": self.reuse_rate,
+        }
+
+    def clear(self) -> None:
+        """Drops every free object and resets the statistics"""
+        self.free.clear()
+        self.created = self.reused = self.released = 0
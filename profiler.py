@@ -0,0 +1,230 @@
+from color import Color
+
+from collections import deque
+import csv
+import json
+import time
+
+import numpy as np
+import pygame
+
+class TickProfiler:
+    """
+    Records how long each phase of a tick takes
+
+    The Manager hands a profiler the (name, handler) pairs of every phase of a
+    tick. The profiler times each handler, and notes how many entities were
+    alive when it started. The last `window` timings of every phase are kept
+    for rolling percentiles, and up to `history` records are kept for export.
+    A Manager without a profiler runs its phases directly, so profiling costs
+    nothing when it is turned off.
+
+    Attributes
+    ----------
+    window : int
+        The number of ticks the rolling statistics cover (default 300)
+    times : dict
+        A dictionary of phase name: deque of its last `window` timings in
+        seconds. The "total" phase is the sum of every phase in a tick
+    records : deque
+        The last `history` records, each a tuple of (tick, phase, seconds,
+        *entity counts)
+    overlay : bool
+        Whether or not the Manager should draw the statistics on screen
+        (default False)
+    overlay_interval : int
+        The number of ticks between refreshes of the overlay (default 15)
+    font_name : str
+        The name of the overlay font (default dejavusansmono)
+    font_size : int
+        The size of the overlay font (default 14)
+    """
+
+    # The entity counts stored with each record, see Manager.entity_counts
+    COUNT_FIELDS = ("targets", "projectiles", "bombs", "cannons")
+
+    # The percentiles kept for each phase
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(
+            self,
+            window: int = 300,
+            history: int = 100_000,
+            overlay: bool = False,
+            overlay_interval: int = 15,
+            font_name: str = "dejavusansmono",
+            font_size: int = 14) -> None:
+        """Initializes an empty profiler"""
+        self.window = window
+        self.times: dict = {}
+        self.records = deque(maxlen=history)
+
+        self.overlay = overlay
+        self.overlay_interval = overlay_interval
+        self.font_name = font_name
+        self.font_size = font_size
+        self._font = None
+        self._overlay_surface = None
+        self._overlay_tick = None
+
+    def add(self, tick: int, phase: str, seconds: float, counts: tuple) -> None:
+        """
+        Adds the timing of a single phase
+
+        Parameters
+        ----------
+        tick : int
+            The tick the phase ran on
+        phase : str
+            The name of the phase
+        seconds : float
+            How long the phase took
+        counts : tuple
+            The entity counts when the phase started, in COUNT_FIELDS order
+        """
+        if phase not in self.times:
+            self.times[phase] = deque(maxlen=self.window)
+
+        self.times[phase].append(seconds)
+        self.records.append((tick, phase, seconds, *counts))
+
+    def run_tick(self, tick: int, phases: list, entity_counts) -> None:
+        """
+        Runs and times every phase of a tick
+
+        Parameters
+        ----------
+        tick : int
+            The tick being run
+        phases : list
+            The (name, handler) of every phase, in order
+        entity_counts : Callable
+            Returns the current entity counts, in COUNT_FIELDS order
+        """
+        total = 0
+
+        for name, phase in phases:
+            counts = entity_counts()
+
+            start = time.perf_counter()
+            phase()
+            seconds = time.perf_counter() - start
+
+            total += seconds
+            self.add(tick, name, seconds, counts)
+
+        self.add(tick, "total", total, entity_counts())
+
+    def percentiles(self, phase: str) -> tuple:
+        """
+        Returns the rolling p50, p95 and p99 of a phase, in seconds
+
+        Parameters
+        ----------
+        phase : str
+            The name of the phase
+        """
+        return tuple(np.percentile(self.times[phase], self.PERCENTILES))
+
+    def summary(self) -> dict:
+        """
+        Summarizes the rolling statistics of every phase
+
+        Returns
+        -------
+        summary : dict
+            A dictionary of phase name: {"count", "mean", "p50", "p95", "p99"},
+            with every time in milliseconds
+        """
+        summary = {}
+
+        for phase, times in self.times.items():
+            stats = {"count": len(times), "mean": 1000 * float(np.mean(times))}
+            for percentile, seconds in zip(
+                    self.PERCENTILES, self.percentiles(phase)):
+                stats[f"p{percentile}"] = 1000 * float(seconds)
+
+            summary[phase] = stats
+
+        return summary
+
+    def export_csv(self, path: str) -> None:
+        """
+        Writes every record to a CSV file, one row per phase per tick
+
+        Parameters
+        ----------
+        path : str
+            The path of the file to write
+        """
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(("tick", "phase", "seconds", *self.COUNT_FIELDS))
+            writer.writerows(self.records)
+
+    def export_json(self, path: str) -> None:
+        """
+        Writes the summary and every record to a JSON file
+
+        Parameters
+        ----------
+        path : str
+            The path of the file to write
+        """
+        fields = ("tick", "phase", "seconds", *self.COUNT_FIELDS)
+
+        with open(path, "w") as file:
+            json.dump(
+                {
+                    "window": self.window,
+                    "summary": self.summary(),
+                    "records": [dict(zip(fields, record)) for record in self.records],
+                },
+                file,
+                indent=1
+            )
+
+    @property
+    def font(self) -> pygame.font.Font:
+        """The overlay font, loaded the first time it is needed"""
+        if self._font is None:
+            self._font = pygame.font.SysFont(self.font_name, self.font_size)
+        return self._font
+
+    def overlay_surface(self, tick: int) -> pygame.Surface:
+        """
+        Returns the overlay showing the rolling statistics of every phase
+
+        The overlay is only composed again every overlay_interval ticks, so
+        drawing it doesn't cost a render of every line each frame
+
+        Parameters
+        ----------
+        tick : int
+            The current tick
+        """
+        if (self._overlay_surface is not None
+                and tick - self._overlay_tick < self.overlay_interval):
+            return self._overlay_surface
+
+        lines = [f"{'phase':<12}{'p50':>7}{'p95':>7}{'p99':>7} ms"]
+        for phase, stats in self.summary().items():
+            lines.append(
+                f"{phase:<12}{stats['p50']:7.2f}{stats['p95']:7.2f}"
+                f"{stats['p99']:7.2f}"
+            )
+
+        rendered = [self.font.render(line, True, Color.WHITE) for line in lines]
+        line_height = self.font.get_linesize()
+
+        surface = pygame.Surface((
+            max(text.get_width() for text in rendered),
+            line_height * len(rendered)
+        ))
+        surface.fill(Color.BLACK)
+        for i, text in enumerate(rendered):
+            surface.blit(text, (0, i * line_height))
+
+        self._overlay_surface = surface
+        self._overlay_tick = tick
+        return surface
@@ -1,11 +1,26 @@
 from abstract import Drawable, Killable, Moveable
 from color import Color
 from artist import Artist
+from storage import ArrayStore, StoreView, SHAPE_CODES
+from pool import ObjectPool
 
 import random
+import numpy as np
 from math import cos, sin
 from pygame import Surface
 
+# The fields an array-backed ProjectileMaster keeps for each projectile
+PROJECTILE_FIELDS: dict = {
+    'x': (np.float64, 1),
+    'y': (np.float64, 1),
+    'v_x': (np.float64, 1),
+    'v_y': (np.float64, 1),
+    'size': (np.int64, 1),
+    'health': (np.int64, 1),
+    'shape': (np.int8, 1),
+    'color': (np.uint8, 3),
+}
+
 class ProjectileMaster:
     """
     Implements methods for cannon-wide projectile checking
@@ -13,17 +28,40 @@ class ProjectileMaster:
     Introduces methods for creating random projectiles and maintaining existing 
     projectiles (drawing them and moving them)
     
+    An array-backed ProjectileMaster keeps every projectile's attributes in an
+    ArrayStore and moves them all in one batched step per tick. The projectile
+    list then holds ProjectileViews, which read and write the arrays, so the
+    projectiles can still be drawn and collided one at a time.
+
     Attributes
     ----------
     projectile_list : list[Target]
         A list of all the projectiles created by this ProjectileMaster
     projectile_types : list
         A list of the possible types of projectiles
+    array_backed : bool
+        Whether or not the projectiles are stored in NumPy arrays
+    store : ArrayStore
+        The arrays holding the projectiles (None if not array_backed)
+    pool : ObjectPool
+        The pool dead projectiles are released into and new ones are taken 
+        from (its own pool, unless one is passed in to share)
+    GRAVITY : int
+        The gravity the projectiles fall with, per standard tick (2)
     """
 
-    def __init__(self) -> None:
-        """Initializes the empty projectile list"""
+    GRAVITY = 2
+
+    def __init__(
+            self, 
+            array_backed: bool = False, 
+            pool: ObjectPool = None) -> None:
+        """Initializes the empty projectile list (and store if array_backed)"""
         self.projectile_list: list[Projectile] = []
+        self.pool = pool if pool is not None else ObjectPool()
+
+        self.array_backed = array_backed
+        self.store = ArrayStore(PROJECTILE_FIELDS) if array_backed else None
 
         # The possible projectile types and their chosen_type denotion
         self.projectile_types = {
@@ -72,51 +110,151 @@ class ProjectileMaster:
         }
         
         # A projectile of the chosen type, or a random projectile
-        if chosen_type:
-            chosen_type = self.projectile_types[chosen_type]
-        else:
-            chosen_type = random.choice(list(self.projectile_types.values()))
-
-
-        # Create and store the projectile
-        created_projectile = chosen_type(**params)
+        shape = chosen_type or random.choice(list(self.projectile_types))
+        chosen_type = self.projectile_types[shape]
+
+        # Store the projectile's attributes in the arrays and keep a view of it
+        if self.array_backed:
+            index = self.store.append(
+                **params,
+                health=1,
+                shape=SHAPE_CODES.index(shape),
+                color=Color.rand_color()
+            )
+            self.projectile_list.append(ProjectileView(self.store, index))
+            return
+
+        # Create (or reuse) and store the projectile
+        created_projectile = self.pool.acquire(chosen_type, **params)
         self.projectile_list.append(created_projectile)
 
     def draw_all(self, surface: Surface) -> None:
         """
         Simply loops through all the projectiles and draws them to the surface
         
-        Simply calls the projectiles.draw function on each target
+        Blits every projectile at once with Artist.draw_many
 
         Parameters
         ----------
         surface : pygame.Surface
             The surface to draw the projectiles to
         """
-        [projectile.draw(surface) for projectile in self.projectile_list]
+        Artist.draw_many(surface, self.projectile_list)
     
-    def move_all(self, screen_size: tuple) -> None:
+    def move_all(self, screen_size: tuple, time: float = 1) -> None:
         """
         Simply loops through all the projectiles and moves them based on their 
         velocity
         
-        Simply calls the projectile.move function on each projectile
+        Simply calls the projectile.move function on each projectile, or moves
+        every projectile at once if the master is array_backed
 
         Parameters
         ----------
         screen_size : tuple
             The size of the screen
+        time : float
+            The number of standard ticks to move for (default 1)
         """
+        if self.array_backed:
+            self.move_arrays(
+                self.store.column('x'), self.store.column('y'),
+                self.store.column('v_x'), self.store.column('v_y'),
+                self.store.column('size'), self.store.column('health'),
+                screen_size, time = time, grav = self.GRAVITY
+            )
+            return
+
         [
-            projectile.move(screen_size, grav = 2) 
+            projectile.move(screen_size, time = time, grav = self.GRAVITY) 
             for projectile in self.projectile_list
         ]
     
     def remove_dead(self) -> None:
         """Removes dead projectiles from the projectile list"""
-        for projectile in self.projectile_list:
-            if not projectile.is_alive:
-                self.projectile_list.remove(projectile)
+        if self.array_backed:
+            keep = self.store.column('health') > 0
+            if keep.all():
+                return
+
+            # Drop the dead rows and point the surviving views at their new rows
+            self.store.compact(keep)
+            self.projectile_list[:] = [
+                view for view, alive in zip(self.projectile_list, keep) if alive
+            ]
+            for index, view in enumerate(self.projectile_list):
+                view._index = index
+            return
+
+        Killable.remove_dead(self.projectile_list, self.pool)
+
+    @staticmethod
+    def move_arrays(
+            x: np.ndarray,
+            y: np.ndarray,
+            v_x: np.ndarray,
+            v_y: np.ndarray,
+            size: np.ndarray,
+            health: np.ndarray,
+            screen_size: tuple,
+            time: float = 1, grav: int = 0,
+            refl_ort: float = 0.6, refl_par: float = 0.7) -> None:
+        """
+        Moves a batch of projectiles in place, one array operation per rule
+
+        Mirrors Projectile.move followed by Projectile.check_corners: gravity,
+        movement, inelastic rebound off each edge (truncating velocities like 
+        int() does), then killing projectiles that are slow at the bottom
+
+        Parameters
+        ----------
+        x, y : np.ndarray
+            The coordinates of the projectiles
+        v_x, v_y : np.ndarray
+            The velocities of the projectiles
+        size : np.ndarray
+            The sizes of the projectiles
+        health : np.ndarray
+            The health of the projectiles
+        screen_size : tuple
+            The size of the screen
+        time : float
+            The number of standard ticks to move for (default 1)
+        grav : int
+            The force of gravity (default 0)
+        refl_ort : float
+            The coefficient of restitution orthogonal to the surface (default 0.6)
+        refl_par : float
+            The coefficient of restitution parallel to the surface (default 0.7)
+        """
+        # Add gravity and change position based on velocity
+        v_y += time * grav
+        x += time * v_x
+        y += time * v_y
+
+        # Left and right edges (a projectile can only hit one of them)
+        left = x < size
+        right = ~left & (x > screen_size[0] - size)
+        x[left] = size[left]
+        x[right] = screen_size[0] - size[right]
+
+        hit = left | right
+        v_x[hit] = -np.trunc(v_x[hit] * refl_ort)
+        v_y[hit] = np.trunc(v_y[hit] * refl_par)
+
+        # Top and bottom edges
+        top = y < size
+        bottom = ~top & (y > screen_size[1] - size)
+        y[top] = size[top]
+        y[bottom] = screen_size[1] - size[bottom]
+
+        hit = top | bottom
+        v_x[hit] = np.trunc(v_x[hit] * refl_par)
+        v_y[hit] = -np.trunc(v_y[hit] * refl_ort)
+
+        # Projectiles moving slowly at the bottom of the screen lose their health
+        slow = v_x**2 + v_y**2 < 2**2
+        health[slow & (y > screen_size[1] - 2 * size)] = 0
 
 class Projectile(Drawable, Killable, Moveable):
     """A class representing a projectile
@@ -152,6 +290,8 @@ class Projectile(Drawable, Killable, Moveable):
         square, triangle, or circle.
     """
 
+    __slots__ = ()
+
     def __init__(
             self, 
             x: int, 
@@ -180,10 +320,30 @@ class Projectile(Drawable, Killable, Moveable):
         # Shape initialization
         self.shape = shape
 
+    def reset(
+            self, 
+            x: int, 
+            y: int, 
+            v_x: int, 
+            v_y: int, 
+            color: int = None, 
+            size: int = 5, 
+            health: int = 1) -> None:
+        """
+        Resets a dead projectile taken from an ObjectPool, as if it had just 
+        been created. The shape is left as is, since it is fixed by the 
+        projectile's class
+        """
+        self.x, self.y = x, y
+        self.v_x, self.v_y = v_x, v_y
+        self.color = color or Color.rand_color()
+        self.size = size
+        self.health = health
+
     def move(
             self, 
             screen_size: tuple, 
-            time: int = 1, grav: int = 0) -> None:
+            time: float = 1, grav: int = 0) -> None:
         """
         Moves the projectile based on its velocity and the effect of gravity
 
@@ -191,13 +351,13 @@ class Projectile(Drawable, Killable, Moveable):
         ----------
         screen_size : tuple
             The size of the screen
-        time : int
-            The time step multiplier for the velocity (default 1)
+        time : float
+            The number of standard ticks to move for (default 1)
         gravity : int
             The force of gravity (default 0)
         """
         # Add gravity
-        self.v_y += grav
+        self.v_y += time * grav
 
         # Change position based on velocity
         self.x += time * self.v_x
@@ -284,8 +444,19 @@ class Projectile(Drawable, Killable, Moveable):
             self.v_x = int(self.v_x * refl_par)
             self.v_y = -int(self.v_y * refl_ort)
 
+class ProjectileView(StoreView, Projectile):
+    """
+    A Projectile whose attributes live in a row of an ArrayStore. The row a 
+    view points at is kept up to date by ProjectileMaster.remove_dead. Refer
+    to `StoreView` and `Projectile`
+    """
+
+    __slots__ = ('_store', '_index')
+
 class CircleProjectile(Projectile):
     """A Projectile of shape Circle. Refer to `Projectile`"""
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(
             *args,
@@ -294,6 +465,8 @@ class CircleProjectile(Projectile):
 
 class SquareProjectile(Projectile):
     """A Projectile of shape Square. Refer to `Projectile`"""
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(
             *args,
@@ -302,6 +475,8 @@ class SquareProjectile(Projectile):
         
 class TriangleProjectile(Projectile):
     """A Projectile of shape Triangle. Refer to `Projectile`"""
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(
             *args,
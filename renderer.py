@@ -0,0 +1,172 @@
+from color import Color
+
+import pygame
+
+class DirtyRectRenderer:
+    """
+    Redraws only the parts of the screen that changed since the last frame
+
+    Every frame is described as a list of draw items, each with a key (which
+    object it is), the area it covers, and the function and arguments that draw
+    it. An item whose arguments and area are the same as last frame is left
+    alone. For everything else, both the old and the new area are dirty. Each
+    dirty area is cleared, and every item touching it is redrawn in its 
+    original order (so overlaps come out the same), clipped to the area, so
+    the items aren't blended over themselves outside it. Only the dirty areas
+    need to be sent to pygame.display.update.
+
+    When much of the screen changes, working out what to redraw costs more
+    than redrawing it all, so frames with too many changes, or whose changes
+    cover too much of the screen, are redrawn in full. The next backoff frames
+    are then redrawn in full without being described at all (refer to `skip`),
+    as the scene is likely still busy.
+
+    Attributes
+    ----------
+    background : tuple
+        The (R, G, B) color the screen is cleared to (default Color.BLACK)
+    max_changes : int
+        The most items changed in a frame before it is redrawn in full 
+        (default 32)
+    max_area : float
+        The largest part of the screen the changes can cover before the frame
+        is redrawn in full (default 0.25)
+    backoff : int
+        The number of frames redrawn in full after a frame with too many 
+        changes (default 15)
+    skipping : int
+        The number of frames left to redraw in full
+    previous : dict
+        The (args, rect) drawn for each key on the last frame
+    full_redraw : bool
+        Whether the next frame should clear and redraw the whole screen
+    """
+
+    def __init__(
+            self, 
+            background: tuple = Color.BLACK,
+            max_changes: int = 32,
+            max_area: float = 0.25,
+            backoff: int = 15) -> None:
+        """Initializes the renderer, the first frame is a full redraw"""
+        self.background = background
+        self.max_changes = max_changes
+        self.max_area = max_area
+        self.backoff = backoff
+        self.skipping = 0
+        self.previous: dict = {}
+        self.full_redraw = True
+
+    def reset(self) -> None:
+        """Forces the next frame to be a full redraw"""
+        self.previous = {}
+        self.full_redraw = True
+
+    def skip(self) -> bool:
+        """
+        Checks whether this frame should be redrawn in full, without describing
+        it to the renderer. The frame after the last one skipped is a full 
+        redraw, as the renderer no longer knows what is on the screen
+
+        Returns
+        -------
+        skipped : bool
+            Whether the caller should redraw the frame in full itself
+        """
+        if not self.skipping:
+            return False
+
+        self.skipping -= 1
+        self.reset()
+        return True
+
+    def render(self, surface: pygame.Surface, items: list) -> list:
+        """
+        Draws a frame, touching only the areas that changed
+
+        Parameters
+        ----------
+        surface : pygame.Surface
+            The surface to draw onto (the same one every frame)
+        items : list
+            The frame's draw items, in drawing order. Each is a tuple of
+            (key, rect, draw, args), where draw(surface, *args) draws the item
+            over rect
+
+        Returns
+        -------
+        dirty : list[pygame.Rect]
+            The areas of the surface that changed
+        """
+        current = {key: (args, rect) for key, rect, _, args in items}
+        previous = self.previous
+        self.previous = current
+
+        if self.full_redraw:
+            self.full_redraw = False
+            return self.redraw(surface, items)
+
+        # The old and new areas of anything that moved or changed (as one 
+        # area, if they overlap), the old areas of anything that disappeared,
+        # and the new areas of anything that appeared
+        dirty = []
+        kept = changes = 0
+        for key, (args, rect) in current.items():
+            old = previous.get(key)
+            if old is None:
+                dirty.append(rect)
+                changes += 1
+                continue
+
+            kept += 1
+            if old != (args, rect):
+                changes += 1
+                old_rect = old[1]
+                if rect.colliderect(old_rect):
+                    dirty.append(rect.union(old_rect))
+                else:
+                    dirty.extend((old_rect, rect))
+
+        if kept < len(previous):
+            changes += len(previous) - kept
+            dirty.extend(
+                rect for key, (_, rect) in previous.items() if key not in current
+            )
+
+        if not dirty:
+            return dirty
+
+        screen = surface.get_rect()
+        dirty = [rect.clip(screen) for rect in dirty]
+        area = sum(rect.w * rect.h for rect in dirty)
+        if changes > self.max_changes or area > self.max_area * screen.w * screen.h:
+            self.skipping = self.backoff
+            return self.redraw(surface, items)
+
+        # Clear every dirty area and redraw what touches it, in one pass over
+        # the items for each area
+        rects = [rect for _, rect, _, _ in items]
+        for rect in dirty:
+            surface.set_clip(rect)
+            surface.fill(self.background, rect)
+            for i in rect.collidelistall(rects):
+                _, _, draw, args = items[i]
+                draw(surface, *args)
+        surface.set_clip(None)
+
+        return dirty
+
+    def redraw(self, surface: pygame.Surface, items: list) -> list:
+        """
+        Clears the surface and redraws every item
+
+        Returns
+        -------
+        dirty : list[pygame.Rect]
+            The whole surface
+        """
+        surface.fill(self.background)
+        for _, _, draw, args in items:
+            draw(surface, *args)
+
+        return [surface.get_rect()]
@@ -0,0 +1,262 @@
+import json
+import random
+
+import pygame
+
+class RecordedKeys:
+    """
+    Wraps the pressed key state read by the Manager, noting every key that is
+    looked up and found held down
+
+    Attributes
+    ----------
+    keys : Sequence[bool]
+        The wrapped key state
+    held : list
+        The keys found held down so far
+    """
+
+    def __init__(self, keys, held: list) -> None:
+        """Wraps the key state"""
+        self.keys = keys
+        self.held = held
+
+    def __getitem__(self, key: int) -> bool:
+        """Returns whether a key is held down, noting it if it is"""
+        pressed = bool(self.keys[key])
+        if pressed and key not in self.held:
+            self.held.append(key)
+        return pressed
+
+class InputRecorder:
+    """
+    Records every input a Manager reads, one tick at a time, to a file
+
+    A Manager given a recorder reseeds the random module at the start of every
+    tick with a seed drawn from the recorder, and reports the events, held keys
+    and mouse position it reads. Each tick is written as a line of JSON as soon
+    as it ends (after a header line describing the game), so a long session
+    never builds up in memory, and a crash loses at most flush_every ticks.
+
+    Attributes
+    ----------
+    VERSION : int
+        The version of the replay format
+    path : str
+        The path of the replay file
+    seed : int
+        The seed of the game, and of the generator of every tick's seed
+    flush_every : int
+        The number of ticks between flushes of the file (default 60)
+    tick : dict
+        The inputs of the tick being recorded, or None between ticks
+    """
+
+    VERSION = 3
+
+    def __init__(self, path: str, seed: int = None, flush_every: int = 60) -> None:
+        """Opens the replay file. A random seed is chosen if none is given"""
+        self.path = path
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+        self.flush_every = flush_every
+        self.tick = None
+
+        self.seeds = random.Random(self.seed)
+        self.file = open(path, "w")
+
+    def __enter__(self) -> "InputRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self, manager) -> None:
+        """
+        Writes the header describing the recorded game
+
+        Parameters
+        ----------
+        manager : Manager
+            The (freshly initialized) manager being recorded
+        """
+        self.write({
+            "version": self.VERSION,
+            "seed": self.seed,
+            "num_targets": manager.num_targets,
+            "num_cannons": manager.num_cannons,
+            "tick_rate": manager.tick_rate,
+            "min_target_size": manager.min_target_size,
+            "max_target_size": manager.max_target_size,
+            "balance": {name: getattr(manager, name) for name in manager.BALANCE},
+        })
+
+    def begin_tick(self, tick: int) -> int:
+        """
+        Starts recording a tick
+
+        Parameters
+        ----------
+        tick : int
+            The tick being recorded
+
+        Returns
+        -------
+        seed : int
+            The seed to reseed the random module with for this tick
+        """
+        seed = self.seeds.getrandbits(32)
+        self.tick = {"tick": tick, "seed": seed, "events": [], "keys": [], "mouse": None}
+        return seed
+
+    def record_events(self, events: list) -> None:
+        """Records the events handled this tick"""
+        self.tick["events"].extend(
+            [event.type, self.event_dict(event)] for event in events
+        )
+
+    def record_keys(self, keys) -> RecordedKeys:
+        """Returns the key state wrapped so the held keys that are read are recorded"""
+        return RecordedKeys(keys, self.tick["keys"])
+
+    def record_mouse(self, mouse_pos: tuple) -> None:
+        """Records the mouse position read this tick"""
+        self.tick["mouse"] = mouse_pos
+
+    def end_tick(self) -> None:
+        """Writes the tick that was recorded"""
+        self.write(self.tick)
+        if self.tick["tick"] % self.flush_every == 0:
+            self.file.flush()
+        self.tick = None
+
+    @staticmethod
+    def event_dict(event: pygame.event.Event) -> dict:
+        """Returns the attributes of an event that can be stored as JSON"""
+        return {
+            name: value
+            for name, value in event.dict.items()
+            if isinstance(value, (bool, int, float, str, tuple, type(None)))
+        }
+
+    def write(self, line: dict) -> None:
+        """Writes a line of JSON to the file"""
+        self.file.write(json.dumps(line, separators=(",", ":")))
+        self.file.write("\n")
+
+    def close(self) -> None:
+        """Closes the replay file"""
+        self.file.close()
+
+class ReplayPlayer:
+    """
+    Plays a replay recorded by an InputRecorder back in a headless Manager
+
+    The ticks are read from the file one at a time, and each one's inputs and
+    seed are fed to the manager before it is processed, so the replay runs as
+    fast as the game can be simulated and reproduces the recorded game exactly.
+
+    Attributes
+    ----------
+    path : str
+        The path of the replay file
+    header : dict
+        The description of the recorded game
+    """
+
+    def __init__(self, path: str) -> None:
+        """Reads the header of a replay file"""
+        self.path = path
+
+        with open(path) as file:
+            self.header = json.loads(file.readline())
+
+        if self.header["version"] != InputRecorder.VERSION:
+            raise ValueError(
+                f"Replay version {self.header['version']} is not supported "
+                f"(expected {InputRecorder.VERSION})"
+            )
+
+    def ticks(self):
+        """Yields the recorded inputs of every tick, reading them lazily"""
+        with open(self.path) as file:
+            file.readline()
+            for line in file:
+                yield json.loads(line)
+
+    def create_manager(self, **kwargs):
+        """
+        Creates a headless Manager in the recorded game's starting state
+
+        Parameters
+        ----------
+        **kwargs
+            Any other arguments to pass to the Manager
+        """
+        # Imported here, as the manager imports this module for its recorder
+        from manager import Manager
+
+        return Manager(
+            num_targets=self.header["num_targets"],
+            num_cannons=self.header["num_cannons"],
+            headless=True,
+            seed=self.header["seed"],
+            tick_rate=self.header["tick_rate"],
+            min_target_size=self.header["min_target_size"],
+            max_target_size=self.header["max_target_size"],
+            balance=self.header["balance"],
+            **kwargs
+        )
+
+    @staticmethod
+    def feed(manager, tick: dict) -> None:
+        """
+        Sets a manager's simulated inputs and random seed for a recorded tick
+
+        Parameters
+        ----------
+        manager : Manager
+            The headless manager playing the replay
+        tick : dict
+            The recorded inputs of the tick
+        """
+        manager.pending_events = [
+            pygame.event.Event(event_type, {
+                name: tuple(value) if isinstance(value, list) else value
+                for name, value in attributes.items()
+            })
+            for event_type, attributes in tick["events"]
+        ]
+        manager.held_keys = set(tick["keys"])
+        manager.mouse_pos = tuple(tick["mouse"]) if tick["mouse"] else None
+
+        random.seed(tick["seed"])
+
+    def play(self, manager=None, max_ticks: int = None):
+        """
+        Plays the replay
+
+        Parameters
+        ----------
+        manager : Manager
+            The headless manager to play in (default None, a new one is made
+            with create_manager)
+        max_ticks : int
+            The number of ticks to stop after, if provided (default None, the
+            whole replay is played)
+
+        Returns
+        -------
+        manager : Manager
+            The manager the replay was played in
+        """
+        if manager is None:
+            manager = self.create_manager()
+
+        for tick in self.ticks():
+            if max_ticks is not None and manager.ticks >= max_ticks:
+                break
+
+            self.feed(manager, tick)
+            manager.process_states()
+
+        return manager
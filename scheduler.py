@@ -0,0 +1,140 @@
+import heapq
+import itertools
+
+class ScheduledEvent:
+    """
+    A callback waiting in a Scheduler
+
+    Attributes
+    ----------
+    tick : int
+        The tick the event is due on
+    callback : Callable
+        The function to call when the event is due
+    args : tuple
+        The arguments to call the callback with
+    interval : int
+        The number of ticks between repeats, or None for a one-shot event
+    cancelled : bool
+        Whether or not the event was cancelled
+    """
+
+    def __init__(
+            self,
+            tick: int,
+            callback,
+            args: tuple,
+            interval: int = None) -> None:
+        """Initializes the event"""
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        """Cancels the event, it will be dropped instead of run"""
+        self.cancelled = True
+
+class Scheduler:
+    """
+    A timer heap keyed on game ticks
+
+    Replaces sleeping threads for anything that happens on a timer (enemy
+    firing, bomb spawning). Events are run from the game loop in the order of
+    their due tick, then the order they were scheduled in, so the game plays out
+    the same way no matter how long each tick takes to process.
+
+    Attributes
+    ----------
+    tick : int
+        The last tick the scheduler ran
+    heap : list
+        A heap of (tick, sequence number, event) entries
+    """
+
+    def __init__(self) -> None:
+        """Initializes the empty heap"""
+        self.tick = 0
+        self.heap: list = []
+        self.sequence = itertools.count()
+
+    def __len__(self) -> int:
+        """Returns the number of events waiting (including cancelled ones)"""
+        return len(self.heap)
+
+    def push(self, event: ScheduledEvent) -> ScheduledEvent:
+        """Pushes an event onto the heap and returns it"""
+        heapq.heappush(self.heap, (event.tick, next(self.sequence), event))
+        return event
+
+    def schedule(self, delay: int, callback, *args) -> ScheduledEvent:
+        """
+        Schedules a callback to run once, a number of ticks from now
+
+        Parameters
+        ----------
+        delay : int
+            The number of ticks to wait
+        callback : Callable
+            The function to call
+        *args
+            The arguments to call the function with
+
+        Returns
+        -------
+        event : ScheduledEvent
+            The scheduled event (which can be cancelled)
+        """
+        return self.push(ScheduledEvent(self.tick + delay, callback, args))
+
+    def schedule_every(self, interval: int, callback, *args) -> ScheduledEvent:
+        """
+        Schedules a callback to run every interval ticks, starting interval
+        ticks from now
+
+        Parameters
+        ----------
+        interval : int
+            The number of ticks between each call
+        callback : Callable
+            The function to call
+        *args
+            The arguments to call the function with
+
+        Returns
+        -------
+        event : ScheduledEvent
+            The scheduled event (which can be cancelled)
+        """
+        return self.push(
+            ScheduledEvent(self.tick + interval, callback, args, interval)
+        )
+
+    def run_due(self, tick: int) -> None:
+        """
+        Runs every event due on or before a tick
+
+        Parameters
+        ----------
+        tick : int
+            The current tick
+        """
+        self.tick = tick
+
+        while self.heap and self.heap[0][0] <= tick:
+            _, _, event = heapq.heappop(self.heap)
+            if event.cancelled:
+                continue
+
+            event.callback(*event.args)
+
+            # Repeating events go back on the heap (unless the callback
+            # cancelled them)
+            if event.interval and not event.cancelled:
+                event.tick += event.interval
+                self.push(event)
+
+    def clear(self) -> None:
+        """Drops every event"""
+        self.heap.clear()
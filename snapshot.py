@@ -0,0 +1,514 @@
+from bombs import Bomb
+from cannon import ArtificialCannon
+from projectiles import ProjectileView, SHAPE_CODES
+from scheduler import ScheduledEvent
+from targets import (
+    MovingTarget, MovingSquare, MovingTriangle, MovingCircle,
+    StaticSquare, StaticTriangle, StaticCircle
+)
+
+import random
+import struct
+
+import numpy as np
+
+class Snapshot:
+    """
+    Saves and restores the full state of a Manager in a compact binary format
+
+    A snapshot is a set of NumPy tables, one row per cannon, target, bomb,
+    projectile, and pending scheduled event, along with the game counters and
+    the state of the random number generator. Restoring a snapshot into a
+    Manager continues the game exactly where it was saved.
+
+    The file starts with a header of the magic bytes, the format version, and
+    the number of tables. Each table follows as its name, its number of rows,
+    and its raw rows. The layout of every table's rows is fixed by VERSION, so
+    the version must be bumped whenever a table changes.
+    """
+
+    MAGIC = b"GA7S"
+    VERSION = 2
+
+    HEADER = struct.Struct("<4sHH")
+    TABLE_HEADER = struct.Struct("<16sQ")
+
+    SHAPE = "S1"
+    COLOR = ("u1", 3)
+
+    # The layout of every table, in the order they are written
+    TABLES = {
+        # ticks, done, targets destroyed, projectiles used, number of targets,
+        # next target id, and the scheduler's tick
+        "counters": np.dtype("<i8"),
+
+        # The 625 words of the Mersenne Twister state and its position
+        "rng_state": np.dtype("<u4"),
+        # The cached value of random.gauss (NaN if there isn't one)
+        "rng_gauss": np.dtype("<f8"),
+
+        # The user cannon first, then every artificial cannon
+        "cannons": np.dtype([
+            ("x", "<f8"), ("y", "<f8"), ("v_x", "<f8"), ("v_y", "<f8"),
+            ("health", "<i8"), ("color", COLOR), ("angle", "<f8"),
+            ("max_pow", "<i8"), ("min_pow", "<i8"), ("pow", "<f8"),
+            ("active", "?"), ("chosen_type", SHAPE), ("array_backed", "?"),
+        ]),
+
+        "targets": np.dtype([
+            ("moving", "?"), ("shape", SHAPE),
+            ("x", "<f8"), ("y", "<f8"), ("v_x", "<f8"), ("v_y", "<f8"),
+            ("size", "<i8"), ("health", "<i8"), ("color", COLOR),
+            ("target_id", "<i8"),
+        ]),
+
+        "bombs": np.dtype([
+            ("x", "<f8"), ("y", "<f8"), ("v_y", "<f8"), ("size", "<i8"),
+            ("health", "<i8"), ("color", COLOR), ("shape", SHAPE),
+            ("owner_id", "<i8"),
+        ]),
+
+        # owner is the index of the cannon in the cannons table
+        "projectiles": np.dtype([
+            ("owner", "<i8"),
+            ("x", "<f8"), ("y", "<f8"), ("v_x", "<f8"), ("v_y", "<f8"),
+            ("size", "<i8"), ("health", "<i8"), ("color", COLOR),
+            ("shape", SHAPE),
+        ]),
+
+        # The pending events in the order the scheduler would run them. kind
+        # is one of EVENT_KINDS, and owner is a cannon index (strikes) or a
+        # target id (bomb drops)
+        "events": np.dtype([
+            ("kind", "<i1"), ("tick", "<i8"), ("interval", "<i8"),
+            ("owner", "<i8"), ("value", "<f8"),
+        ]),
+    }
+
+    EVENT_KINDS = ("spawn_bombs", "drop_bomb", "strike")
+
+    # The target class of each (moving, shape)
+    TARGET_TYPES = {
+        (True, "s"): MovingSquare,
+        (True, "t"): MovingTriangle,
+        (True, "c"): MovingCircle,
+        (False, "s"): StaticSquare,
+        (False, "t"): StaticTriangle,
+        (False, "c"): StaticCircle,
+    }
+
+    # The value stored for a missing id
+    NONE = -1
+
+    @staticmethod
+    def pack(tables: dict) -> bytes:
+        """
+        Packs a snapshot's tables into bytes
+
+        Parameters
+        ----------
+        tables : dict
+            A dictionary of table name: array, with every table in TABLES
+
+        Returns
+        -------
+        data : bytes
+            The packed snapshot
+        """
+        chunks = [
+            Snapshot.HEADER.pack(
+                Snapshot.MAGIC, Snapshot.VERSION, len(Snapshot.TABLES)
+            )
+        ]
+
+        for name, dtype in Snapshot.TABLES.items():
+            table = np.ascontiguousarray(tables[name], dtype=dtype)
+            chunks.append(Snapshot.TABLE_HEADER.pack(name.encode(), len(table)))
+            chunks.append(table.tobytes())
+
+        return b"".join(chunks)
+
+    @staticmethod
+    def unpack(data: bytes) -> dict:
+        """
+        Unpacks the tables of a snapshot
+
+        Parameters
+        ----------
+        data : bytes
+            The packed snapshot
+
+        Returns
+        -------
+        tables : dict
+            A dictionary of table name: array (read only views of data)
+        """
+        magic, version, count = Snapshot.HEADER.unpack_from(data)
+        if magic != Snapshot.MAGIC:
+            raise ValueError("Not a game snapshot")
+        if version != Snapshot.VERSION:
+            raise ValueError(
+                f"Snapshot version {version} is not supported "
+                f"(expected {Snapshot.VERSION})"
+            )
+
+        tables = {}
+        offset = Snapshot.HEADER.size
+
+        for _ in range(count):
+            name, rows = Snapshot.TABLE_HEADER.unpack_from(data, offset)
+            offset += Snapshot.TABLE_HEADER.size
+
+            name = name.rstrip(b"\0").decode()
+            dtype = Snapshot.TABLES[name]
+            tables[name] = np.frombuffer(data, dtype, rows, offset)
+            offset += rows * dtype.itemsize
+
+        return tables
+
+    @staticmethod
+    def capture(manager) -> dict:
+        """
+        Captures the state of a Manager as a snapshot's tables
+
+        Parameters
+        ----------
+        manager : Manager
+            The manager to capture
+
+        Returns
+        -------
+        tables : dict
+            A dictionary of table name: array
+        """
+        cannons = [manager.user_cannon, *manager.artificial_cannons]
+        NONE = Snapshot.NONE
+
+        def none_to(value):
+            return NONE if value is None else value
+
+        version, state, gauss = random.getstate()
+
+        tables = {
+            "counters": [
+                manager.ticks,
+                manager.done,
+                manager.score_t.targets_destroyed,
+                manager.score_t.projectiles_used,
+                manager.num_targets,
+                manager.target_master.next_target_id,
+                manager.scheduler.tick,
+            ],
+            "rng_state": state,
+            "rng_gauss": [np.nan if gauss is None else gauss],
+            "cannons": [
+                (
+                    cannon.x, cannon.y, cannon.v_x, cannon.v_y, cannon.health,
+                    cannon.color, cannon.angle, cannon.max_pow, cannon.min_pow,
+                    cannon.pow, cannon.active, cannon.chosen_type,
+                    cannon.projectile_master.array_backed,
+                )
+                for cannon in cannons
+            ],
+            "targets": [
+                (
+                    isinstance(target, MovingTarget), target.shape,
+                    target.x, target.y,
+                    getattr(target, "v_x", 0), getattr(target, "v_y", 0),
+                    target.size, target.health, target.color,
+                    none_to(target.target_id),
+                )
+                for target in manager.target_master.target_list
+            ],
+            "bombs": [
+                (
+                    bomb.x, bomb.y, bomb.v_y, bomb.size, bomb.health,
+                    bomb.color, bomb.shape, none_to(bomb.owner_id),
+                )
+                for bomb in manager.bomb_master.bomb_list
+            ],
+            "projectiles": [
+                (
+                    owner, projectile.x, projectile.y,
+                    projectile.v_x, projectile.v_y, projectile.size,
+                    projectile.health, projectile.color, projectile.shape,
+                )
+                for owner, cannon in enumerate(cannons)
+                for projectile in cannon.projectile_master.projectile_list
+            ],
+            "events": Snapshot.capture_events(manager, cannons),
+        }
+
+        return {
+            name: np.array(
+                [tuple(row) for row in rows] if Snapshot.TABLES[name].names else rows,
+                dtype=Snapshot.TABLES[name]
+            )
+            for name, rows in tables.items()
+        }
+
+    @staticmethod
+    def capture_events(manager, cannons: list) -> list:
+        """
+        Describes every pending scheduled event, in the order they would run
+
+        Raises a ValueError for an event that can't be described
+        """
+        strikes = {cannon.strike: i for i, cannon in enumerate(cannons)}
+        events = []
+
+        for tick, _, event in sorted(manager.scheduler.heap, key=lambda e: e[:2]):
+            if event.cancelled:
+                continue
+
+            interval = event.interval or 0
+
+            if event.callback == manager.spawn_bombs and not event.args:
+                events.append((0, tick, interval, Snapshot.NONE, 0))
+            elif event.callback == manager.drop_bomb:
+                target, chance, target_id = event.args
+                events.append((1, tick, interval, target_id, chance))
+            elif event.callback in strikes and len(event.args) == 1:
+                events.append(
+                    (2, tick, interval, strikes[event.callback], event.args[0])
+                )
+            else:
+                raise ValueError(f"Can't snapshot the scheduled {event.callback}")
+
+        return events
+
+    @staticmethod
+    def apply(manager, tables: dict) -> None:
+        """
+        Restores the state of a Manager from a snapshot's tables
+
+        Parameters
+        ----------
+        manager : Manager
+            The manager to restore into (its current state is replaced)
+        tables : dict
+            A dictionary of table name: array
+        """
+        NONE = Snapshot.NONE
+
+        def to_none(value):
+            value = int(value)
+            return None if value == NONE else value
+
+        # Counters
+        (
+            manager.ticks, done, manager.score_t.targets_destroyed,
+            manager.score_t.projectiles_used, manager.num_targets,
+            next_target_id, scheduler_tick
+        ) = tables["counters"].tolist()
+        manager.done = bool(done)
+
+        # Cannons
+        rows = tables["cannons"]
+        manager.artificial_cannons = [
+            ArtificialCannon(x=0, y=0, pool=manager.projectile_pool)
+            for _ in range(len(rows) - 1)
+        ]
+        cannons = [manager.user_cannon, *manager.artificial_cannons]
+
+        for cannon, row in zip(cannons, rows):
+            (
+                cannon.x, cannon.y, cannon.v_x, cannon.v_y, cannon.health,
+                color, cannon.angle, cannon.max_pow, cannon.min_pow,
+                cannon.pow, cannon.active, chosen_type, array_backed
+            ) = row.tolist()
+            cannon.color = tuple(color.tolist())
+            cannon.chosen_type = chosen_type.decode()
+
+            master = cannon.projectile_master
+            if master.array_backed != array_backed:
+                cannon.projectile_master = type(master)(
+                    array_backed, manager.projectile_pool
+                )
+
+        # Objects are built without running __init__, which would only draw 
+        # random defaults for the attributes about to be overwritten
+
+        # Projectiles
+        projectiles = tables["projectiles"]
+        for owner, cannon in enumerate(cannons):
+            Snapshot.apply_projectiles(
+                cannon.projectile_master, 
+                projectiles[projectiles["owner"] == owner]
+            )
+
+        # Targets
+        target_master = manager.target_master
+        target_master.clear()
+
+        for row in tables["targets"].tolist():
+            moving, shape, x, y, v_x, v_y, size, health, color, target_id = row
+            shape = shape.decode()
+
+            if target_master.array_backed:
+                target_master.add_view(
+                    moving, shape, to_none(target_id), x = x, y = y, 
+                    v_x = v_x, v_y = v_y, size = size, health = health, 
+                    color = color
+                )
+                continue
+
+            cls = Snapshot.TARGET_TYPES[moving, shape]
+            target = cls.__new__(cls)
+            if moving:
+                target.v_x, target.v_y = v_x, v_y
+            target.x, target.y, target.size, target.health = x, y, size, health
+            target.color, target.shape = tuple(color.tolist()), shape
+            target.target_id = to_none(target_id)
+            target_master.target_list.append(target)
+
+        target_master.next_target_id = next_target_id
+
+        # Bombs
+        bomb_master = manager.bomb_master
+        bomb_master.clear()
+
+        for row in tables["bombs"].tolist():
+            x, y, v_y, size, health, color, shape, owner_id = row
+
+            if bomb_master.array_backed:
+                bomb_master.add_view(
+                    x, y, v_y, size, health, tuple(color.tolist()), 
+                    shape.decode(), to_none(owner_id)
+                )
+                continue
+
+            bomb = Bomb.__new__(Bomb)
+            bomb.x, bomb.y, bomb.v_x, bomb.v_y = x, y, 0, v_y
+            bomb.size, bomb.health = size, health
+            bomb.color, bomb.shape = tuple(color.tolist()), shape.decode()
+            bomb.owner_id = to_none(owner_id)
+            bomb_master.bomb_list.append(bomb)
+
+        # Scheduled events
+        Snapshot.apply_events(manager, cannons, tables["events"], scheduler_tick)
+
+        # Continue the random numbers where they were
+        gauss = float(tables["rng_gauss"][0])
+        random.setstate((
+            3,
+            tuple(tables["rng_state"].tolist()),
+            None if np.isnan(gauss) else gauss
+        ))
+
+        if manager.renderer:
+            manager.renderer.reset()
+
+    @staticmethod
+    def apply_projectiles(master, rows: np.ndarray) -> None:
+        """Replaces the projectiles of a ProjectileMaster with a table's rows"""
+        master.projectile_list.clear()
+
+        if master.array_backed:
+            store = master.store
+            store.clear()
+            fields = ("x", "y", "v_x", "v_y", "size", "health", "color")
+            shapes = rows["shape"].astype(str)
+
+            indices = store.extend(
+                len(rows),
+                shape=[SHAPE_CODES.index(shape) for shape in shapes],
+                **{name: rows[name] for name in fields}
+            )
+            master.projectile_list.extend(
+                ProjectileView(store, index) for index in indices
+            )
+            return
+
+        for row in rows.tolist():
+            _, x, y, v_x, v_y, size, health, color, shape = row
+            shape = shape.decode()
+
+            cls = master.projectile_types[shape]
+            projectile = cls.__new__(cls)
+            projectile.x, projectile.y = x, y
+            projectile.v_x, projectile.v_y = v_x, v_y
+            projectile.size, projectile.health = size, health
+            projectile.color, projectile.shape = tuple(color.tolist()), shape
+            master.projectile_list.append(projectile)
+
+    @staticmethod
+    def apply_events(
+            manager,
+            cannons: list,
+            events: np.ndarray,
+            tick: int) -> None:
+        """Reschedules the pending events of a snapshot, in their order"""
+        scheduler = manager.scheduler
+        scheduler.clear()
+        scheduler.tick = tick
+
+        targets = {
+            target.target_id: target
+            for target in manager.target_master.target_list
+        }
+        manager.bomb_spawning_event = None
+        for cannon in cannons[1:]:
+            cannon.strike_event = None
+
+        for kind, tick, interval, owner, value in events.tolist():
+            kind = Snapshot.EVENT_KINDS[kind]
+
+            if kind == "spawn_bombs":
+                event = ScheduledEvent(tick, manager.spawn_bombs, ())
+                manager.bomb_spawning_event = event
+            elif kind == "drop_bomb":
+                # The target is gone, so the drop would do nothing anyway
+                if owner not in targets:
+                    continue
+                event = ScheduledEvent(
+                    tick, manager.drop_bomb, (targets[owner], value, owner)
+                )
+            else:
+                cannon = cannons[owner]
+                event = ScheduledEvent(
+                    tick, cannon.strike, (int(value),), interval or None
+                )
+                cannon.strike_event = event
+
+            scheduler.push(event)
+
+    @staticmethod
+    def dumps(manager) -> bytes:
+        """Returns a snapshot of a Manager as bytes"""
+        return Snapshot.pack(Snapshot.capture(manager))
+
+    @staticmethod
+    def loads(manager, data: bytes) -> None:
+        """Restores a Manager from a snapshot made by Snapshot.dumps"""
+        Snapshot.apply(manager, Snapshot.unpack(data))
+
+    @staticmethod
+    def save(manager, path: str) -> None:
+        """
+        Saves a snapshot of a Manager to a file
+
+        Parameters
+        ----------
+        manager : Manager
+            The manager to save
+        path : str
+            The path of the file to write
+        """
+        with open(path, "wb") as file:
+            file.write(Snapshot.dumps(manager))
+
+    @staticmethod
+    def load(manager, path: str) -> None:
+        """
+        Restores a Manager from a snapshot file
+
+        Parameters
+        ----------
+        manager : Manager
+            The manager to restore into
+        path : str
+            The path of the file to read
+        """
+        with open(path, "rb") as file:
+            Snapshot.loads(manager, file.read())
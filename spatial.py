@@ -0,0 +1,150 @@
+import numpy as np
+
+class UniformGrid:
+    """
+    A uniform grid used as a broad phase for collision checks
+
+    Entities are bucketed into square cells by their position. A query only
+    pairs an entity with the entities in the cells around it, so the number of
+    exact collision checks grows with the number of nearby pairs instead of with
+    every pair on the screen.
+
+    The grid is stored as the entities' cell keys sorted with NumPy, so a
+    rebuild is a single argsort and a query is a handful of searchsorted calls.
+
+    Attributes
+    ----------
+    cell_size : float
+        The side length of a cell
+    buffer : int
+        The extra distance allowed between two colliding objects (default 10,
+        matching Drawable.check_collision)
+    max_size : int
+        The size of the largest entity in the grid
+    order : np.ndarray
+        The entity indices sorted by cell key
+    sorted_keys : np.ndarray
+        The cell keys of the entities, sorted
+    """
+
+    # Multiplier used to pack a cell's (column, row) into a single key
+    KEY_STRIDE = 1 << 21
+
+    def __init__(self, cell_size: float = 64, buffer: int = 10) -> None:
+        """Initializes an empty grid"""
+        self.cell_size = cell_size
+        self.buffer = buffer
+        self.max_size = 0
+        self.order = np.empty(0, dtype=np.int64)
+        self.sorted_keys = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        """Returns the number of entities in the grid"""
+        return len(self.order)
+
+    @staticmethod
+    def entity_arrays(entities: list) -> tuple:
+        """
+        Gathers the positions and sizes of a list of Drawables into arrays
+
+        Parameters
+        ----------
+        entities : list[Drawable]
+            The entities to gather
+
+        Returns
+        -------
+        positions : np.ndarray
+            An (N, 2) array of the entities' (x, y) positions
+        sizes : np.ndarray
+            An (N,) array of the entities' sizes
+        """
+        positions = np.array(
+            [(entity.x, entity.y) for entity in entities], dtype=np.float64
+        ).reshape(-1, 2)
+        sizes = np.array([entity.size for entity in entities], dtype=np.float64)
+
+        return positions, sizes
+
+    def cells(self, positions: np.ndarray) -> tuple:
+        """Returns the (column, row) of the cells holding the given positions"""
+        cells = np.floor_divide(positions, self.cell_size).astype(np.int64)
+        return cells[:, 0], cells[:, 1]
+
+    def rebuild(self, positions: np.ndarray, sizes: np.ndarray) -> None:
+        """
+        Rebuilds the grid from scratch
+
+        Parameters
+        ----------
+        positions : np.ndarray
+            An (N, 2) array of the entities' (x, y) positions
+        sizes : np.ndarray
+            An (N,) array of the entities' sizes
+        """
+        columns, rows = self.cells(positions)
+        keys = columns * self.KEY_STRIDE + rows
+
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.order]
+        self.max_size = sizes.max() if len(sizes) else 0
+
+    def query_pairs(self, positions: np.ndarray, sizes: np.ndarray) -> tuple:
+        """
+        Finds every (query, grid entity) pair that may be colliding
+
+        Searches a ring of cells around each queried position wide enough to
+        reach any entity in the grid, so no colliding pair is missed. The pairs
+        are sorted by query index, then by grid index.
+
+        Parameters
+        ----------
+        positions : np.ndarray
+            An (M, 2) array of the queried positions
+        sizes : np.ndarray
+            An (M,) array of the queried sizes
+
+        Returns
+        -------
+        query_indices : np.ndarray
+            The index of the queried entity of each pair
+        grid_indices : np.ndarray
+            The index of the grid entity of each pair
+        """
+        if not len(positions) or not len(self.order):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        # How many cells away a colliding entity can be
+        reach = sizes.max() + self.max_size + self.buffer
+        ring = int(np.ceil(reach / self.cell_size))
+
+        columns, rows = self.cells(positions)
+        query_indices, grid_indices = [], []
+
+        for d_column in range(-ring, ring + 1):
+            for d_row in range(-ring, ring + 1):
+                keys = (columns + d_column) * self.KEY_STRIDE + rows + d_row
+
+                # The range of sorted entities sitting in each neighbouring cell
+                starts = np.searchsorted(self.sorted_keys, keys, 'left')
+                counts = np.searchsorted(self.sorted_keys, keys, 'right') - starts
+
+                total = counts.sum()
+                if not total:
+                    continue
+
+                # Expand every [start, start + count) range into its indices
+                offsets = np.arange(total) - np.repeat(counts.cumsum() - counts, counts)
+                query_indices.append(np.repeat(np.arange(len(keys)), counts))
+                grid_indices.append(self.order[np.repeat(starts, counts) + offsets])
+
+        if not query_indices:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        query_indices = np.concatenate(query_indices)
+        grid_indices = np.concatenate(grid_indices)
+
+        order = np.lexsort((grid_indices, query_indices))
+        return query_indices[order], grid_indices[order]
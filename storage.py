@@ -0,0 +1,193 @@
+import numpy as np
+
+# The shape codes stored in the 'shape' field, indexed by code
+SHAPE_CODES = 'cst'
+
+class ArrayStore:
+    """
+    A structure-of-arrays container for entity attributes
+
+    Every field is kept in its own NumPy array so a Master can update all of its
+    entities with a handful of array operations instead of one method call per
+    object. Arrays are over-allocated and doubled when full, so appending a row
+    is amortized O(1). Only the first `count` rows of each array are live.
+
+    Attributes
+    ----------
+    fields : dict
+        A dictionary of field name: (dtype, width). A width of 1 stores a flat
+        array, anything larger stores a (capacity, width) array (e.g. colors)
+    capacity : int
+        The number of rows currently allocated
+    count : int
+        The number of live rows
+    """
+
+    def __init__(self, fields: dict, capacity: int = 64) -> None:
+        """Allocates an empty array for every field"""
+        self.fields = fields
+        self.capacity = capacity
+        self.count = 0
+
+        for name, (dtype, width) in self.fields.items():
+            setattr(self, name, self._allocate(dtype, width, capacity))
+
+    def __len__(self) -> int:
+        """Returns the number of live rows"""
+        return self.count
+
+    @staticmethod
+    def _allocate(dtype: type, width: int, capacity: int) -> np.ndarray:
+        """Allocates a zeroed array for a single field"""
+        shape = (capacity,) if width == 1 else (capacity, width)
+        return np.zeros(shape, dtype=dtype)
+
+    def grow(self) -> None:
+        """Doubles the capacity of every field, keeping the live rows"""
+        self.capacity *= 2
+
+        for name, (dtype, width) in self.fields.items():
+            grown = self._allocate(dtype, width, self.capacity)
+            grown[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, grown)
+
+    def append(self, **values) -> int:
+        """
+        Appends a row to the store
+
+        Parameters
+        ----------
+        **values
+            A value for each field. Fields that are not provided are zeroed
+
+        Returns
+        -------
+        index : int
+            The row the values were stored at
+        """
+        if self.count == self.capacity:
+            self.grow()
+
+        index = self.count
+        for name in self.fields:
+            getattr(self, name)[index] = values.get(name, 0)
+
+        self.count += 1
+        return index
+
+    def extend(self, count: int, **columns) -> range:
+        """
+        Appends several rows to the store at once
+
+        Parameters
+        ----------
+        count : int
+            The number of rows to append
+        **columns
+            The values of each field for the new rows (an array of count 
+            values, or a single value for every row). Fields that are not 
+            provided are zeroed
+
+        Returns
+        -------
+        indices : range
+            The rows the values were stored at
+        """
+        while self.count + count > self.capacity:
+            self.grow()
+
+        start = self.count
+        for name in self.fields:
+            getattr(self, name)[start:start + count] = columns.get(name, 0)
+
+        self.count += count
+        return range(start, self.count)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns the live rows of a field
+
+        The returned array is a view, so writing to it writes to the store
+
+        Parameters
+        ----------
+        name : str
+            The name of the field
+        """
+        return getattr(self, name)[:self.count]
+
+    def compact(self, keep: np.ndarray) -> None:
+        """
+        Removes every row not marked in keep, preserving the order of the rest
+
+        Parameters
+        ----------
+        keep : np.ndarray
+            A boolean mask over the live rows, True for rows that should stay
+        """
+        kept = int(np.count_nonzero(keep))
+
+        for name in self.fields:
+            array = getattr(self, name)
+            array[:kept] = array[:self.count][keep]
+
+        self.count = kept
+
+    def clear(self) -> None:
+        """Removes every row"""
+        self.count = 0
+
+class StoreView:
+    """
+    A mixin for entities whose attributes live in a row of an ArrayStore
+
+    Reading or writing an attribute reads or writes the array, so a view
+    behaves like the entity it is mixed into (it can be drawn, collided, and
+    killed) while its Master updates the whole store at once. A view is only
+    valid for as long as its row is, so Masters keep the row a view points at
+    up to date as they remove rows. Subclasses declare the `_store` and 
+    `_index` slots, and only add what is specific to them
+
+    Attributes
+    ----------
+    _store : ArrayStore
+        The store the view's row is in
+    _index : int
+        The row of the view in the store
+    """
+
+    __slots__ = ()
+
+    def __init__(self, store: ArrayStore, index: int) -> None:
+        """Points the view at a row of the store"""
+        self._store = store
+        self._index = index
+
+    def _field(name: str, cast: type = int) -> property:
+        """Creates a property that reads and writes a field of the view's row"""
+        def getter(self):
+            return cast(getattr(self._store, name)[self._index])
+
+        def setter(self, value):
+            getattr(self._store, name)[self._index] = value
+
+        return property(getter, setter)
+
+    x = _field('x', float)
+    y = _field('y', float)
+    v_x = _field('v_x', float)
+    v_y = _field('v_y', float)
+    size = _field('size')
+    health = _field('health')
+    color = _field('color', lambda color: tuple(color.tolist()))
+
+    @property
+    def shape(self) -> str:
+        """The shape of the entity, decoded from its shape code"""
+        return SHAPE_CODES[self._store.shape[self._index]]
+
+    @shape.setter
+    def shape(self, shape: str) -> None:
+        self._store.shape[self._index] = SHAPE_CODES.index(shape)
+
+    del _field
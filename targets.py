@@ -1,10 +1,24 @@
 from abstract import Drawable, Killable, Moveable
 from color import Color
 from artist import Artist
-from bombs import BombMaster
+from pool import ObjectPool
+from storage import ArrayStore, StoreView, SHAPE_CODES
 
 from pygame import Surface
 import random
+import numpy as np
+
+# The fields an array-backed TargetMaster keeps for each target
+TARGET_FIELDS: dict = {
+    'x': (np.float64, 1),
+    'y': (np.float64, 1),
+    'v_x': (np.float64, 1),
+    'v_y': (np.float64, 1),
+    'size': (np.int64, 1),
+    'health': (np.int64, 1),
+    'shape': (np.int8, 1),
+    'color': (np.uint8, 3),
+}
 
 class TargetMaster:
     """
@@ -21,11 +35,42 @@ class TargetMaster:
         A list of the moveable types of targets
     static_target_type : list
         A list of the static types of targets
+    next_target_id : int
+        The target_id given to the next created target
+    pool : ObjectPool
+        The pool destroyed targets are released into and new ones are taken 
+        from (its own pool, unless one is passed in to share)
+    min_size : int
+        The smallest size calculate_target_size picks (default 10)
+    max_size : int
+        The largest size calculate_target_size picks (default 30)
+    array_backed : bool
+        Whether the targets' attributes are stored in arrays (default False).
+        The moving and static targets are kept in separate stores, and every
+        moving target is moved at once. target_list then holds views into the
+        stores, so targets can still be drawn and collided one at a time.
+    moving_store : ArrayStore
+        The attributes of the moving targets, if array_backed
+    static_store : ArrayStore
+        The attributes of the static targets, if array_backed
     """
 
-    def __init__(self) -> None:
+    def __init__(
+            self, 
+            pool: ObjectPool = None, 
+            min_size: int = 10, 
+            max_size: int = 30,
+            array_backed: bool = False) -> None:
         """Initializes the empty target list"""
         self.target_list: list[Target] = []
+        self.min_size = min_size
+        self.max_size = max_size
+        self.next_target_id = 0
+        self.pool = pool if pool is not None else ObjectPool()
+
+        self.array_backed = array_backed
+        self.moving_store = ArrayStore(TARGET_FIELDS) if array_backed else None
+        self.static_store = ArrayStore(TARGET_FIELDS) if array_backed else None
 
         # The types of targets available
         self.moving_target_type = [
@@ -39,6 +84,12 @@ class TargetMaster:
             StaticCircle
         ]
 
+        # The shape of every type of target, for array_backed targets
+        self.target_shapes = {
+            MovingSquare: 's', MovingTriangle: 't', MovingCircle: 'c',
+            StaticSquare: 's', StaticTriangle: 't', StaticCircle: 'c'
+        }
+
     def create_random_target(
             self, 
             screen_size: tuple, 
@@ -87,18 +138,77 @@ class TargetMaster:
             chosen_type = random.choice(self.moving_target_type)
         else:
             chosen_type = random.choice(self.static_target_type)
+
+        # Store the target's attributes in the arrays, drawing its random 
+        # values in the same order as creating the object would
+        if self.array_backed:
+            if is_moving:
+                params['v_x'] = random.randint(-2, 2)
+                params['v_y'] = random.randint(-2, 2)
+
+            self.add_view(
+                is_moving, 
+                self.target_shapes[chosen_type],
+                color = Color.rand_color(), 
+                **params
+            )
+            return
         
-        # Create and store the target
-        created_target = chosen_type(**params)
+        # Create (or reuse) and store the target
+        created_target = self.pool.acquire(chosen_type, **params)
+        created_target.target_id = self.next_target_id
+        self.next_target_id += 1
         self.target_list.append(created_target)
 
+    def add_view(
+            self, 
+            is_moving: bool, 
+            shape: str, 
+            target_id: int = None,
+            **values) -> "TargetView":
+        """
+        Stores a target's attributes in the moving or static store, and adds a
+        view of it to the target list (array_backed only)
+
+        Parameters
+        ----------
+        is_moving : bool
+            Whether the target is a moving target
+        shape : str
+            The shape of the target
+        target_id : int
+            The target's id (default None, the next one)
+        **values
+            The target's x, y, size, color, and optionally v_x, v_y, and health
+            (default 1)
+
+        Returns
+        -------
+        view : TargetView
+            The view of the new target
+        """
+        store = self.moving_store if is_moving else self.static_store
+        values.setdefault('health', 1)
+        index = store.append(**values, shape = SHAPE_CODES.index(shape))
+
+        view_type = MovingTargetView if is_moving else TargetView
+        view = view_type(store, index)
+
+        if target_id is None:
+            target_id = self.next_target_id
+            self.next_target_id += 1
+        view.target_id = target_id
+
+        self.target_list.append(view)
+        return view
+
     def calculate_target_size(self, score: int) -> int:
         """
         Determines the target size based on the score
         
-        Should be a number between 10 and 30, with higher sizes being favored for
-        lower scores and vice versa (the higher the score, the harder it is to
-        hit the targets)
+        Should be a number between min_size and max_size, with higher sizes 
+        being favored for lower scores and vice versa (the higher the score, 
+        the harder it is to hit the targets)
 
         Parameters 
         ----------
@@ -114,39 +224,139 @@ class TargetMaster:
 
         weight = 1/(score + 1)
 
-        return int(random.uniform(10, min(30, 30 + weight * 20)))
+        return int(random.uniform(
+            self.min_size, min(self.max_size, self.max_size + weight * 20)
+        ))
 
     def draw_all(self, surface: Surface) -> None:
         """
         Simply loops through all the targets and draws them to the surface
         
-        Simply calls the target.draw function on each target
+        Blits every target at once with Artist.draw_many
 
         Parameters
         ----------
         surface : pygame.Surface
             The surface to draw the target to
         """
-        [target.draw(surface) for target in self.target_list]
+        Artist.draw_many(surface, self.target_list)
     
-    def move_all(self, screen_size: tuple) -> None:
+    def move_all(self, screen_size: tuple, time: float = 1) -> None:
         """
         Simply loops through all the targets and moves them based on their velocity
         
         Simply calls the target.move function on each target if it's a moving
-        target
+        target, or moves every moving target at once if the master is 
+        array_backed
 
         Parameters
         ----------
         screen_size : tuple
             The size of the screen
+        time : float
+            The number of standard ticks to move for (default 1)
         """
+        if self.array_backed:
+            store = self.moving_store
+            self.move_arrays(
+                store.column('x'), store.column('y'),
+                store.column('v_x'), store.column('v_y'),
+                store.column('size'), screen_size, time
+            )
+            return
+
         [
-            target.move(screen_size) 
+            target.move(screen_size, time) 
             for target in self.target_list 
             if isinstance(target, MovingTarget)
         ]
 
+    @staticmethod
+    def move_arrays(
+            x: np.ndarray,
+            y: np.ndarray,
+            v_x: np.ndarray,
+            v_y: np.ndarray,
+            size: np.ndarray,
+            screen_size: tuple,
+            time: float = 1) -> None:
+        """
+        Moves a batch of moving targets in place, one array operation per rule
+
+        Mirrors MovingTarget.move followed by MovingTarget.check_corners: 
+        movement, then rebound off each edge (truncating velocities like int()
+        does)
+
+        Parameters
+        ----------
+        x, y : np.ndarray
+            The coordinates of the targets
+        v_x, v_y : np.ndarray
+            The velocities of the targets
+        size : np.ndarray
+            The sizes of the targets
+        screen_size : tuple
+            The size of the screen
+        time : float
+            The number of standard ticks to move for (default 1)
+        """
+        x += time * v_x
+        y += time * v_y
+
+        # Left and right edges (a target can only hit one of them)
+        left = x < size
+        right = ~left & (x > screen_size[0] - size)
+        x[left] = size[left]
+        x[right] = screen_size[0] - size[right]
+
+        hit = left | right
+        v_x[hit] = -np.trunc(v_x[hit])
+        v_y[hit] = np.trunc(v_y[hit])
+
+        # Top and bottom edges
+        top = y < size
+        bottom = ~top & (y > screen_size[1] - size)
+        y[top] = size[top]
+        y[bottom] = screen_size[1] - size[bottom]
+
+        hit = top | bottom
+        v_x[hit] = np.trunc(v_x[hit])
+        v_y[hit] = -np.trunc(v_y[hit])
+
+    def remove_dead(self) -> None:
+        """Removes dead targets from the target list"""
+        if self.array_backed:
+            alive = [target for target in self.target_list if target.health > 0]
+            if len(alive) == len(self.target_list):
+                return
+
+            # Anything still holding a dead target (like a scheduled bomb drop)
+            # keeps seeing it dead
+            for view in self.target_list:
+                if view.health <= 0:
+                    view.detach()
+
+            # Drop the dead rows of each store and point the surviving views at
+            # their new rows
+            for store in [self.moving_store, self.static_store]:
+                store.compact(store.column('health') > 0)
+
+            self.target_list[:] = alive
+            counts = {id(self.moving_store): 0, id(self.static_store): 0}
+            for view in alive:
+                view._index = counts[id(view._store)]
+                counts[id(view._store)] += 1
+            return
+
+        Killable.remove_dead(self.target_list, self.pool)
+
+    def clear(self) -> None:
+        """Removes every target"""
+        self.target_list = []
+        if self.array_backed:
+            self.moving_store.clear()
+            self.static_store.clear()
+
 class Target(Drawable, Killable):
     """
     A class representing a target
@@ -178,10 +388,13 @@ class Target(Drawable, Killable):
     shape : str
         A string of characters 's', 't', or 'c' denoting whether the object is a
         square, triangle, or circle.
-    bomb_master : BombMaster
-        The controller of all bombs created by this target
+    target_id : int
+        A unique id given by the TargetMaster, used as the owner id of the 
+        target's bombs (None until the target is added to a TargetMaster)
     """
 
+    __slots__ = ('target_id',)
+
     def __init__(
             self, 
             x: int, 
@@ -207,7 +420,25 @@ class Target(Drawable, Killable):
         # Shape initialization
         self.shape = shape
 
-        self.bomb_master = BombMaster()
+        self.target_id = None
+
+    def reset(
+            self, 
+            x: int, 
+            y: int, 
+            color: tuple = None, 
+            size: int = 5, 
+            health: int = 1) -> None:
+        """
+        Resets a destroyed target taken from an ObjectPool, as if it had just 
+        been created. The shape is left as is, since it is fixed by the 
+        target's class
+        """
+        self.x, self.y = x, y
+        self.color = color or Color.rand_color()
+        self.size = size
+        self.health = health
+        self.target_id = None
     
     def draw(self, surface: Surface) -> None:
         """
@@ -274,6 +505,8 @@ class MovingTarget(Moveable, Target):
         square, triangle, or circle.
     """
 
+    __slots__ = ()
+
     def __init__(
             self, 
             x: int, 
@@ -301,8 +534,25 @@ class MovingTarget(Moveable, Target):
         # Parent class initialization
         Moveable.__init__(self, v_x, v_y)
         Target.__init__(self, x, y, color, size, health, shape)
+
+    def reset(
+            self, 
+            x: int, 
+            y: int, 
+            v_x: int = None, 
+            v_y: int = None, 
+            color: tuple = None, 
+            size: int = 30, 
+            health: int = 1) -> None:
+        """
+        Resets a destroyed target taken from an ObjectPool, as if it had just 
+        been created (drawing its random values in the same order)
+        """
+        self.v_x = v_x or random.randint(-2, 2)
+        self.v_y = v_y or random.randint(-2, 2)
+        Target.reset(self, x, y, color, size, health)
     
-    def move(self, screen_size: tuple) -> None:
+    def move(self, screen_size: tuple, time: float = 1) -> None:
         """
         Changes the x and y position of the object depending on the velocities
         and delgates to checking if we hit the edge of the screen
@@ -311,9 +561,11 @@ class MovingTarget(Moveable, Target):
         ----------
         screen_size : tuple
             A tuple representing the (X, Y) size of the screen
+        time : float
+            The number of standard ticks to move for (default 1)
         """
-        self.x += self.v_x
-        self.y += self.v_y
+        self.x += time * self.v_x
+        self.y += time * self.v_y
 
         self.check_corners(screen_size)
     
@@ -381,6 +633,8 @@ class MovingTarget(Moveable, Target):
 
 class MovingSquare(MovingTarget):
     """A MovingTarget of shape Square. Refer to `MovingTarget`"""
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(
             *args,
@@ -389,6 +643,8 @@ class MovingSquare(MovingTarget):
 
 class MovingTriangle(MovingTarget):
     """A MovingTarget of shape Triangle. Refer to `MovingTarget`"""
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(
             *args,
@@ -397,6 +653,8 @@ class MovingTriangle(MovingTarget):
 
 class MovingCircle(MovingTarget):
     """A MovingTarget of shape Circle. Refer to `MovingTarget`"""
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(
             *args,
@@ -405,6 +663,8 @@ class MovingCircle(MovingTarget):
 
 class StaticSquare(Target):
     """A StaticTarget of shape Square. Refer to `Target`"""
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(
             *args,
@@ -413,6 +673,8 @@ class StaticSquare(Target):
 
 class StaticTriangle(Target):
     """A StaticTarget of shape Triangle. Refer to `Target`"""
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(
             *args,
@@ -421,8 +683,43 @@ class StaticTriangle(Target):
 
 class StaticCircle(Target):
     """A StaticTarget of shape Circle. Refer to `Target`"""
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(
             *args,
             **kwargs, 
-            shape = 'c')
\ No newline at end of file
+            shape = 'c')
+
+class TargetView(StoreView, Target):
+    """
+    A Target whose attributes live in a row of an ArrayStore. The row a view 
+    points at is kept up to date by TargetMaster.remove_dead. Refer to 
+    `StoreView` and `Target`
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: ArrayStore, index: int) -> None:
+        """Points the view at a row of the store"""
+        super().__init__(store, index)
+        self.target_id = None
+
+    def detach(self) -> None:
+        """
+        Copies the view's row into a store of its own, before the row is 
+        removed from the master's store
+        """
+        store = ArrayStore(self._store.fields, capacity = 1)
+        store.append(**{
+            name: getattr(self._store, name)[self._index] 
+            for name in store.fields
+        })
+        self._store, self._index = store, 0
+
+class MovingTargetView(TargetView, MovingTarget):
+    """
+    A MovingTarget whose attributes live in a row of an ArrayStore. Refer to
+    `TargetView`
+    """
+    __slots__ = ()
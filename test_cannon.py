@@ -2,9 +2,32 @@ import unittest
 from cannon import Cannon, MovingCannon, ArtificialCannon
 from color import Color
 from projectiles import ProjectileMaster
-from artist import Artist
+from artist import Artist, TextCache, SpriteCache
 from abstract import Moveable, Drawable, Killable
 from targets import TargetMaster
+from spatial import UniformGrid
+from manager import Manager
+from scheduler import Scheduler
+from renderer import DirtyRectRenderer
+from profiler import TickProfiler
+from pool import ObjectPool
+from snapshot import Snapshot
+from replay import InputRecorder, ReplayPlayer
+from timestep import FixedTimestep, Interpolator
+from pipeline import DoubleBuffer, RenderThread, WorldSnapshot
+from batch import BatchRunner, ColumnWriter
+from ballistics import BallisticSolver
+from trajectory import TrajectoryPreview
+from ai import AIController, Policy, Actions
+from benchmarks import suite
+from targets import MovingSquare
+from bombs import Bomb, BombMaster
+import os
+import random
+import tempfile
+from unittest import mock
+import numpy as np
+import pygame
 
 
 class TestCannon(unittest.TestCase):
@@ -152,12 +175,870 @@ class TestProjectiles(unittest.TestCase):
     def test_init(self):
         self.test_projectile = ProjectileMaster()
 
+    def test_array_backed_matches_objects(self):
+        object_master = ProjectileMaster()
+        array_master = ProjectileMaster(array_backed = True)
+        for master in [object_master, array_master]:
+            for angle in [-2.5, -1, 0, 0.5, 3]:
+                master.create_projectile(400, 300, 60, angle, 'c')
+
+        for _ in range(100):
+            for master in [object_master, array_master]:
+                master.move_all((800, 600))
+                master.remove_dead()
+
+            self.assertEqual(
+                [(p.x, p.y, p.v_x, p.v_y) for p in object_master.projectile_list],
+                [(p.x, p.y, p.v_x, p.v_y) for p in array_master.projectile_list]
+            )
+
+    def test_array_backed_views(self):
+        master = ProjectileMaster(array_backed = True)
+        master.create_projectile(100, 100, 10, 0, 's')
+        master.create_projectile(200, 200, 10, 0, 't')
+        master.projectile_list[0].kill()
+        master.remove_dead()
+
+        self.assertEqual(len(master.projectile_list), 1)
+        self.assertEqual(len(master.store), 1)
+        self.assertEqual(master.projectile_list[0].shape, 't')
+        self.assertEqual(master.projectile_list[0].x, 200)
+
+    def test_remove_dead_removes_neighbours(self):
+        master = ProjectileMaster()
+        for x in range(6):
+            master.create_projectile(100 * x, 100, 10, 0, 'c')
+        
+        # Adjacent dead projectiles used to survive an extra tick
+        for projectile in master.projectile_list[1:4]:
+            projectile.kill()
+        master.remove_dead()
+
+        self.assertEqual(
+            [projectile.x for projectile in master.projectile_list], 
+            [0, 400, 500]
+        )
+
    # def test_create_projectile(self):
     #    self.test_projectile = 
 
 
 
 
+class TestTargetMaster(unittest.TestCase):
+    def play(self, manager, ticks):
+        for _ in range(ticks):
+            BatchRunner.autopilot(manager, 10)
+            manager.process_states()
+        return [
+            (t.x, t.y, t.size, t.color, t.shape, t.health, t.target_id)
+            for t in manager.target_master.target_list
+        ]
+
+    def test_array_backed_matches_objects(self):
+        # The games run one after the other, as they share the random module
+        expected = self.play(Manager(headless = True, seed = 3), 200)
+        manager = Manager(headless = True, seed = 3, array_backed = True)
+
+        self.assertEqual(self.play(manager, 200), expected)
+        self.assertEqual(
+            len(manager.target_master.moving_store) 
+            + len(manager.target_master.static_store),
+            len(expected)
+        )
+
+    def test_move_arrays_rebounds(self):
+        master = TargetMaster(array_backed = True)
+        objects = TargetMaster()
+        for x, y, v_x, v_y in [(12, 300, -5, 1), (790, 12, 4, -6), (400, 300, 2, 2)]:
+            for target_master in [master, objects]:
+                target_master.create_random_target((800, 600), 10, x, y, True)
+                target = target_master.target_list[-1]
+                target.v_x, target.v_y = v_x, v_y
+
+        for _ in range(100):
+            master.move_all((800, 600))
+            objects.move_all((800, 600))
+
+        self.assertEqual(
+            [(t.x, t.y, t.v_x, t.v_y) for t in master.target_list],
+            [(t.x, t.y, t.v_x, t.v_y) for t in objects.target_list]
+        )
+
+    def test_removed_targets_stay_dead(self):
+        master = TargetMaster(array_backed = True)
+        for is_moving in [True, False, True]:
+            master.create_random_target((800, 600), 10, is_moving = is_moving)
+        first, second, third = master.target_list
+
+        first.kill()
+        master.remove_dead()
+
+        self.assertEqual(master.target_list, [second, third])
+        self.assertEqual(len(master.moving_store), 1)
+        self.assertFalse(first.is_alive)
+        self.assertTrue(third.is_alive)
+
+class TestBallisticSolver(unittest.TestCase):
+    def closest_approach(self, x, y, angle, power, target, target_v, ticks):
+        """Fires a projectile and returns how close it comes to the target"""
+        master = ProjectileMaster()
+        master.create_projectile(x, y, power, angle, 'c')
+        projectile, = master.projectile_list
+
+        target_x, target_y = target
+        closest = float('inf')
+        for _ in range(ticks + 2):
+            master.move_all((800, 600))
+            target_x += target_v[0]
+            target_y += target_v[1]
+            closest = min(closest, np.hypot(projectile.x - target_x, projectile.y - target_y))
+        return closest
+
+    def test_shots_land_on_their_targets(self):
+        solver = BallisticSolver()
+        x, y = np.array([700, 650, 500]), np.array([300, 500, 100])
+        targets = [(100, 300), (200, 150), (60, 550)]
+        target_v = (2, -1)
+
+        for power in [60, None]:
+            solution = solver.solve(
+                x, y, 
+                np.array([t[0] for t in targets]), np.array([t[1] for t in targets]),
+                *target_v, power = power, ceiling = 20
+            )
+            self.assertTrue(solution.reachable.all())
+
+            for i, target in enumerate(targets):
+                closest = self.closest_approach(
+                    x[i], y[i], solution.angle[i], solution.power[i], 
+                    target, target_v, solution.ticks[i]
+                )
+                # Close enough for the projectile to hit a cannon
+                self.assertLess(closest, 31)
+
+    def test_unreachable_targets_are_aimed_at(self):
+        solver = BallisticSolver(max_ticks = 10)
+        solution = solver.solve([700], [300], 100, 300, power = 5)
+
+        self.assertFalse(solution.reachable[0])
+        self.assertAlmostEqual(solution.angle[0], np.pi)
+
+    def test_aim_sets_every_angle(self):
+        cannons = [ArtificialCannon(x = 600, y = y) for y in [100, 300, 500]]
+        solution = BallisticSolver().aim(cannons, 100, 300, power = 60)
+
+        self.assertEqual([c.angle for c in cannons], solution.angle.tolist())
+
+class TestCollideMany(unittest.TestCase):
+    def test_matches_check_collision(self):
+        rng = np.random.default_rng(1)
+        a = [Drawable(*rng.integers(0, 300, 2), Color.RED, 20) for _ in range(50)]
+        b = [Drawable(*rng.integers(0, 300, 2), Color.RED, 15) for _ in range(70)]
+        for i, drawable in enumerate(b):
+            drawable.shape = 'cst'[i % 3]
+
+        expected = {
+            (i, j) 
+            for i, first in enumerate(a) 
+            for j, second in enumerate(b) 
+            if first.check_collision(second)
+        }
+        a_arrays = UniformGrid.entity_arrays(a)
+        b_arrays = UniformGrid.entity_arrays(b)
+        
+        self.assertEqual(
+            set(zip(*Drawable.collide_many(*a_arrays, *b_arrays, chunk_size = 64))),
+            expected
+        )
+
+        # Only the pairs of matching shape, found through the grid
+        a_shapes = np.array(['c'] * len(a))
+        b_shapes = np.array([drawable.shape for drawable in b])
+        grid = UniformGrid()
+        grid.rebuild(*b_arrays)
+
+        self.assertEqual(
+            set(zip(*Drawable.collide_many(
+                *a_arrays, *b_arrays, a_shapes, b_shapes,
+                pairs = grid.query_pairs(*a_arrays)
+            ))),
+            {(i, j) for i, j in expected if b[j].shape == 'c'}
+        )
+
+class TestHeadlessManager(unittest.TestCase):
+    def run_game(self, seed):
+        manager = Manager(headless = True, seed = seed)
+        manager.game_loop(max_ticks = 500)
+        return (
+            manager.ticks,
+            manager.user_cannon.health,
+            [(ac.x, ac.y) for ac in manager.artificial_cannons],
+            [(t.x, t.y, t.shape) for t in manager.target_master.target_list]
+        )
+
+    def test_same_seed_same_game(self):
+        self.assertEqual(self.run_game(3), self.run_game(3))
+
+    def test_fixed_timestep(self):
+        manager = Manager(headless = True, seed = 0)
+        manager.process_states()
+        manager.process_states()
+        self.assertEqual(manager.ticks, 2)
+
+    def test_game_loop_returns_stats(self):
+        manager = Manager(headless = True, seed = 0)
+        stats = manager.game_loop(max_ticks = 50)
+
+        self.assertEqual(stats["ticks"], manager.ticks)
+        self.assertEqual(stats["score"], manager.score_t.score)
+        self.assertEqual(stats["died"], not manager.user_cannon.is_alive)
+
+class TestAIController(unittest.TestCase):
+    def test_chase_policy(self):
+        user = MovingCannon(x = 400, y = 300, color = Color.LIGHT_BLUE)
+        # (x, y, v_x, v_y), then where each cannon ends up after 2 ticks
+        cannons = [
+            (100, 100, 3, 4),  # Far away, chases down and to the right
+            (450, 320, 3, 3),  # Too close, stops to fire
+            (502, 300, 3, 3),  # Exactly far enough (1 + 1 + 100), chases left
+            (795, 300, 5, 3),  # Off the right margin, chases left up to it
+            (400, 590, 3, 5),  # Below the bottom margin, chases up to it
+        ]
+        expected = [(106, 108), (450, 320), (496, 300), (770, 300), (400, 570)]
+
+        controller = AIController()
+        state = controller.observe(
+            [
+                ArtificialCannon(x = x, y = y, v_x = v_x, v_y = v_y, color = Color.RED)
+                for x, y, v_x, v_y in cannons
+            ],
+            user, (800, 600), 0.01
+        )
+        actions = controller.policy.decide(state)
+        x, y = controller.move(state, actions, 2)
+
+        self.assertEqual(actions.move_x.tolist(), [1, 0, -1, -1, 0])
+        self.assertEqual(actions.move_y.tolist(), [1, 0, 0, 0, -1])
+        self.assertEqual(actions.strike.tolist(), [False, True, False, False, False])
+        self.assertEqual(actions.drop_chance.tolist(), [0.01] * 5)
+        self.assertEqual(list(zip(x.tolist(), y.tolist())), expected)
+
+    def test_manager_uses_policy(self):
+        class Still(Policy):
+            def decide(self, state):
+                return Actions(
+                    move_x = np.zeros(len(state.x)),
+                    move_y = np.zeros(len(state.x)),
+                    strike = np.zeros(len(state.x), dtype=bool),
+                    drop_chance = np.zeros(len(state.x)),
+                )
+
+        manager = Manager(num_cannons = 5, headless = True, seed = 0, policy = Still())
+        start = [(ac.x, ac.y) for ac in manager.artificial_cannons]
+        manager.game_loop(max_ticks = 50)
+
+        # Never moving, firing, or dropping targets
+        self.assertEqual([(ac.x, ac.y) for ac in manager.artificial_cannons], start)
+        self.assertEqual(len(manager.target_master.target_list), manager.num_targets)
+        self.assertFalse(any(ac.striking for ac in manager.artificial_cannons))
+
+    def test_policy_must_decide(self):
+        class Idle(Policy):
+            pass
+
+        with self.assertRaises(TypeError):
+            Idle()
+
+class TestTimestep(unittest.TestCase):
+    def test_accumulator(self):
+        timestep = FixedTimestep(0.1, max_steps = 3)
+        self.assertEqual(timestep.advance(0.25), 2)
+        self.assertAlmostEqual(timestep.alpha, 0.5)
+        self.assertEqual(timestep.advance(0.06), 1)
+
+        # A long frame only runs max_steps, and drops the rest of its time
+        self.assertEqual(timestep.advance(5), 3)
+        self.assertAlmostEqual(timestep.alpha, 0)
+
+    def test_half_ticks_move_as_far(self):
+        whole = MovingSquare(x = 100, y = 100, v_x = 2, v_y = -1)
+        half = MovingSquare(x = 100, y = 100, v_x = 2, v_y = -1)
+        for _ in range(30):
+            whole.move((800, 600))
+            half.move((800, 600), 0.5)
+            half.move((800, 600), 0.5)
+        self.assertEqual((whole.x, whole.y), (half.x, half.y))
+
+        whole = MovingCannon(x = 100, y = 100)
+        half = MovingCannon(x = 100, y = 100)
+        whole.move_right((800, 600))
+        for _ in range(4):
+            half.move_right((800, 600), 0.25)
+        self.assertEqual(whole.x, half.x)
+
+    def test_tick_rate_keeps_game_speed(self):
+        # A second of game time at a quarter of the tick length
+        managers = [Manager(headless = True, seed = 0, tick_rate = rate) for rate in [15, 60]]
+        for manager in managers:
+            manager.bomb_master.create_bomb(400, 0, 1)
+            manager.user_cannon.strike(40)
+            for _ in range(manager.tick_rate):
+                manager.handle_bomb_movement()
+                manager.handle_projectile_movement()
+
+        (bomb, *_), (quarter_bomb, *_) = [m.bomb_master.bomb_list for m in managers]
+        self.assertAlmostEqual(bomb.y, quarter_bomb.y, delta = bomb.y * 0.1)
+
+        (projectile,), (quarter_projectile,) = [
+            m.user_cannon.projectile_master.projectile_list for m in managers
+        ]
+        self.assertAlmostEqual(projectile.x, quarter_projectile.x, delta = 1)
+        self.assertEqual(managers[1].seconds_to_ticks(0.5), 30)
+
+    def test_interpolated_drawing(self):
+        target = MovingSquare(x = 100, y = 100, v_x = 2, v_y = 2)
+        interpolator = Interpolator()
+        interpolator.capture([target])
+        target.move((800, 600))
+
+        with interpolator.blend([target], 0.25):
+            self.assertEqual((target.x, target.y), (100.5, 100.5))
+        self.assertEqual((target.x, target.y), (102, 102))
+
+        interpolator.forget([target])
+        with interpolator.blend([target], 0.25):
+            self.assertEqual((target.x, target.y), (102, 102))
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.manager = Manager(headless = True, seed = 2)
+        self.manager.screen = pygame.Surface(self.manager.screen_size)
+        for tick in range(40):
+            self.manager.pending_events = [pygame.event.Event(pygame.MOUSEBUTTONUP, button = 1)]
+            self.manager.process_states()
+
+    def test_snapshot_draws_the_game(self):
+        # Charging, so the trajectory preview is drawn too
+        self.manager.user_cannon.activate()
+        snapshot = WorldSnapshot.capture(self.manager)
+        self.manager.handle_drawing()
+
+        surface = pygame.Surface(self.manager.screen_size)
+        snapshot.draw(surface)
+        self.assertEqual(
+            pygame.image.tobytes(surface, 'RGB'),
+            pygame.image.tobytes(self.manager.screen, 'RGB')
+        )
+
+    def test_render_thread(self):
+        render_thread = RenderThread(self.manager.screen_size)
+        render_thread.start()
+        snapshot = WorldSnapshot.capture(self.manager)
+        render_thread.submit(snapshot)
+
+        with render_thread.frames.read(timeout = 5) as frame:
+            self.assertIsNotNone(frame)
+            drawn = pygame.image.tobytes(frame, 'RGB')
+        render_thread.stop()
+        self.assertFalse(render_thread.is_alive())
+
+        expected = pygame.Surface(self.manager.screen_size)
+        snapshot.draw(expected)
+        self.assertEqual(drawn, pygame.image.tobytes(expected, 'RGB'))
+
+    def test_double_buffer(self):
+        buffer = DoubleBuffer('a', 'b')
+        with buffer.read() as front:
+            self.assertIsNone(front)
+
+        self.assertEqual(buffer.swap(), 'a')
+        with buffer.read() as front:
+            self.assertEqual(front, 'b')
+        # A frame is only read once
+        with buffer.read() as front:
+            self.assertIsNone(front)
+
+class TestTrajectoryPreview(unittest.TestCase):
+    def test_path_follows_the_projectile(self):
+        # At the standard tick rate, and at 60 ticks per second
+        for time, ticks_per_dot in [(1, 2), (0.25, 8)]:
+            preview = TrajectoryPreview((800, 600), ticks = 60)
+            points, rect = preview.path(30, 500, -0.3, 50, time)
+
+            master = ProjectileMaster()
+            master.create_projectile(30, 500, 50, -0.3, 'c')
+            projectile, = master.projectile_list
+            expected = []
+            for tick in range(1, round(60 / time) + 1):
+                master.move_all((800, 600), time)
+                if tick % ticks_per_dot == 0 and projectile.is_alive:
+                    expected.append((int(projectile.x), int(projectile.y)))
+
+            self.assertEqual(list(points), expected)
+            # The path bounces off the right edge of the screen
+            self.assertEqual(max(x for x, _ in points), 800 - 20)
+            self.assertTrue(all(rect.collidepoint(point) for point in points))
+
+    def test_paths_are_cached(self):
+        preview = TrajectoryPreview((800, 600))
+        for _ in range(3):
+            preview.path(30, 300, -0.5, 50)
+        preview.path(30, 300, -0.4, 50)
+
+        self.assertEqual((preview.cache.hits, preview.cache.misses), (2, 2))
+
+class TestBatchRunner(unittest.TestCase):
+    def test_results_are_written_for_every_game(self):
+        path = os.path.join(tempfile.mkdtemp(), "results")
+        runner = BatchRunner(
+            {"num_targets": [3, 6], "bomb_chance": [0.2]}, 
+            games = 3, max_ticks = 60, workers = 2, chunk_size = 2
+        )
+        self.assertEqual(runner.run(path), 6)
+
+        results = ColumnWriter.read(path)
+        self.assertEqual(sorted(results["game"].tolist()), list(range(6)))
+        self.assertEqual(sorted(set(results["num_targets"].tolist())), [3, 6])
+        self.assertTrue((results["bomb_chance"] == 0.2).all())
+
+        # Each game replays the same in this process
+        row = {name: column[0].item() for name, column in results.items()}
+        params = {name: row[name] for name in BatchRunner.PARAMETERS}
+        stats = BatchRunner.run_game(row["seed"], params, 60)
+        self.assertEqual(stats, {name: row[name] for name in BatchRunner.RESULTS})
+
+    def test_rejects_unknown_parameters(self):
+        with self.assertRaises(ValueError):
+            BatchRunner({"gravity": [1, 2]})
+
+    def test_parameters_apply_to_the_first_targets(self):
+        params = {**BatchRunner.PARAMETERS, "min_target_size": 50, "max_target_size": 60}
+        manager = BatchRunner.create_manager(0, params)
+        manager.process_states()
+
+        sizes = [target.size for target in manager.target_master.target_list]
+        self.assertEqual(len(sizes), params["num_targets"])
+        self.assertTrue(all(50 <= size <= 60 for size in sizes))
+
+class TestBombMaster(unittest.TestCase):
+    def test_bombs_outlive_their_target(self):
+        manager = Manager(headless = True, seed = 0)
+        manager.create_mission()
+        target = manager.target_master.target_list[0]
+        manager.drop_bomb(target, chance = 1)
+        
+        bomb, = manager.bomb_master.bomb_list
+        self.assertEqual(bomb.owner_id, target.target_id)
+
+        target.kill()
+        manager.target_master.remove_dead()
+        manager.handle_bomb_movement()
+        self.assertEqual(manager.bomb_master.bomb_list, [bomb])
+
+    def test_target_ids_are_unique(self):
+        master = TargetMaster()
+        for _ in range(5):
+            master.create_random_target((800, 600), 20)
+        
+        self.assertEqual(
+            [target.target_id for target in master.target_list], 
+            list(range(5))
+        )
+
+    def test_array_backed_matches_objects(self):
+        def play(array_backed):
+            manager = Manager(headless = True, seed = 1, array_backed = array_backed)
+            health = []
+            for _ in range(300):
+                BatchRunner.autopilot(manager, 10)
+                manager.process_states()
+                health.append(manager.user_cannon.health)
+            bombs = [
+                (b.x, b.y, b.v_y, b.owner_id) 
+                for b in manager.bomb_master.bomb_list
+            ]
+            return health, bombs
+
+        # The games run one after the other, as they share the random module
+        expected = play(False)
+        self.assertEqual(play(True), expected)
+
+    def test_hits_are_dealt_at_once(self):
+        master = BombMaster(array_backed = True)
+        for x, y in [(100, 100), (110, 100), (400, 100), (400, 595)]:
+            master.create_bomb(x, y, 0)
+        
+        user = MovingCannon(x = 100, y = 100)
+        with mock.patch.object(MovingCannon, 'deal', autospec = True) as deal:
+            master.remove_exploded(600, user)
+
+        deal.assert_called_once_with(user, 2)
+        self.assertEqual([(b.x, b.y) for b in master.bomb_list], [(400, 100)])
+        self.assertEqual(len(master.store), 1)
+
+def slot_values(obj):
+    """Returns every slotted attribute of an object (None if it isn't set)"""
+    return {
+        name: getattr(obj, name, None)
+        for cls in type(obj).__mro__
+        for name in getattr(cls, '__slots__', ())
+    }
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_rounds_time_bracketed_cases(self):
+        names = ["ProjectileMaster.move_all[array]"]
+        for rounds in [1, 2]:
+            times = suite.run_rounds(names, [10], 2, rounds)
+            self.assertEqual(list(times), names)
+            self.assertEqual(len(times[names[0]]["10"]), 2 * rounds)
+
+class TestObjectPool(unittest.TestCase):
+    def test_dead_projectiles_are_reused(self):
+        master = ProjectileMaster()
+        master.create_projectile(100, 100, 10, 0, 'c')
+        first = master.projectile_list[0]
+        first.kill()
+        master.remove_dead()
+
+        master.create_projectile(200, 200, 10, 0, 'c')
+        self.assertIs(master.projectile_list[0], first)
+        self.assertTrue(first.is_alive)
+        self.assertEqual((first.x, first.y), (200, 200))
+        self.assertEqual(master.pool.stats()["reuse_rate"], 0.5)
+
+    def test_reset_matches_init(self):
+        for cls, params in [
+                (MovingSquare, {'x': 50, 'y': 60, 'size': 20}),
+                (Bomb, {'x': 50, 'y': 60, 'v_y': 1, 'owner_id': 3})]:
+            pool = ObjectPool()
+            pool.release(cls(x = 0, y = 0))
+
+            random.seed(1)
+            fresh = cls(**params)
+            random.seed(1)
+            reused = pool.acquire(cls, **params)
+
+            self.assertEqual(pool.reused, 1)
+            self.assertEqual(slot_values(reused), slot_values(fresh))
+
+class TestSlots(unittest.TestCase):
+    def test_entities_have_no_dict(self):
+        master = ProjectileMaster()
+        master.create_projectile(100, 100, 10, 0, 's')
+        target = MovingSquare(x = 50, y = 50)
+        entities = [
+            master.projectile_list[0], target, Bomb(x = 5, y = 5),
+            Cannon(x = 100, y = 100), MovingCannon(x = 1, y = 1), 
+            ArtificialCannon(x = 1, y = 1)
+        ]
+
+        for entity in entities:
+            self.assertFalse(hasattr(entity, '__dict__'), type(entity))
+        
+        # Multiple inheritance still reaches every parent's attributes
+        self.assertEqual(
+            (target.x, target.v_x in range(-2, 3), target.health, target.shape),
+            (50, True, 1, 's')
+        )
+
+class TestTickProfiler(unittest.TestCase):
+    def test_every_phase_is_timed(self):
+        manager = Manager(headless = True, seed = 0, profiler = TickProfiler())
+        for _ in range(10):
+            manager.process_states()
+
+        phases = [name for name, _ in manager.tick_phases()]
+        summary = manager.profiler.summary()
+        self.assertEqual(list(summary), phases + ["total"])
+        
+        for stats in summary.values():
+            self.assertEqual(stats["count"], 10)
+            self.assertLessEqual(stats["p50"], stats["p95"])
+            self.assertLessEqual(stats["p95"], stats["p99"])
+
+        tick, phase, seconds, *counts = manager.profiler.records[-1]
+        self.assertEqual((tick, phase), (10, "total"))
+        self.assertEqual(tuple(counts), manager.entity_counts())
+
+class TestSnapshot(unittest.TestCase):
+    def play(self, manager, ticks):
+        for tick in range(ticks):
+            # Keep the user firing so there are projectiles to save
+            button = pygame.MOUSEBUTTONDOWN if tick % 10 == 0 else pygame.MOUSEBUTTONUP
+            manager.pending_events = [pygame.event.Event(button, button = 1)]
+            manager.process_states()
+
+    def test_restored_game_continues_the_same(self):
+        manager = Manager(headless = True, seed = 4)
+        self.play(manager, 150)
+        data = Snapshot.dumps(manager)
+        
+        self.play(manager, 150)
+        expected = Snapshot.dumps(manager)
+
+        restored = Manager(headless = True, seed = 10)
+        Snapshot.loads(restored, data)
+        self.assertEqual(Snapshot.dumps(restored), data)
+
+        self.play(restored, 150)
+        self.assertEqual(Snapshot.dumps(restored), expected)
+
+    def test_restores_array_backed_targets(self):
+        manager = Manager(headless = True, seed = 4)
+        self.play(manager, 150)
+        data = Snapshot.dumps(manager)
+
+        restored = Manager(headless = True, seed = 10, array_backed = True)
+        Snapshot.loads(restored, data)
+        self.assertEqual(Snapshot.dumps(restored), data)
+
+    def test_rejects_other_versions(self):
+        data = bytearray(Snapshot.dumps(Manager(headless = True, seed = 0)))
+        data[4] += 1
+
+        with self.assertRaises(ValueError):
+            Snapshot.loads(Manager(headless = True), bytes(data))
+
+class TestReplay(unittest.TestCase):
+    def test_replay_reproduces_the_game(self):
+        path = os.path.join(tempfile.mkdtemp(), "game.jsonl")
+
+        with InputRecorder(path, seed = 7, flush_every = 16) as recorder:
+            manager = Manager(headless = True, recorder = recorder)
+            for tick in range(200):
+                button = pygame.MOUSEBUTTONDOWN if tick % 10 == 0 else pygame.MOUSEBUTTONUP
+                manager.pending_events = [pygame.event.Event(button, button = 1)]
+                manager.held_keys = {pygame.K_LEFT} if tick % 50 < 20 else {pygame.K_RIGHT}
+                manager.mouse_pos = (400, tick)
+                manager.process_states()
+            expected = Snapshot.dumps(manager)
+
+        player = ReplayPlayer(path)
+        self.assertEqual(player.header["seed"], 7)
+        self.assertEqual(Snapshot.dumps(player.play()), expected)
+
+    def test_replay_keeps_the_tick_rate(self):
+        path = os.path.join(tempfile.mkdtemp(), "game.jsonl")
+
+        with InputRecorder(path, seed = 5) as recorder:
+            manager = Manager(headless = True, recorder = recorder, tick_rate = 60)
+            for tick in range(400):
+                button = pygame.MOUSEBUTTONDOWN if tick % 20 == 0 else pygame.MOUSEBUTTONUP
+                manager.pending_events = [pygame.event.Event(button, button = 1)]
+                manager.mouse_pos = (600, 300)
+                manager.process_states()
+            expected = Snapshot.dumps(manager)
+
+        replayed = ReplayPlayer(path).play()
+        self.assertEqual(replayed.tick_rate, 60)
+        self.assertEqual(Snapshot.dumps(replayed), expected)
+
+    def test_replay_keeps_the_balance(self):
+        path = os.path.join(tempfile.mkdtemp(), "game.jsonl")
+        balance = {"bomb_chance": 1.0, "strike_velocity": 40, "ballistic_aim": True}
+
+        with InputRecorder(path, seed = 2) as recorder:
+            manager = Manager(
+                headless = True, recorder = recorder, balance = balance,
+                min_target_size = 40, max_target_size = 50
+            )
+            for _ in range(200):
+                manager.process_states()
+            expected = Snapshot.dumps(manager)
+
+        replayed = ReplayPlayer(path).play()
+        self.assertEqual(replayed.bomb_chance, 1.0)
+        self.assertEqual(replayed.target_master.min_size, 40)
+        self.assertEqual(Snapshot.dumps(replayed), expected)
+
+class TestScheduler(unittest.TestCase):
+    def test_run_due_order(self):
+        scheduler = Scheduler()
+        calls = []
+        scheduler.schedule(3, calls.append, 'b')
+        scheduler.schedule(1, calls.append, 'a')
+        scheduler.schedule(3, calls.append, 'c')
+        cancelled = scheduler.schedule(2, calls.append, 'x')
+        cancelled.cancel()
+
+        scheduler.run_due(2)
+        self.assertEqual(calls, ['a'])
+        scheduler.run_due(5)
+        self.assertEqual(calls, ['a', 'b', 'c'])
+
+    def test_striking_cadence(self):
+        scheduler = Scheduler()
+        artificial_cannon = ArtificialCannon(x = 100, y = 100)
+        artificial_cannon.start_striking(scheduler, 4)
+        self.assertTrue(artificial_cannon.striking)
+
+        for tick in range(1, 13):
+            scheduler.run_due(tick)
+        self.assertEqual(len(artificial_cannon.projectile_master.projectile_list), 3)
+
+        artificial_cannon.end_striking()
+        for tick in range(13, 30):
+            scheduler.run_due(tick)
+        self.assertFalse(artificial_cannon.striking)
+        self.assertEqual(len(artificial_cannon.projectile_master.projectile_list), 3)
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.font = pygame.font.Font(None, 20)
+
+    def test_hits_and_misses(self):
+        text_cache = TextCache()
+        first = text_cache.render(self.font, "Total: 1", Color.RED)
+        self.assertIs(text_cache.render(self.font, "Total: 1", Color.RED), first)
+        text_cache.render(self.font, "Total: 1", Color.WHITE)
+
+        self.assertEqual(text_cache.hits, 1)
+        self.assertEqual(text_cache.misses, 2)
+
+    def test_least_recently_used_eviction(self):
+        text_cache = TextCache(max_size = 2)
+        text_cache.render(self.font, "a", Color.RED)
+        text_cache.render(self.font, "b", Color.RED)
+        text_cache.render(self.font, "a", Color.RED)
+        text_cache.render(self.font, "c", Color.RED)
+
+        self.assertEqual(len(text_cache), 2)
+        self.assertIn((self.font, "a", Color.RED), text_cache.surfaces)
+        self.assertNotIn((self.font, "b", Color.RED), text_cache.surfaces)
+
+class TestSpriteCache(unittest.TestCase):
+    def test_sprites_match_direct_drawing(self):
+        for size in [1, 10, 15, 20, 29]:
+            drawn = pygame.Surface((100, 100))
+            blitted = pygame.Surface((100, 100))
+            pygame.draw.rect(drawn, Color.RED, (10, 10, size, size))
+            pygame.draw.polygon(drawn, Color.GREEN, (
+                (50, 10), (50 - size//2, 10 + size//2), (50 + size//2, 10 + size//2)
+            ))
+            pygame.draw.circle(drawn, Color.BLUE, (50, 60), size/2)
+
+            Artist.draw(blitted, 10, 10, Color.RED, size, 's')
+            Artist.draw(blitted, 50, 10, Color.GREEN, size, 't')
+            Artist.draw(blitted, 50, 60, Color.BLUE, size, 'c')
+
+            self.assertEqual(
+                pygame.image.tobytes(drawn, 'RGB'), 
+                pygame.image.tobytes(blitted, 'RGB')
+            )
+
+    def test_eviction(self):
+        sprite_cache = SpriteCache(max_size = 3)
+        for red in range(10):
+            sprite_cache.sprite('c', 10, (red, 0, 0))
+        sprite_cache.sprite('c', 10, (9, 0, 0))
+
+        self.assertEqual(len(sprite_cache), 3)
+        self.assertEqual(sprite_cache.misses, 10)
+        self.assertEqual(sprite_cache.hits, 1)
+
+class TestDirtyRectRenderer(unittest.TestCase):
+    def items(self, moving_x):
+        items = []
+        for key, args in [('static', (50, 50, Color.RED, 20, 's')), 
+                          ('moving', (moving_x, 55, Color.BLUE, 20, 'c'))]:
+            items.append((key, Artist.sprite_rect(*args), Artist.draw, args))
+        return items
+
+    def test_only_changes_are_redrawn(self):
+        renderer = DirtyRectRenderer()
+        surface = pygame.Surface((200, 200))
+        renderer.render(surface, self.items(100))
+
+        self.assertEqual(renderer.render(surface, self.items(100)), [])
+
+        dirty = renderer.render(surface, self.items(60))
+        self.assertTrue(dirty)
+        self.assertNotIn(surface.get_rect(), dirty)
+
+        # The result matches a full redraw
+        expected = pygame.Surface((200, 200))
+        for _, _, draw, args in self.items(60):
+            draw(expected, *args)
+        self.assertEqual(
+            pygame.image.tobytes(surface, 'RGB'), 
+            pygame.image.tobytes(expected, 'RGB')
+        )
+
+    def test_random_frames_match_full_redraws(self):
+        rng = random.Random(2)
+        sprites = {
+            key: [rng.randint(0, 200), rng.randint(0, 200), Color.RED, 20, 'sct'[key % 3]]
+            for key in range(30)
+        }
+        renderer = DirtyRectRenderer()
+        surface = pygame.Surface((200, 200))
+
+        for frame in range(40):
+            # A few sprites move, appear, or disappear every frame
+            for key in rng.sample(sorted(sprites), 3):
+                sprites[key][0] += rng.randint(-15, 15)
+            if frame % 5 == 0:
+                sprites.pop(rng.choice(sorted(sprites)))
+                sprites[100 + frame] = [rng.randint(0, 200), rng.randint(0, 200), Color.BLUE, 10, 'c']
+
+            items = [
+                (key, Artist.sprite_rect(*args), Artist.draw, tuple(args))
+                for key, args in sprites.items()
+            ]
+            renderer.render(surface, items)
+
+            expected = pygame.Surface((200, 200))
+            for _, _, draw, args in items:
+                draw(expected, *args)
+            self.assertEqual(
+                pygame.image.tobytes(surface, 'RGB'), 
+                pygame.image.tobytes(expected, 'RGB')
+            )
+
+    def test_busy_frames_are_redrawn_in_full(self):
+        renderer = DirtyRectRenderer(max_changes = 1, backoff = 2)
+        surface = pygame.Surface((200, 200))
+        renderer.render(surface, self.items(100))
+
+        items = [
+            (key, rect.move(5, 0), draw, (args[0] + 5, *args[1:]))
+            for key, rect, draw, args in self.items(100)
+        ]
+        self.assertEqual(renderer.render(surface, items), [surface.get_rect()])
+
+        # The next frames are left to the caller, then one is a full redraw
+        self.assertTrue(renderer.skip())
+        self.assertTrue(renderer.skip())
+        self.assertFalse(renderer.skip())
+        self.assertEqual(renderer.render(surface, items), [surface.get_rect()])
+
+class TestUniformGrid(unittest.TestCase):
+    def test_query_pairs_finds_every_collision(self):
+        rng = np.random.default_rng(0)
+        a_positions, a_sizes = rng.uniform(0, 800, (200, 2)), np.full(200, 20.0)
+        b_positions, b_sizes = rng.uniform(0, 800, (300, 2)), np.full(300, 30.0)
+
+        grid = UniformGrid(cell_size = 32)
+        grid.rebuild(b_positions, b_sizes)
+        candidates = set(zip(*grid.query_pairs(a_positions, a_sizes)))
+
+        distances = np.linalg.norm(
+            a_positions[:, None, :] - b_positions[None, :, :], axis = 2
+        )
+        collisions = set(zip(*np.nonzero(distances <= 20 + 30 + 10)))
+        self.assertTrue(collisions <= candidates)
+
+    def test_empty_grid(self):
+        grid = UniformGrid()
+        grid.rebuild(*UniformGrid.entity_arrays([]))
+        query_indices, grid_indices = grid.query_pairs(
+            np.zeros((3, 2)), np.ones(3)
+        )
+        self.assertEqual(len(query_indices), 0)
+        self.assertEqual(len(grid_indices), 0)
     
     
 
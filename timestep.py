@@ -0,0 +1,132 @@
+from contextlib import contextmanager
+
+class FixedTimestep:
+    """
+    Accumulates real time and hands it out in fixed simulation steps
+
+    Every frame adds the time it took to the accumulator, and the game runs a
+    step for every whole step of time accumulated. The time left over is kept
+    for the next frame, and is what the renderer interpolates over, so the game
+    can be drawn at any frame rate while simulating at a constant one.
+
+    Attributes
+    ----------
+    step : float
+        The length of a simulation step, in seconds
+    max_steps : int
+        The most steps run in a single frame. Time beyond that is dropped, so a
+        slow frame doesn't make the next one slower still (default 5)
+    accumulator : float
+        The time accumulated that hasn't been simulated yet, in seconds
+    """
+
+    def __init__(self, step: float, max_steps: int = 5) -> None:
+        """Initializes an empty accumulator"""
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, seconds: float) -> int:
+        """
+        Adds a frame's time to the accumulator
+
+        Parameters
+        ----------
+        seconds : float
+            The time the frame took
+
+        Returns
+        -------
+        steps : int
+            The number of simulation steps to run this frame
+        """
+        self.accumulator += seconds
+        steps = int(self.accumulator // self.step)
+
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = self.step * steps
+
+        self.accumulator -= self.step * steps
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """How far the game is between the last step and the next, from 0 to 1"""
+        return self.accumulator / self.step
+
+class Interpolator:
+    """
+    Draws entities between where they were before the last simulation step and
+    where they are now
+
+    Attributes
+    ----------
+    previous : dict
+        A dictionary of id(entity): (entity, x, y) from before the last step
+    """
+
+    def __init__(self) -> None:
+        """Initializes the Interpolator with no previous positions"""
+        self.previous: dict = {}
+
+    def capture(self, entities: list) -> None:
+        """
+        Remembers the positions of entities before a simulation step
+
+        Parameters
+        ----------
+        entities : list[Drawable]
+            Every entity that is drawn
+        """
+        self.previous = {
+            id(entity): (entity, entity.x, entity.y) for entity in entities
+        }
+
+    def forget(self, entities: list) -> None:
+        """
+        Forgets the previous positions of entities, so they are drawn where
+        they are. Used for entities reused from a pool during the last step,
+        whose previous positions belong to the objects they were before
+
+        Parameters
+        ----------
+        entities : list[Drawable]
+            The entities to forget
+        """
+        for entity in entities:
+            self.previous.pop(id(entity), None)
+
+    @contextmanager
+    def blend(self, entities: list, alpha: float):
+        """
+        Moves entities to their interpolated positions for drawing, and back to
+        their real positions afterwards
+
+        Entities created during the last step have no previous position, and
+        are drawn where they are
+
+        Parameters
+        ----------
+        entities : list[Drawable]
+            Every entity that is drawn
+        alpha : float
+            How far to draw the entities between their previous and current
+            positions, from 0 to 1
+        """
+        moved = []
+        for entity in entities:
+            previous = self.previous.get(id(entity))
+            if previous is None or previous[0] is not entity:
+                continue
+
+            _, x, y = previous
+            moved.append((entity, entity.x, entity.y))
+            entity.x = x + alpha * (entity.x - x)
+            entity.y = y + alpha * (entity.y - y)
+
+        try:
+            yield
+        finally:
+            for entity, x, y in moved:
+                entity.x, entity.y = x, y
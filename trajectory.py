@@ -0,0 +1,209 @@
+from artist import SurfaceCache
+from projectiles import ProjectileMaster
+
+from math import cos, sin
+
+import numpy as np
+import pygame
+
+class TrajectoryPreview:
+    """
+    Predicts the path a cannon's shot will take, for drawing it while the shot
+    is charged
+
+    Between bounces, a shot's path has a closed form: every tick adds gravity
+    to its vertical velocity and its velocity to its position (each scaled by
+    the tick's time step), so its positions are a running sum that NumPy works
+    out for every tick at once. 
+    The first tick the shot would touch an edge of the screen (or run out of
+    speed at the bottom) is moved with the projectiles' own batched physics 
+    (ProjectileMaster.move_arrays), which bounces it exactly like the 
+    projectile will be, and the path carries on from there. A path costs one
+    array pass per bounce rather than one per tick.
+
+    Paths are cached on the cannon's position, angle, and power (and the time
+    step), which only change when the mouse or cannon moves (or the charge 
+    grows)
+
+    Attributes
+    ----------
+    screen_size : tuple
+        The size of the screen the shot bounces around
+    ticks : int
+        The number of standard ticks of the path predicted (default 40)
+    dot_every : int
+        The number of standard ticks between the dots drawn (default 2)
+    projectile_size : int
+        The size of the projectile fired (default 20)
+    cache : SurfaceCache
+        The cached paths, keyed on (x, y, angle, pow, time)
+    """
+
+    def __init__(
+            self, 
+            screen_size: tuple, 
+            ticks: int = 40, 
+            dot_every: int = 2, 
+            projectile_size: int = 20,
+            max_size: int = 256) -> None:
+        """Initializes the preview with an empty cache of max_size paths"""
+        self.screen_size = screen_size
+        self.ticks = ticks
+        self.dot_every = dot_every
+        self.projectile_size = projectile_size
+        self.cache = SurfaceCache(max_size)
+
+    def simulate(
+            self, 
+            x: float, 
+            y: float, 
+            angle: float, 
+            pow: float, 
+            time: float = 1) -> np.ndarray:
+        """
+        Simulates a shot
+
+        Parameters
+        ----------
+        x, y : float
+            The position the shot is fired from
+        angle : float
+            The angle the shot is fired at
+        pow : float
+            The power the shot is fired with
+        time : float
+            The number of standard ticks each tick of the game moves the shot
+            for, refer to `Manager.time_step` (default 1)
+
+        Returns
+        -------
+        dots : np.ndarray
+            A (ticks // dot_every, 2) array of the position of every dot, NaN
+            once the shot has lost its health
+        """
+        width, height = self.screen_size
+        gravity = ProjectileMaster.GRAVITY
+
+        # The game's ticks making up the path, and the ones between dots
+        ticks = round(self.ticks / time)
+        dot_every = max(1, round(self.dot_every / time))
+
+        # The shot, fired like ProjectileMaster.create_projectile fires it
+        pos_x = np.array([x], dtype=np.float64)
+        pos_y = np.array([y], dtype=np.float64)
+        v_x = np.array([int(pow * cos(angle))], dtype=np.float64)
+        v_y = np.array([int(pow * sin(angle))], dtype=np.float64)
+        size = np.array([self.projectile_size], dtype=np.int64)
+        health = np.ones(1, dtype=np.int64)
+
+        path = np.full((ticks, 2), np.nan)
+        tick = 0
+        while tick < ticks and health[0] > 0:
+            # Where the shot would be on each of the remaining ticks, if 
+            # nothing got in its way. Summed in order, like the projectile 
+            # adds them up, so the sums round the same way
+            steps = ticks - tick
+            free_v_y = self.running_sum(v_y[0], time * gravity, steps)
+            free_x = self.running_sum(pos_x[0], time * v_x[0], steps)
+            free_y = self.running_sum(pos_y[0], time * free_v_y)
+
+            s = size[0]
+            touches = (
+                (free_x < s) | (free_x > width - s) 
+                | (free_y < s) | (free_y > height - s)
+                | (
+                    (v_x[0]**2 + free_v_y**2 < 2**2) 
+                    & (free_y > height - 2 * s)
+                )
+            )
+            free = int(np.argmax(touches)) if touches.any() else steps
+
+            path[tick:tick + free, 0] = free_x[:free]
+            path[tick:tick + free, 1] = free_y[:free]
+            tick += free
+            if tick == ticks:
+                break
+
+            if free:
+                pos_x[0], pos_y[0], v_y[0] = free_x[free - 1], free_y[free - 1], free_v_y[free - 1]
+
+            # The tick it touches an edge, moved like the projectile moves
+            ProjectileMaster.move_arrays(
+                pos_x, pos_y, v_x, v_y, size, health, self.screen_size, 
+                time = time, grav = gravity
+            )
+            if health[0] > 0:
+                path[tick] = pos_x[0], pos_y[0]
+            tick += 1
+
+        return path[dot_every - 1::dot_every]
+
+    def path(
+            self, 
+            x: float, 
+            y: float, 
+            angle: float, 
+            pow: float, 
+            time: float = 1) -> tuple:
+        """
+        Returns the path of a shot, simulating it only if it isn't cached
+
+        Parameters
+        ----------
+        x, y : float
+            The position the shot is fired from
+        angle : float
+            The angle the shot is fired at
+        pow : float
+            The power the shot is fired with
+        time : float
+            The time step of the game, refer to `simulate` (default 1)
+
+        Returns
+        -------
+        path : tuple
+            The (points, rect) of the path: the (x, y) of every dot, and the
+            area they cover (None if there are none)
+        """
+        return self.cache.get(
+            (x, y, angle, pow, time), 
+            lambda: self.to_path(self.simulate(x, y, angle, pow, time))
+        )
+
+    @staticmethod
+    def running_sum(start: float, steps, count: int = None) -> np.ndarray:
+        """
+        Returns start plus each running total of steps, added one at a time
+
+        Parameters
+        ----------
+        start : float
+            The value before the first step
+        steps : float or np.ndarray
+            The step added on every tick, or the steps of every tick
+        count : int
+            The number of ticks, if steps is a single step (default None)
+
+        Returns
+        -------
+        values : np.ndarray
+            The value after every tick
+        """
+        if count is not None:
+            steps = np.full(count, steps)
+        return np.cumsum(np.concatenate(([start], steps)))[1:]
+
+    @staticmethod
+    def to_path(dots: np.ndarray) -> tuple:
+        """Converts a shot's dots into the points and area that are drawn"""
+        dots = dots[~np.isnan(dots[:, 0])]
+        if not len(dots):
+            return (), None
+
+        points = tuple(map(tuple, dots.astype(np.int64).tolist()))
+        low, high = dots.min(axis=0), dots.max(axis=0)
+        rect = pygame.Rect(
+            int(low[0]) - 2, int(low[1]) - 2, 
+            int(high[0] - low[0]) + 5, int(high[1] - low[1]) + 5
+        )
+        return points, rect